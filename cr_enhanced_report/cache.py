@@ -0,0 +1,237 @@
+"""Module to cache report data on disk."""
+import collections
+import contextlib
+import dataclasses
+import json
+import os
+import pathlib
+import struct
+from typing import Iterator
+
+from cr_enhanced_report.datatypes import SessionStatistics, TaskData
+from cr_enhanced_report.output import atomic_output
+
+# Increment when the stored statistics change so older sidecar files are not used.
+STATISTICS_VERSION = 1
+# Share of the maximum size the fragment cache is evicted down to, so eviction runs rarely.
+EVICT_TO = 0.8
+
+
+class FragmentCache(object):
+    """
+    Directory of rendered HTML fragments with size based least recently used eviction.
+
+    The size of each fragment is tracked in memory in least recently used order, so the directory is only scanned
+    when the cache is opened. Fragments added by other processes sharing the directory are not evicted until the
+    cache is opened again.
+    """
+
+    __slots__ = (
+        '_directory',
+        '_max_size',
+        '_size',
+        '_sizes',
+    )
+
+    suffix: str = '.html'
+
+    def __init__(self, directory: pathlib.Path, max_size: int) -> None:
+        """
+        Initialize a FragmentCache object.
+
+        Args:
+            directory (pathlib.Path): Directory the fragments are stored in, created if it does not exist.
+            max_size (int): Maximum total size of the cached fragments in bytes.
+        """
+        self._directory = directory
+        self._max_size = max_size
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._sizes: collections.OrderedDict[str, int] = collections.OrderedDict()
+        entries = []
+        for entry in self._entries():
+            with contextlib.suppress(FileNotFoundError):
+                entry_stat = entry.stat()
+                entries.append((entry_stat.st_mtime_ns, entry.name, entry_stat.st_size))
+        for _, name, size in sorted(entries):
+            self._sizes[name] = size
+        self._size = sum(self._sizes.values())
+
+    @property
+    def size(self) -> int:
+        """
+        Property for the total size of the cached fragments.
+
+        Returns:
+            int: Total size of the cached fragments in bytes.
+        """
+        return self._size
+
+    def get(self, key: str) -> str | None:
+        """
+        Fetch a fragment from the cache, marking it as recently used.
+
+        Args:
+            key (str): Key of the fragment.
+
+        Returns:
+            The fragment if it is cached, None otherwise.
+        """
+        path = self._path(key=key)
+        try:
+            fragment = path.read_text(encoding='utf-8')
+            os.utime(path)
+        except FileNotFoundError:
+            self._forget(name=path.name)
+            return None
+        if path.name in self._sizes:
+            self._sizes.move_to_end(path.name)
+        return fragment
+
+    def put(self, key: str, fragment: str) -> None:
+        """
+        Store a fragment in the cache, evicting the least recently used fragments if the cache is too large.
+
+        Args:
+            key (str): Key of the fragment.
+            fragment (str): Rendered fragment.
+        """
+        path = self._path(key=key)
+        self._forget(name=path.name)
+        with atomic_output(path) as stream:
+            stream.write(fragment)
+        self._sizes[path.name] = path.stat().st_size
+        self._size += self._sizes[path.name]
+        if self._size > self._max_size:
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used fragments until the cache is within its low water mark."""
+        low_water = int(self._max_size * EVICT_TO)
+        while self._sizes and self._size > low_water:
+            name, size = self._sizes.popitem(last=False)
+            self._size -= size
+            with contextlib.suppress(FileNotFoundError):
+                (self._directory / name).unlink()
+
+    def _forget(self, name: str) -> None:
+        """
+        Stop tracking the size of a fragment file.
+
+        Args:
+            name (str): Name of the fragment file.
+        """
+        self._size -= self._sizes.pop(name, 0)
+
+    def _entries(self) -> Iterator[pathlib.Path]:
+        """
+        Iterate over the cached fragment files.
+
+        Returns:
+            Iterator of paths to the cached fragments.
+        """
+        return self._directory.glob(f'*{self.suffix}')
+
+    def _path(self, key: str) -> pathlib.Path:
+        """
+        Path a fragment is stored at.
+
+        Args:
+            key (str): Key of the fragment.
+
+        Returns:
+            pathlib.Path: Path of the fragment file.
+        """
+        return self._directory / f'{key}{self.suffix}'
+
+
+class StatisticsCache(object):
+    """Sidecar file next to a session storing its statistics, valid until the session changes."""
+
+    __slots__ = (
+        '_path',
+        '_session_path',
+    )
+
+    suffix: str = '.summary.json'
+
+    def __init__(self, session_path: pathlib.Path) -> None:
+        """
+        Initialize a StatisticsCache object.
+
+        Args:
+            session_path (pathlib.Path): Path to the session file.
+        """
+        self._session_path = session_path
+        self._path = session_path.with_name(f'{session_path.name}{self.suffix}')
+
+    @property
+    def path(self) -> pathlib.Path:
+        """
+        Property for the path of the sidecar file.
+
+        Returns:
+            pathlib.Path: Path of the sidecar file.
+        """
+        return self._path
+
+    def fingerprint(self) -> list[int]:
+        """
+        Calculate the fingerprint of the session.
+
+        The fingerprint is made of the size and modification time of the session and its write ahead log, and
+        the file change counter from the SQLite header which is incremented by every committed transaction.
+
+        Returns:
+            Fingerprint of the session.
+        """
+        fingerprint = [STATISTICS_VERSION]
+        with open(self._session_path, 'rb') as session_file:
+            session_stat = os.fstat(session_file.fileno())
+            session_file.seek(24)
+            header = session_file.read(4)
+        fingerprint.extend((session_stat.st_size, session_stat.st_mtime_ns))
+        fingerprint.append(struct.unpack('>I', header)[0] if len(header) == 4 else -1)
+        wal_path = self._session_path.with_name(f'{self._session_path.name}-wal')
+        with contextlib.suppress(FileNotFoundError):
+            wal_stat = wal_path.stat()
+            fingerprint.extend((wal_stat.st_size, wal_stat.st_mtime_ns))
+        return fingerprint
+
+    def load(self, fingerprint: list[int]) -> SessionStatistics | None:
+        """
+        Load the statistics if they were stored for a session with the same fingerprint.
+
+        Args:
+            fingerprint (list[int]): Current fingerprint of the session.
+
+        Returns:
+            The stored statistics, None if there are none or the session has changed.
+        """
+        try:
+            with open(self._path, encoding='utf-8') as sidecar:
+                data = json.load(sidecar)
+        except (OSError, ValueError):
+            return None
+        if data.get('fingerprint') != fingerprint:
+            return None
+        return SessionStatistics(
+            tasks=[
+                TaskData(module_path=task['module_path'], status_count=task['status_count']) for task in data['tasks']
+            ],
+            num_work_items=data['num_work_items'],
+            num_results=data['num_results'],
+            kill_count=data['kill_count'],
+        )
+
+    def store(self, fingerprint: list[int], statistics: SessionStatistics) -> None:
+        """
+        Store the statistics for a session, ignoring errors if the sidecar file cannot be written.
+
+        Args:
+            fingerprint (list[int]): Fingerprint of the session the statistics were fetched from.
+            statistics (SessionStatistics): Statistics of the session.
+        """
+        data = dataclasses.asdict(statistics)
+        data['fingerprint'] = fingerprint
+        with contextlib.suppress(OSError), atomic_output(self._path) as stream:
+            json.dump(data, stream, separators=(',', ':'))
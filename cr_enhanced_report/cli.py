@@ -1,9 +1,15 @@
 """Console script for cr_enhanced_report."""
 import sys
 
-from cr_enhanced_report.commands import cr_enhanced_report
+from cr_enhanced_report.commands import (cr_enhanced_report,
+                                         cr_enhanced_report_compare)
 
 
 def main() -> None:
     """Entry point."""
     sys.exit(cr_enhanced_report())
+
+
+def compare() -> None:
+    """Entry point comparing two sessions."""
+    sys.exit(cr_enhanced_report_compare())
@@ -1,24 +1,298 @@
 """Application commands."""
+import pathlib
+import sys
+
 import click
+from cosmic_ray.work_item import TestOutcome
 
+from cr_enhanced_report.cache import StatisticsCache
+from cr_enhanced_report.compare import compare_sessions
+from cr_enhanced_report.datatypes import (PENDING_OUTCOME, ReportOptions,
+                                          WorkItemFilter)
 from cr_enhanced_report.db import DB, use_db
-from cr_enhanced_report.reporter import Reporter
+from cr_enhanced_report.export import (write_summary_csv,
+                                       write_work_items_ndjson)
+from cr_enhanced_report.output import atomic_output, open_output
+from cr_enhanced_report.profiling import Profiler
+from cr_enhanced_report.reporter import RENDERERS, Reporter
+from cr_enhanced_report.watch import WatchReporter
 
 
 @click.command()
 @click.option("--only-completed/--not-only-completed", default=False)
 @click.option("--skip-success/--include-success", default=False)
+@click.option(
+    "--include",
+    multiple=True,
+    help="Only report modules whose path matches this glob, such as 'pkg/sub/*'. Can be given more than once.",
+)
+@click.option(
+    "--exclude", multiple=True, help="Do not report modules whose path matches this glob. Can be given more than once."
+)
+@click.option(
+    "--operator",
+    "operators",
+    multiple=True,
+    help="Only report mutations by operators whose name matches this glob. Can be given more than once.",
+)
+@click.option(
+    "--outcome",
+    "outcomes",
+    type=click.Choice([outcome.value for outcome in TestOutcome] + [PENDING_OUTCOME]),
+    multiple=True,
+    help="Only report mutations with this test outcome. Can be given more than once.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, writable=True, path_type=pathlib.Path),
+    default=None,
+    help="Directory to cache rendered modules in, only changed modules are rendered again.",
+)
+@click.option("--cache-size", type=click.IntRange(min=1), default=256, show_default=True, help="Cache size in MB.")
+@click.option(
+    "--dedupe-outputs",
+    is_flag=True,
+    default=False,
+    help="Write each distinct task output and diff once, shared by every task with the same content.",
+)
+@click.option(
+    "--jobs", type=click.IntRange(min=1), default=1, show_default=True, help="Number of processes rendering modules."
+)
+@click.option(
+    "--prefetch",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Number of modules fetched ahead by a background thread while rendering, 0 to fetch in turn.",
+)
+@click.option(
+    "--max-memory",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Memory budget in MB, modules over their share of it are spilled to temporary files while rendered.",
+)
+@click.option(
+    "--renderer",
+    type=click.Choice(RENDERERS),
+    default="yattag",
+    show_default=True,
+    help="Renderer for the task lists, template renders the same markup from precompiled templates.",
+)
+@click.option(
+    "--virtual-tasks",
+    is_flag=True,
+    default=False,
+    help="Embed each module's tasks as JSON and only render the rows in view, for modules with many mutants.",
+)
+@click.option(
+    "--search-index",
+    is_flag=True,
+    default=False,
+    help="Embed an index of job IDs, operators and paths searched from a search box that jumps to the tasks.",
+)
+@click.option(
+    "--context-lines",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Number of source lines shown before and after each mutation, 0 to not show the source.",
+)
+@click.option(
+    "--source-root",
+    type=click.Path(exists=True, file_okay=False, path_type=pathlib.Path),
+    default=None,
+    help="Directory module paths are relative to. Defaults to the current directory.",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, writable=True, path_type=pathlib.Path),
+    default=None,
+    help="File to write the report to, gzip compressed if it ends in .gz. Defaults to stdout.",
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False, writable=True, path_type=pathlib.Path),
+    default=None,
+    help="Directory to write the report to as an index page and a page for each module, for large sessions.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["html", "ndjson", "csv"]),
+    default="html",
+    show_default=True,
+    help="Report format, ndjson writes a record per work item and csv writes the summary.",
+)
+@click.option(
+    "--immutable",
+    is_flag=True,
+    default=False,
+    help="Open the session as immutable, skipping all locking. Only use when the session is not being written to.",
+)
+@click.option(
+    "--summary-cache",
+    is_flag=True,
+    default=False,
+    help="Store the summary in a sidecar file next to the session, reused until the session changes.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="Write the time, rows and memory use of each stage as JSON to --profile-output.",
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(dir_okay=False, writable=True, allow_dash=True),
+    default="-",
+    show_default=True,
+    help="File the profile is written to, - for stderr.",
+)
+@click.option("--watch", is_flag=True, default=False, help="Keep refreshing the report as results are added.")
+@click.option(
+    "--interval", type=click.FloatRange(min=0), default=2.0, show_default=True, help="Seconds between watch polls."
+)
 @click.argument("session-file", type=click.Path(dir_okay=False, readable=True, exists=True))
-def cr_enhanced_report(only_completed, skip_success, session_file) -> None:
+def cr_enhanced_report(
+    only_completed,
+    skip_success,
+    include,
+    exclude,
+    operators,
+    outcomes,
+    cache_dir,
+    cache_size,
+    dedupe_outputs,
+    jobs,
+    prefetch,
+    max_memory,
+    renderer,
+    virtual_tasks,
+    search_index,
+    context_lines,
+    source_root,
+    output,
+    output_dir,
+    output_format,
+    immutable,
+    summary_cache,
+    profile,
+    profile_output,
+    watch,
+    interval,
+    session_file,
+) -> None:
     """
     Create an enhanced Cosmic-Ray report.
 
     Args:
         only_completed: If `True`, only the completed work items.
         skip_success: If `True`, skip all successful work items.
+        include: Globs matching the paths of the modules reported, all modules if empty.
+        exclude: Globs matching the paths of the modules not reported.
+        operators: Globs matching the names of the operators reported, all operators if empty.
+        outcomes: Test outcomes reported, all outcomes if empty.
+        cache_dir: Directory to cache rendered modules in.
+        cache_size: Maximum size of the cache in MB.
+        dedupe_outputs: If `True`, write each distinct task output and diff once.
+        jobs: Number of processes rendering modules.
+        prefetch: Number of modules fetched ahead by a background thread.
+        max_memory: Memory budget in MB, None for no budget.
+        renderer: Renderer for the task lists.
+        virtual_tasks: If `True`, embed tasks as JSON shown by a virtual list.
+        search_index: If `True`, embed a search index with a search box.
+        context_lines: Number of source lines shown before and after each mutation.
+        source_root: Directory module paths are relative to.
+        output: File to write the report to.
+        output_dir: Directory to write the report to as a page for each module.
+        output_format: Format of the report, html, ndjson or csv.
+        immutable: If `True`, open the session as immutable.
+        summary_cache: If `True`, store the summary in a sidecar file next to the session.
+        profile: If `True`, write the profile of each stage.
+        profile_output: File to write the profile to, `-` for stderr.
+        watch: If `True`, keep refreshing the report as results are added.
+        interval: Seconds between polls when watching.
         session_file: The path to the session file.
     """
-    with use_db(session_file, DB.Mode.open) as db:
-        db.skip_success = skip_success
-        report = Reporter(db=db, only_completed=only_completed)
-        report.create_report()
+    if watch and (output is None or output_format != "html" or immutable or max_memory is not None):
+        raise click.UsageError(
+            "--watch requires --output and the html format, and cannot be used with --immutable or --max-memory."
+        )
+    if output_dir is not None and (output is not None or output_format != "html" or watch):
+        raise click.UsageError("--output-dir requires the html format, and cannot be used with --output or --watch.")
+    options = ReportOptions(
+        cache_dir=cache_dir,
+        cache_size=cache_size * 1024 * 1024,
+        dedupe_outputs=dedupe_outputs,
+        jobs=jobs,
+        prefetch=prefetch,
+        max_memory=None if max_memory is None else max_memory * 1024 * 1024,
+        renderer=renderer,
+        virtual_tasks=virtual_tasks,
+        search_index=search_index,
+        context_lines=context_lines,
+        source_root=source_root,
+    )
+    profiler = Profiler(enabled=profile)
+    try:
+        with use_db(
+            session_file, DB.Mode.open, read_only=True, immutable=immutable, memory_mapped=max_memory is None
+        ) as db:
+            db.skip_success = skip_success
+            db.work_item_filter = WorkItemFilter(
+                include=include, exclude=exclude, operators=operators, outcomes=outcomes
+            )
+            db.profiler = profiler
+            if summary_cache:
+                db.statistics_cache = StatisticsCache(session_path=pathlib.Path(session_file))
+            if watch:
+                with WatchReporter(
+                    db=db, output=output, only_completed=only_completed, options=options
+                ) as watch_reporter:
+                    watch_reporter.run(interval=interval)
+                return
+            if output_dir is not None:
+                Reporter(db=db, only_completed=only_completed, options=options).create_pages(directory=output_dir)
+                return
+            with open_output(output) as stream:
+                if output_format == "ndjson":
+                    write_work_items_ndjson(db=db, stream=stream, only_completed=only_completed)
+                elif output_format == "csv":
+                    write_summary_csv(db=db, stream=stream)
+                else:
+                    Reporter(db=db, only_completed=only_completed, options=options).create_report(stream=stream)
+    finally:
+        if profile and profile_output == "-":
+            profiler.write(stream=sys.stderr)
+        elif profile:
+            with atomic_output(pathlib.Path(profile_output)) as profile_stream:
+                profiler.write(stream=profile_stream)
+
+
+@click.command()
+@click.option(
+    "--new-survivors-only", is_flag=True, default=False, help="Only report mutants that newly survive."
+)
+@click.argument("baseline-file", type=click.Path(dir_okay=False, readable=True, exists=True))
+@click.argument("candidate-file", type=click.Path(dir_okay=False, readable=True, exists=True))
+def cr_enhanced_report_compare(new_survivors_only, baseline_file, candidate_file) -> None:
+    """
+    Report mutations whose outcome differs between two Cosmic-Ray sessions.
+
+    Args:
+        new_survivors_only: If `True`, only report mutants that newly survive.
+        baseline_file: The path to the baseline session file.
+        candidate_file: The path to the candidate session file.
+    """
+    changes = 0
+    new_survivors = 0
+    with (
+        use_db(baseline_file, DB.Mode.open, read_only=True) as baseline,
+        use_db(candidate_file, DB.Mode.open, read_only=True) as candidate,
+    ):
+        for change in compare_sessions(baseline=baseline, candidate=candidate):
+            changes += 1
+            new_survivors += change.newly_survived
+            if change.newly_survived or not new_survivors_only:
+                click.echo(str(change))
+    click.echo(f"Changed outcomes: {changes}, new survivors: {new_survivors}")
@@ -0,0 +1,51 @@
+"""Module to compare the outcomes of two Cosmic Ray sessions."""
+from typing import Iterator
+
+from cr_enhanced_report.datatypes import MutationOutcome, OutcomeChange
+from cr_enhanced_report.db import DB
+
+
+def compare_sessions(baseline: DB, candidate: DB) -> Iterator[OutcomeChange]:
+    """
+    Compare the outcome of every mutation in two sessions.
+
+    Both sessions are read in key order and merge joined, so each session is read once and only a single
+    mutation from each is held in memory at a time.
+
+    Args:
+        baseline: Session to compare against.
+        candidate: Session being compared.
+
+    Yields:
+        OutcomeChange for each mutation that was added, removed or has a different test outcome.
+    """
+    return merge_outcomes(baseline=baseline.iter_mutation_outcomes(), candidate=candidate.iter_mutation_outcomes())
+
+
+def merge_outcomes(
+    baseline: Iterator[MutationOutcome], candidate: Iterator[MutationOutcome]
+) -> Iterator[OutcomeChange]:
+    """
+    Merge join two iterators of mutation outcomes that are ordered by key.
+
+    Args:
+        baseline: Baseline outcomes ordered by key.
+        candidate: Candidate outcomes ordered by key.
+
+    Yields:
+        OutcomeChange for each mutation that was added, removed or has a different test outcome.
+    """
+    baseline_outcome = next(baseline, None)
+    candidate_outcome = next(candidate, None)
+    while baseline_outcome is not None or candidate_outcome is not None:
+        if candidate_outcome is None or (baseline_outcome is not None and baseline_outcome.key < candidate_outcome.key):
+            yield OutcomeChange(baseline=baseline_outcome, candidate=None)
+            baseline_outcome = next(baseline, None)
+        elif baseline_outcome is None or candidate_outcome.key < baseline_outcome.key:
+            yield OutcomeChange(baseline=None, candidate=candidate_outcome)
+            candidate_outcome = next(candidate, None)
+        else:
+            if baseline_outcome.test_outcome != candidate_outcome.test_outcome:
+                yield OutcomeChange(baseline=baseline_outcome, candidate=candidate_outcome)
+            baseline_outcome = next(baseline, None)
+            candidate_outcome = next(candidate, None)
@@ -2,7 +2,13 @@
 import enum
 import functools
 import pathlib
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from cosmic_ray.work_item import TestOutcome
+
+# Outcome selecting work items that have no result yet.
+PENDING_OUTCOME = 'pending'
 
 
 class HtmlColor(enum.Enum):
@@ -14,6 +20,107 @@ class HtmlColor(enum.Enum):
     red = 'red'
 
 
+@dataclass(frozen=True)
+class MutationOutcome:
+    """Data class to store the outcome of a mutation, keyed so that sessions can be compared."""
+
+    module_path: str
+    operator_name: str
+    occurrence: int
+    start_pos: tuple[int, int]
+    end_pos: tuple[int, int]
+    job_id: str
+    worker_outcome: str | None
+    test_outcome: str | None
+
+    @property
+    def key(self) -> tuple[str, str, int, tuple[int, int]]:
+        """
+        Property for the key identifying the mutation across sessions.
+
+        Returns:
+            tuple: Module path, operator name, occurrence and start position.
+        """
+        return self.module_path, self.operator_name, self.occurrence, self.start_pos
+
+
+@dataclass(frozen=True)
+class OutcomeChange:
+    """Data class to store a mutation whose outcome differs between a baseline and candidate session."""
+
+    baseline: MutationOutcome | None
+    candidate: MutationOutcome | None
+
+    @property
+    def mutation(self) -> MutationOutcome:
+        """
+        Property for the mutation, from the candidate unless it was removed.
+
+        Returns:
+            MutationOutcome: The mutation.
+        """
+        mutation = self.candidate or self.baseline
+        if mutation is None:
+            raise ValueError('An outcome change needs a baseline or candidate mutation.')
+        return mutation
+
+    @property
+    def newly_survived(self) -> bool:
+        """
+        Whether the mutant survives in the candidate but did not in the baseline.
+
+        Returns:
+            bool: True if the mutant newly survives.
+        """
+        return (
+            self.candidate is not None
+            and self.candidate.test_outcome == TestOutcome.SURVIVED
+            and (self.baseline is None or self.baseline.test_outcome != TestOutcome.SURVIVED)
+        )
+
+    def __str__(self) -> str:
+        """
+        Represent the change as a string.
+
+        Return:
+            String representation of the change.
+        """
+        mutation = self.mutation
+        baseline = 'missing' if self.baseline is None else self.baseline.test_outcome or 'pending'
+        candidate = 'missing' if self.candidate is None else self.candidate.test_outcome or 'pending'
+        return (
+            f'{mutation.module_path}:{mutation.start_pos[0]}:{mutation.start_pos[1]} {mutation.operator_name} '
+            + f'occurrence {mutation.occurrence} ({mutation.job_id}): {baseline} -> {candidate}'
+        )
+
+
+@dataclass
+class ReportOptions:
+    """Data class to store options used when creating a report."""
+
+    cache_dir: pathlib.Path | None = None
+    cache_size: int = 256 * 1024 * 1024
+    dedupe_outputs: bool = False
+    jobs: int = 1
+    renderer: str = 'yattag'
+    virtual_tasks: bool = False
+    context_lines: int = 0
+    source_root: pathlib.Path | None = None
+    prefetch: int = 0
+    max_memory: int | None = None
+    search_index: bool = False
+
+
+@dataclass(frozen=True)
+class WorkItemFilter:
+    """Data class to store the filter selecting the work items that are reported."""
+
+    include: tuple[str, ...] = ()
+    exclude: tuple[str, ...] = ()
+    operators: tuple[str, ...] = ()
+    outcomes: tuple[str, ...] = ()
+
+
 @dataclass
 class TaskData:
     """Data class to store report summary data."""
@@ -22,6 +129,85 @@ class TaskData:
     status_count: dict[str, int]
 
 
+@dataclass
+class SessionStatistics:
+    """Data class to store the totals and per module outcome counts for a session."""
+
+    tasks: list[TaskData] = field(default_factory=list)
+    num_work_items: int = 0
+    num_results: int = 0
+    kill_count: int = 0
+
+    @property
+    def survival_rate(self) -> float:
+        """
+        Property for the survival rate.
+
+        Returns:
+            float: Survival rate as a percentage accurate to 2 decimal places.
+        """
+        return round((1 - self.kill_count / self.num_results) * 100, 2) if self.num_results else 0.0
+
+    def summary(self) -> Iterator['SummaryDetail']:
+        """
+        Roll up the per module counts into summary details for every directory and module.
+
+        Modules with no completed work items are not part of the summary.
+
+        Returns:
+            Iterator of summary details, in the order they are displayed.
+        """
+        summary_tree = SummaryTree()
+        for task in self.tasks:
+            if not task.status_count:
+                continue
+            summary_tree.add(
+                module_path=task.module_path,
+                killed=task.status_count.get(TestOutcome.KILLED.value, 0),
+                incompetent=task.status_count.get(TestOutcome.INCOMPETENT.value, 0),
+                survived=task.status_count.get(TestOutcome.SURVIVED.value, 0),
+            )
+        return iter(summary_tree)
+
+
+@dataclass
+class OperatorStatistics:
+    """Data class to store the outcome counts of a mutation operator, for the session or within a module."""
+
+    operator_name: str
+    module_path: str | None = None
+    killed: int = 0
+    incompetent: int = 0
+    survived: int = 0
+    modules: list['OperatorStatistics'] = field(default_factory=list)
+
+    @property
+    def score(self) -> float:
+        """
+        Property for the score of the operator, calculated as it is for a module.
+
+        Returns:
+            float: Score as a percentage accurate to 2 decimal places.
+        """
+        total_tests = self.killed + self.incompetent + self.survived
+        return 0.0 if self.killed == 0 else round(self.killed / total_tests * 100, 2)
+
+    def add(self, test_outcome: TestOutcome | None, count: int) -> None:
+        """
+        Add the number of mutants with a test outcome to the counts.
+
+        Args:
+            test_outcome (TestOutcome): Test outcome of the mutants.
+            count (int): Number of mutants.
+        """
+        if test_outcome == TestOutcome.KILLED:
+            self.killed += count
+        elif test_outcome == TestOutcome.INCOMPETENT:
+            self.incompetent += count
+        elif test_outcome == TestOutcome.SURVIVED:
+            self.survived += count
+
+
 @functools.total_ordering
 class SummaryDetail(object):
     """Object to store summary details for a given file."""
@@ -249,3 +435,73 @@ class SummaryDetail(object):
             f"SummaryDetail(path='{self.path}', is_dir={self.is_dir}, killed={self.killed}, "
             + f"incompetent={self.incompetent}, survived={self.survived})"
         )
+
+
+class SummaryTree(object):
+    """Prefix tree of directories used to roll up summary details for each module."""
+
+    __slots__ = (
+        '_directories',
+        '_files',
+        '_summary',
+    )
+
+    def __init__(self, path: pathlib.Path | None = None) -> None:
+        """
+        Initialize a SummaryTree object.
+
+        Args:
+            path (pathlib.Path, optional): Path of the directory the tree is for. Defaults to the root.
+        """
+        self._summary = SummaryDetail(path=path or pathlib.Path('/'), is_dir=True)
+        self._directories: dict[str, SummaryTree] = {}
+        self._files: dict[str, SummaryDetail] = {}
+
+    def add(self, module_path: str, killed: int = 0, incompetent: int = 0, survived: int = 0) -> None:
+        """
+        Add the counts for a module, rolling them up through every directory the module is in.
+
+        Args:
+            module_path (str): Path of the module relative to the root.
+            killed (int, optional): Killed status. Defaults to 0.
+            incompetent (int, optional): Incompetent status. Defaults to 0.
+            survived (int, optional): Survived status. Defaults to 0.
+        """
+        *directories, file_name = pathlib.PurePath(module_path).parts
+        node = self
+        node._summary.killed += killed
+        node._summary.incompetent += incompetent
+        node._summary.survived += survived
+        for directory in directories:
+            if directory not in node._directories:
+                node._directories[directory] = SummaryTree(path=node._summary.path / directory)
+            node = node._directories[directory]
+            node._summary.killed += killed
+            node._summary.incompetent += incompetent
+            node._summary.survived += survived
+        if file_name not in node._files:
+            node._files[file_name] = SummaryDetail(path=node._summary.path / file_name)
+        file_summary = node._files[file_name]
+        file_summary.killed += killed
+        file_summary.incompetent += incompetent
+        file_summary.survived += survived
+
+    def __iter__(self) -> Iterator[SummaryDetail]:
+        """
+        Iterate over the summary details depth first.
+
+        A directory is followed by each of its subdirectories, each with everything below it, and then its files.
+        Subdirectories and files are each in name order, so every file of a directory comes after all of its
+        subdirectories whatever their names. This is not always the order of sorting the details, as
+        SummaryDetail does not compare as a total order.
+
+        Yields:
+            SummaryDetail for each directory and module in the tree.
+        """
+        if not self._directories and not self._files:
+            return
+        yield self._summary
+        for name in sorted(self._directories):
+            yield from self._directories[name]
+        for name in sorted(self._files):
+            yield self._files[name]
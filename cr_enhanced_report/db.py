@@ -1,21 +1,112 @@
 """Module to overload the cosmic-ray database."""
 import contextlib
-from typing import Any
+import hashlib
+import itertools
+import pathlib
+import sqlite3
+import urllib.parse
+from typing import Any, Collection, Iterator
 
-from cosmic_ray.work_db import (MutationSpecStorage, WorkDB, WorkItemStorage,
-                                WorkResultStorage, _mutation_spec_from_storage,
-                                _work_item_from_storage,
+from cosmic_ray.work_db import (MutationSpecStorage, WorkDB, WorkResultStorage,
+                                _mutation_spec_from_storage,
                                 _work_result_from_storage)
-from cosmic_ray.work_item import TestOutcome
-from sqlalchemy import func
+from cosmic_ray.work_item import (MutationSpec, TestOutcome, WorkItem,
+                                  WorkResult)
+from sqlalchemy import Connection, create_engine, event, func, not_, or_
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from cr_enhanced_report.cache import StatisticsCache
+from cr_enhanced_report.datatypes import (PENDING_OUTCOME, MutationOutcome,
+                                          OperatorStatistics,
+                                          SessionStatistics, TaskData,
+                                          WorkItemFilter)
+from cr_enhanced_report.profiling import Profiler
+from cr_enhanced_report.spill import SpilledList, collect
+
+READ_ONLY_CACHE_SIZE_KB = 64 * 1024
+# SQLite's default page cache size, used when the DB is not memory mapped so the cache stays small.
+UNMAPPED_CACHE_SIZE_KB = 2 * 1024
+READ_ONLY_MMAP_SIZE = 1024 * 1024 * 1024
+# Estimated bytes held for a work item besides its diff and output, including its rendered markup.
+WORK_ITEM_OVERHEAD = 2048
 
 
 class DB(WorkDB):
     """Database handler adding new functionality to WorkDB."""
 
     skip_success: bool = False
-    _kill_count: int | None = None
-    _survival_rate: float | None = None
+    work_item_filter: WorkItemFilter = WorkItemFilter()
+    statistics_cache: StatisticsCache | None = None
+    profiler: Profiler = Profiler(enabled=False)
+    _statistics: SessionStatistics | None = None
+    _data_version_connection: Connection | None = None
+
+    def __init__(
+        self,
+        path,
+        mode=WorkDB.Mode.create,
+        read_only: bool = False,
+        immutable: bool = False,
+        memory_mapped: bool = True,
+    ) -> None:
+        """
+        Open a DB in file `path` in mode `mode`.
+
+        Reports never write to the session, so a read only DB is opened through a `mode=ro` SQLite URI with
+        `query_only` set, a larger page cache and memory mapped reads. A single connection is reused for every
+        query instead of being pooled.
+
+        Args:
+            path: The path to the DB file.
+            mode: The mode to open the DB with, ignored when `read_only` is `True`.
+            read_only: If `True`, open the existing DB read only and tuned for reporting.
+            immutable: If `True`, the DB is opened as immutable, SQLite then skips all locking. Only use this
+                when the session is not being written to.
+            memory_mapped: If `False`, the read only DB is read without memory mapping and with SQLite's default
+                page cache, so the pages read are not held by the process.
+
+        Raises:
+            FileNotFoundError: If `mode` is `Mode.open` or `read_only` is `True` and `path` does not exist.
+        """
+        if not read_only:
+            super().__init__(path, mode)
+            return
+        self._path = path
+        if not pathlib.Path(path).exists():
+            raise FileNotFoundError(f"File does not exist: {path}")
+        uri = f'file:{urllib.parse.quote(str(pathlib.Path(path).resolve()))}?mode=ro'
+        if immutable:
+            uri += '&immutable=1'
+        self._engine = create_engine(
+            'sqlite://',
+            creator=lambda: sqlite3.connect(uri, uri=True, check_same_thread=False),
+            poolclass=StaticPool,
+        )
+        mmap_size = READ_ONLY_MMAP_SIZE if memory_mapped else 0
+        cache_size_kb = READ_ONLY_CACHE_SIZE_KB if memory_mapped else UNMAPPED_CACHE_SIZE_KB
+        event.listen(
+            self._engine,
+            'connect',
+            lambda dbapi_connection, _: self._tune_read_only_connection(
+                dbapi_connection, mmap_size=mmap_size, cache_size_kb=cache_size_kb
+            ),
+        )
+        self._session_maker = sessionmaker(self._engine)
+
+    @staticmethod
+    def _tune_read_only_connection(dbapi_connection, mmap_size: int, cache_size_kb: int) -> None:
+        """
+        Tune a new read only connection for reporting.
+
+        Args:
+            dbapi_connection: The DBAPI connection.
+            mmap_size: Maximum number of bytes of the DB to memory map.
+            cache_size_kb: Size of the page cache in KB.
+        """
+        dbapi_connection.execute('PRAGMA query_only=ON')
+        dbapi_connection.execute(f'PRAGMA cache_size=-{cache_size_kb}')
+        dbapi_connection.execute(f'PRAGMA mmap_size={mmap_size}')
 
     @property
     def completed_work_items(self) -> tuple[Any, ...]:
@@ -25,43 +116,508 @@ class DB(WorkDB):
         Returns:
             Tuple of completed work items.
         """
+        return tuple(
+            work_item for _, work_items in self.iter_completed_work_item_groups() for work_item in work_items
+        )
+
+    def iter_completed_work_item_groups(
+        self, batch_size: int = 1000, spill_size: int | None = None, modules: Collection[str] | None = None
+    ) -> Iterator[tuple[str, list[Any] | SpilledList[Any]]]:
+        """
+        Iterate over completed work items grouped by module.
+
+        Rows are fetched from the database `batch_size` at a time ordered by module path, so only the module
+        currently being yielded is held in memory.
+
+        Args:
+            batch_size: Number of rows fetched from the database per batch.
+            spill_size: Estimated size in bytes a module's work items may have before they are spilled to a
+                temporary file, None to keep every module in memory.
+            modules: Paths of the modules fetched, every module if None.
+
+        Yields:
+            Tuple of the module path and a list of (WorkItem, WorkResult, MutationSpec) tuples for the module,
+            a SpilledList if the module was spilled.
+        """
+        yield from self._iter_work_item_groups(
+            only_completed=True, batch_size=batch_size, spill_size=spill_size, modules=modules
+        )
+
+    def iter_work_item_groups(
+        self, batch_size: int = 1000, spill_size: int | None = None, modules: Collection[str] | None = None
+    ) -> Iterator[tuple[str, list[Any] | SpilledList[Any]]]:
+        """
+        Iterate over all work items, including pending work items, grouped by module.
+
+        Mutation specs are outer joined to their results so pending work items are fetched in the same pass as
+        the completed work items. Rows are fetched `batch_size` at a time ordered by module path.
+
+        Args:
+            batch_size: Number of rows fetched from the database per batch.
+            spill_size: Estimated size in bytes a module's work items may have before they are spilled to a
+                temporary file, None to keep every module in memory.
+            modules: Paths of the modules fetched, every module if None.
+
+        Yields:
+            Tuple of the module path and a list of (WorkItem, WorkResult, MutationSpec) tuples for the module,
+            a SpilledList if the module was spilled. The WorkResult is None for pending work items.
+        """
+        yield from self._iter_work_item_groups(
+            only_completed=False, batch_size=batch_size, spill_size=spill_size, modules=modules
+        )
+
+    def _iter_work_item_groups(
+        self,
+        only_completed: bool,
+        batch_size: int,
+        spill_size: int | None = None,
+        modules: Collection[str] | None = None,
+    ) -> Iterator[tuple[str, list[Any] | SpilledList[Any]]]:
+        """
+        Iterate over work items grouped by module, recorded by the profiler.
+
+        Args:
+            only_completed: If `True`, only completed work items are fetched.
+            batch_size: Number of rows fetched from the database per batch.
+            spill_size: Estimated size in bytes a module's work items may have before they are spilled to a
+                temporary file, None to keep every module in memory.
+            modules: Paths of the modules fetched, every module if None.
+
+        Yields:
+            Tuple of the module path and a list of (WorkItem, WorkResult, MutationSpec) tuples for the module,
+            a SpilledList if the module was spilled.
+        """
+        yield from self.profiler.iterate(
+            'fetch_work_item_groups',
+            self._query_work_item_groups(
+                only_completed=only_completed, batch_size=batch_size, spill_size=spill_size, modules=modules
+            ),
+            rows=lambda group: len(group[1]),
+            only_completed=only_completed,
+        )
+
+    def _query_work_item_groups(
+        self,
+        only_completed: bool,
+        batch_size: int,
+        spill_size: int | None = None,
+        modules: Collection[str] | None = None,
+    ) -> Iterator[tuple[str, list[Any] | SpilledList[Any]]]:
+        """
+        Query work items grouped by module.
+
+        SQLite sorts whole rows, outputs included, in memory before the first row is returned. With a spill size
+        only the keys and the size of each row's output and diff are sorted, and the rows are fetched by key in
+        batches of at most `spill_size` bytes, down to a single row, so memory use does not grow with the size
+        of the outputs.
+
+        Args:
+            only_completed: If `True`, only completed work items are fetched.
+            batch_size: Number of rows fetched from the database per batch.
+            spill_size: Estimated size in bytes a module's work items, and a batch of rows, may have before they
+                are spilled to a temporary file, None to keep every module in memory.
+            modules: Paths of the modules fetched, every module if None.
+
+        Yields:
+            Tuple of the module path and a list of (WorkItem, WorkResult, MutationSpec) tuples for the module,
+            a SpilledList if the module was spilled.
+        """
+        with self._session_maker.begin() as session:
+            results = self._select_work_items(session=session, only_completed=only_completed)
+            if modules is not None:
+                results = results.where(MutationSpecStorage.module_path.in_(modules))
+            order = (MutationSpecStorage.module_path, MutationSpecStorage.job_id)
+            if spill_size is None:
+                rows = results.order_by(*order).yield_per(batch_size)
+            else:
+                row_size = (
+                    WORK_ITEM_OVERHEAD
+                    + func.coalesce(func.length(WorkResultStorage.output), 0)
+                    + func.coalesce(func.length(WorkResultStorage.diff), 0)
+                )
+                keys = results.with_entities(MutationSpecStorage.job_id, row_size).order_by(*order)
+                rows = self._iter_rows_by_key(
+                    results=results, keys=iter(keys.yield_per(batch_size)), batch_size=batch_size, max_size=spill_size
+                )
+            for module_path, module_rows in itertools.groupby(rows, key=lambda row: row[1].module_path):
+                yield module_path, collect(
+                    items=(
+                        self._work_item_from_storage(result=result, mutation_spec=mutation_spec)
+                        for result, mutation_spec in module_rows
+                    ),
+                    max_size=spill_size,
+                    size=self._work_item_size,
+                )
+
+    def iter_module_signatures(self, only_completed: bool, batch_size: int = 1000) -> Iterator[tuple[str, str]]:
+        """
+        Iterate over a signature of each module's work items, which changes whenever one of them changes.
+
+        The signature is a digest of the job ID, outcomes and output and diff lengths of each work item, so it is
+        calculated without reading the outputs into Python. Work items are selected as they are by
+        iter_completed_work_item_groups and iter_work_item_groups.
+
+        Args:
+            only_completed: If `True`, only completed work items are included.
+            batch_size: Number of rows fetched from the database per batch.
+
+        Yields:
+            Tuple of the module path and the hex digest of its work items, ordered by module path.
+        """
+        with self._session_maker.begin() as session:
+            rows = (
+                self._select_work_items(session=session, only_completed=only_completed)
+                .with_entities(
+                    MutationSpecStorage.module_path,
+                    MutationSpecStorage.job_id,
+                    WorkResultStorage.test_outcome,
+                    WorkResultStorage.worker_outcome,
+                    func.length(WorkResultStorage.output),
+                    func.length(WorkResultStorage.diff),
+                )
+                .order_by(MutationSpecStorage.module_path, MutationSpecStorage.job_id)
+                .yield_per(batch_size)
+            )
+            for module_path, module_rows in itertools.groupby(
+                self.profiler.iterate('fetch_module_signatures', rows), key=lambda row: row[0]
+            ):
+                digest = hashlib.sha256()
+                for row in module_rows:
+                    digest.update('\0'.join(str(column) for column in row[1:]).encode() + b'\0')
+                yield module_path, digest.hexdigest()
+
+    def _select_work_items(self, session: Any, only_completed: bool) -> Any:
+        """
+        Query the work items selected for a report, as result and mutation spec pairs.
+
+        Args:
+            session: Session the query is run in.
+            only_completed: If `True`, only completed work items are selected, pending work items are outer
+                joined with a None result otherwise.
+
+        Returns:
+            The query, restricted by skip_success and the work item filter.
+        """
+        results = session.query(WorkResultStorage, MutationSpecStorage)
+        if only_completed:
+            results = results.where(WorkResultStorage.job_id == MutationSpecStorage.job_id)
+        else:
+            results = results.select_from(MutationSpecStorage).outerjoin(
+                WorkResultStorage, WorkResultStorage.job_id == MutationSpecStorage.job_id
+            )
+        if self.skip_success:
+            unsuccessful = WorkResultStorage.test_outcome != TestOutcome.KILLED
+            results = results.where(
+                unsuccessful if only_completed else or_(WorkResultStorage.job_id.is_(None), unsuccessful)
+            )
+        return self._apply_filter(results)
+
+    def _apply_filter(self, results: Any) -> Any:
+        """
+        Restrict a query of mutation specs and their results to the work items selected by the filter.
+
+        Module paths and operator names are matched by SQLite's GLOB, so rows that are filtered out are never
+        joined to their results.
+
+        Args:
+            results: Query selecting from mutation specs joined to their results.
+
+        Returns:
+            The query with a WHERE clause for each part of the filter that is set.
+        """
+        work_item_filter = self.work_item_filter
+        if work_item_filter.include:
+            results = results.where(self._glob(MutationSpecStorage.module_path, work_item_filter.include))
+        if work_item_filter.exclude:
+            results = results.where(not_(self._glob(MutationSpecStorage.module_path, work_item_filter.exclude)))
+        if work_item_filter.operators:
+            results = results.where(self._glob(MutationSpecStorage.operator_name, work_item_filter.operators))
+        if work_item_filter.outcomes:
+            outcomes = [TestOutcome(outcome) for outcome in work_item_filter.outcomes if outcome != PENDING_OUTCOME]
+            selected = WorkResultStorage.test_outcome.in_(outcomes)
+            if PENDING_OUTCOME in work_item_filter.outcomes:
+                selected = or_(WorkResultStorage.job_id.is_(None), selected)
+            results = results.where(selected)
+        return results
+
+    @staticmethod
+    def _glob(column: Any, patterns: tuple[str, ...]) -> Any:
+        """
+        Create a condition matching a column against any of a set of globs.
+
+        Args:
+            column: Column to match.
+            patterns: Globs to match the column against.
+
+        Returns:
+            Condition that is true if the column matches at least one glob.
+        """
+        return or_(*(column.op('GLOB', is_comparison=True)(pattern) for pattern in patterns))
+
+    @staticmethod
+    def _iter_rows_by_key(results, keys: Iterator[Any], batch_size: int, max_size: int) -> Iterator[Any]:
+        """
+        Fetch the rows of a query in the order of their keys.
+
+        Args:
+            results: Query for the rows.
+            keys: Job IDs of the rows and their estimated sizes in bytes, in the order they are fetched.
+            batch_size: Maximum number of rows fetched from the database per batch.
+            max_size: Maximum estimated size in bytes of a batch.
+
+        Yields:
+            The rows, in the order of `keys`.
+        """
+        for batch in DB._iter_key_batches(keys=keys, batch_size=batch_size, max_size=max_size):
+            rows = {row[1].job_id: row for row in results.where(MutationSpecStorage.job_id.in_(batch))}
+            for job_id in batch:
+                yield rows.pop(job_id)
+
+    @staticmethod
+    def _iter_key_batches(keys: Iterator[Any], batch_size: int, max_size: int) -> Iterator[list[str]]:
+        """
+        Split keys into batches of at most `batch_size` keys and `max_size` bytes.
+
+        A key larger than `max_size` is a batch of its own.
+
+        Args:
+            keys: Job IDs and their estimated sizes in bytes.
+            batch_size: Maximum number of keys per batch.
+            max_size: Maximum estimated size in bytes of a batch.
+
+        Yields:
+            Lists of job IDs.
+        """
+        batch: list[str] = []
+        batch_bytes = 0
+        for job_id, size in keys:
+            if batch and (len(batch) >= batch_size or batch_bytes + size > max_size):
+                yield batch
+                batch = []
+                batch_bytes = 0
+            batch.append(job_id)
+            batch_bytes += size
+        if batch:
+            yield batch
+
+    def iter_mutation_outcomes(self, only_completed: bool = False, batch_size: int = 1000) -> Iterator[MutationOutcome]:
+        """
+        Iterate over the outcome of every mutation ordered by the key used to compare sessions.
+
+        The ordering is done by SQLite so that two sessions can be compared with a merge join. Only the columns
+        needed for the outcome are fetched, outputs and diffs are never loaded.
+
+        Args:
+            only_completed: If `True`, only completed work items are fetched.
+            batch_size: Number of rows fetched from the database per batch.
+
+        Yields:
+            MutationOutcome for each mutation, the test outcome is None for pending work items.
+        """
         with self._session_maker.begin() as session:
             results = session.query(
-                WorkItemStorage, WorkResultStorage, MutationSpecStorage
-            ).where(
-                WorkItemStorage.job_id == WorkResultStorage.job_id
-            ).where(
-                WorkItemStorage.job_id == MutationSpecStorage.job_id
+                MutationSpecStorage.module_path,
+                MutationSpecStorage.operator_name,
+                MutationSpecStorage.occurrence,
+                MutationSpecStorage.start_pos_row,
+                MutationSpecStorage.start_pos_col,
+                MutationSpecStorage.end_pos_row,
+                MutationSpecStorage.end_pos_col,
+                MutationSpecStorage.job_id,
+                WorkResultStorage.worker_outcome,
+                WorkResultStorage.test_outcome,
+            ).outerjoin(
+                WorkResultStorage, WorkResultStorage.job_id == MutationSpecStorage.job_id
             )
+            if only_completed:
+                results = results.where(WorkResultStorage.job_id.is_not(None))
             if self.skip_success:
                 results = results.where(
-                    WorkResultStorage.test_outcome != TestOutcome.KILLED
+                    or_(WorkResultStorage.job_id.is_(None), WorkResultStorage.test_outcome != TestOutcome.KILLED)
                 )
-            results = results.order_by(MutationSpecStorage.module_path)
-            return tuple(
-                (
-                    _work_item_from_storage(work_item),
-                    _work_result_from_storage(result),
-                    _mutation_spec_from_storage(mutation_spec)
-                ) for work_item, result, mutation_spec in results
+            results = self._apply_filter(results)
+            results = results.order_by(
+                MutationSpecStorage.module_path,
+                MutationSpecStorage.operator_name,
+                MutationSpecStorage.occurrence,
+                MutationSpecStorage.start_pos_row,
+                MutationSpecStorage.start_pos_col,
             )
+            for row in self.profiler.iterate('fetch_mutation_outcomes', results.yield_per(batch_size)):
+                yield MutationOutcome(
+                    module_path=row.module_path,
+                    operator_name=row.operator_name,
+                    occurrence=row.occurrence,
+                    start_pos=(row.start_pos_row, row.start_pos_col),
+                    end_pos=(row.end_pos_row, row.end_pos_col),
+                    job_id=row.job_id,
+                    worker_outcome=None if row.worker_outcome is None else row.worker_outcome.value,
+                    test_outcome=None if row.test_outcome is None else row.test_outcome.value,
+                )
 
-    def fetch_status_counts(self):
-        """Fetch status counts from the database."""
-        with self._session_maker.begin() as session:
+    def data_version(self) -> int:
+        """
+        Fetch the SQLite data version of the session.
+
+        The value changes whenever another connection commits to the session, it is read from a connection kept
+        open for the lifetime of the DB as the value is only comparable on the same connection.
+
+        Returns:
+            The data version.
+        """
+        if self._data_version_connection is None:
+            self._data_version_connection = self._engine.connect()
+        data_version = self._data_version_connection.exec_driver_sql('PRAGMA data_version').scalar_one()
+        self._data_version_connection.rollback()
+        return data_version
+
+    def close(self) -> None:
+        """Close the database."""
+        if self._data_version_connection is not None:
+            self._data_version_connection.close()
+            self._data_version_connection = None
+        super().close()
+
+    @staticmethod
+    def _work_item_from_storage(
+        result: WorkResultStorage | None,
+        mutation_spec: MutationSpecStorage,
+    ) -> tuple[WorkItem, WorkResult | None, MutationSpec]:
+        """
+        Convert a joined result and mutation spec row into a work item.
+
+        The WorkItem is built from the already joined mutation spec rather than through the lazily loaded
+        WorkItemStorage.mutations relationship, which would issue a further query per row.
+
+        Args:
+            result: Stored work result, None for pending work items.
+            mutation_spec: Stored mutation spec.
+
+        Returns:
+            Tuple of WorkItem, WorkResult and MutationSpec.
+        """
+        spec = _mutation_spec_from_storage(mutation_spec)
+        work_result = None if result is None else _work_result_from_storage(result)
+        return WorkItem.single(mutation_spec.job_id, spec), work_result, spec
+
+    @staticmethod
+    def _work_item_size(work_item: tuple[WorkItem, WorkResult | None, MutationSpec]) -> int:
+        """
+        Estimate the memory held for a work item while its module is rendered.
+
+        Args:
+            work_item: Tuple of WorkItem, WorkResult and MutationSpec.
+
+        Returns:
+            Estimated size in bytes.
+        """
+        result = work_item[1]
+        if result is None:
+            return WORK_ITEM_OVERHEAD
+        return WORK_ITEM_OVERHEAD + len(result.output or '') + len(result.diff or '')
+
+    @property
+    def statistics(self) -> SessionStatistics:
+        """
+        Fetch the session totals and per module outcome counts.
+
+        If a statistics cache is set the statistics are loaded from it when the session has not changed since
+        they were stored. Filtered statistics are always fetched, as only the whole session is cached.
+
+        Returns:
+            SessionStatistics for the session.
+        """
+        if self._statistics is not None:
+            return self._statistics
+        if self.statistics_cache is None or self.work_item_filter != WorkItemFilter():
+            self._statistics = self.fetch_statistics()
+            return self._statistics
+        fingerprint = self.statistics_cache.fingerprint()
+        self._statistics = self.statistics_cache.load(fingerprint=fingerprint)
+        if self._statistics is None:
+            self._statistics = self.fetch_statistics()
+            self.statistics_cache.store(fingerprint=fingerprint, statistics=self._statistics)
+        return self._statistics
+
+    def invalidate_statistics(self) -> None:
+        """Discard the cached statistics so they are fetched again when next used."""
+        self._statistics = None
+
+    def fetch_statistics(self) -> SessionStatistics:
+        """
+        Fetch the session totals and per module outcome counts in a single aggregate query.
+
+        Every mutation spec is outer joined to its result and grouped by module and test outcome. Pending work
+        items appear with no test outcome and a completed count of 0, so the totals can be derived from the
+        same rows without loading any results.
+
+        Returns:
+            SessionStatistics for the session.
+        """
+        statistics = SessionStatistics()
+        with self.profiler.stage('fetch_statistics') as stage, self._session_maker.begin() as session:
             results = session.query(
+                MutationSpecStorage.module_path,
                 WorkResultStorage.test_outcome,
+                func.count(MutationSpecStorage.job_id),
+                func.count(WorkResultStorage.job_id),
+            ).outerjoin(
+                WorkResultStorage, WorkResultStorage.job_id == MutationSpecStorage.job_id
+            )
+            rows = self._apply_filter(results).group_by(
+                MutationSpecStorage.module_path, WorkResultStorage.test_outcome
+            ).order_by(
+                MutationSpecStorage.module_path
+            ).all()
+            stage['rows'] = len(rows)
+            for module_path, module_rows in itertools.groupby(rows, key=lambda row: row[0]):
+                task = TaskData(module_path=module_path, status_count={})
+                for _, test_outcome, item_count, result_count in module_rows:
+                    statistics.num_work_items += item_count
+                    statistics.num_results += result_count
+                    if test_outcome != TestOutcome.SURVIVED:
+                        statistics.kill_count += result_count
+                    if test_outcome is not None:
+                        task.status_count[test_outcome.value] = result_count
+                statistics.tasks.append(task)
+        return statistics
+
+    def fetch_operator_statistics(self) -> list[OperatorStatistics]:
+        """
+        Fetch the outcome counts of each mutation operator, for the session and per module, in a single query.
+
+        Completed work items are grouped by operator, module and test outcome, so only a row per group is
+        loaded and the counts for each operator are the sum of its modules.
+
+        Returns:
+            OperatorStatistics for each operator ordered by name, with the counts for each module it mutated.
+        """
+        operators: list[OperatorStatistics] = []
+        with self.profiler.stage('fetch_operator_statistics') as stage, self._session_maker.begin() as session:
+            results = session.query(
+                MutationSpecStorage.operator_name,
                 MutationSpecStorage.module_path,
-                func.count(WorkResultStorage.test_outcome)
-            ).where(
-                WorkResultStorage.job_id == WorkItemStorage.job_id
+                WorkResultStorage.test_outcome,
+                func.count(WorkResultStorage.job_id),
             ).where(
                 WorkResultStorage.job_id == MutationSpecStorage.job_id
-            ).group_by(
-                MutationSpecStorage.module_path, WorkResultStorage.test_outcome
+            )
+            rows = self._apply_filter(results).group_by(
+                MutationSpecStorage.operator_name, MutationSpecStorage.module_path, WorkResultStorage.test_outcome
+            ).order_by(
+                MutationSpecStorage.operator_name, MutationSpecStorage.module_path
             ).all()
-
-        return results
+            stage['rows'] = len(rows)
+        for operator_name, operator_rows in itertools.groupby(rows, key=lambda row: row[0]):
+            operator = OperatorStatistics(operator_name=operator_name)
+            for module_path, module_rows in itertools.groupby(operator_rows, key=lambda row: row[1]):
+                module = OperatorStatistics(operator_name=operator_name, module_path=module_path)
+                for _, _, test_outcome, result_count in module_rows:
+                    module.add(test_outcome=test_outcome, count=result_count)
+                    operator.add(test_outcome=test_outcome, count=result_count)
+                operator.modules.append(module)
+            operators.append(operator)
+        return operators
 
     @property
     def kill_count(self) -> int:
@@ -71,9 +627,7 @@ class DB(WorkDB):
         Returns:
             Number of killed mutants.
         """
-        if self._kill_count is None:
-            self._kill_count = sum(r.is_killed for _, r in self.results)
-        return self._kill_count or 0
+        return self.statistics.kill_count
 
     @property
     def survival_rate(self) -> float:
@@ -83,16 +637,11 @@ class DB(WorkDB):
         Returns:
             Survival rate as a percentage accurate to 2 decimal places.
         """
-        if self._survival_rate is None:
-            kills = self.kill_count
-            num_results = self.num_results
-            self._survival_rate = round((1 - kills / num_results) * 100, 2) if num_results else 0.0
-
-        return self._survival_rate
+        return self.statistics.survival_rate
 
 
 @contextlib.contextmanager
-def use_db(path, mode=DB.Mode.create):
+def use_db(path, mode=DB.Mode.create, read_only=False, immutable=False, memory_mapped=True):
     """
     Open a DB in file `path` in mode `mode` as a context manager.
 
@@ -104,12 +653,16 @@ def use_db(path, mode=DB.Mode.create):
     Args:
       path: The path to the DB file.
       mode: The mode to open the DB with.
+      read_only: If `True`, open the DB read only and tuned for reporting.
+      immutable: If `True`, open the read only DB as immutable.
+      memory_mapped: If `False`, read the read only DB without memory
+        mapping it and with a small page cache.
 
     Raises:
       FileNotFoundError: If `mode` is `Mode.open` and `path` does not
         exist.
     """
-    database = DB(path, mode)
+    database = DB(path, mode, read_only=read_only, immutable=immutable, memory_mapped=memory_mapped)
     try:
         yield database
 
@@ -0,0 +1,54 @@
+"""Module to export machine readable report data."""
+import csv
+import json
+from typing import TextIO
+
+from cr_enhanced_report.db import DB
+
+SUMMARY_FIELDS = ('path', 'is_dir', 'score', 'killed', 'incompetent', 'survived')
+
+
+def write_work_items_ndjson(db: DB, stream: TextIO, only_completed: bool = False) -> None:
+    """
+    Write a JSON record per work item, one per line.
+
+    Records are written as they are read from the database, outputs and diffs are not included.
+
+    Args:
+        db: Instance of MyDB
+        stream: Text stream the records are written to.
+        only_completed: If `True`, only completed work items are written.
+    """
+    for mutation in db.iter_mutation_outcomes(only_completed=only_completed):
+        stream.write(
+            json.dumps(
+                {
+                    'job_id': mutation.job_id,
+                    'module_path': mutation.module_path,
+                    'operator_name': mutation.operator_name,
+                    'occurrence': mutation.occurrence,
+                    'start_pos': mutation.start_pos,
+                    'end_pos': mutation.end_pos,
+                    'worker_outcome': mutation.worker_outcome,
+                    'test_outcome': mutation.test_outcome,
+                },
+                separators=(',', ':'),
+            )
+        )
+        stream.write('\n')
+
+
+def write_summary_csv(db: DB, stream: TextIO) -> None:
+    """
+    Write the summary for every directory and module as CSV.
+
+    Args:
+        db: Instance of MyDB
+        stream: Text stream the CSV is written to.
+    """
+    writer = csv.writer(stream, lineterminator='\n')
+    writer.writerow(SUMMARY_FIELDS)
+    for summary in db.statistics.summary():
+        writer.writerow(
+            (summary.path, summary.is_dir, summary.score, summary.killed, summary.incompetent, summary.survived)
+        )
@@ -0,0 +1,107 @@
+"""Module to write report output files."""
+import contextlib
+import gzip
+import io
+import os
+import pathlib
+import secrets
+import sys
+from typing import BinaryIO, Iterator, TextIO
+
+BUFFER_SIZE = 1024 * 1024
+COMPRESS_LEVEL = 6
+# Permissions a temporary file is created with, before the umask is applied by the kernel.
+FILE_MODE = 0o666
+
+
+@contextlib.contextmanager
+def atomic_output(path: pathlib.Path, buffer_size: int = BUFFER_SIZE) -> Iterator[TextIO]:
+    """
+    Open a text stream that atomically replaces `path` once it is closed.
+
+    The stream is written in buffered chunks to a temporary file next to `path`, which is renamed into place
+    when the context exits. The temporary file is synced to disk before it is renamed, so a crash cannot leave
+    an empty or partly written file at `path`. If an exception is raised the temporary file is removed and
+    `path` is left untouched. Paths ending in `.gz` are gzip compressed.
+
+    Args:
+        path: Path of the file to write.
+        buffer_size: Size of the write buffer in bytes.
+
+    Yields:
+        Text stream to write to.
+    """
+    file_descriptor, temp_path = _create_temp_file(path=path)
+    try:
+        with os.fdopen(file_descriptor, 'wb', buffering=buffer_size) as raw_file:
+            with contextlib.ExitStack() as stack:
+                binary_file: BinaryIO | gzip.GzipFile = raw_file
+                if path.suffix == '.gz':
+                    binary_file = stack.enter_context(
+                        gzip.GzipFile(filename=path.stem, mode='wb', compresslevel=COMPRESS_LEVEL, fileobj=raw_file)
+                    )
+                yield stack.enter_context(_text_stream(binary_file=binary_file))
+            raw_file.flush()
+            os.fsync(raw_file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+@contextlib.contextmanager
+def open_output(path: pathlib.Path | None) -> Iterator[TextIO]:
+    """
+    Open a text stream for the report output.
+
+    Args:
+        path: Path of the file to write, stdout is used if None.
+
+    Yields:
+        Text stream to write to.
+    """
+    if path is None:
+        yield sys.stdout
+        return
+    with atomic_output(path) as stream:
+        yield stream
+
+
+@contextlib.contextmanager
+def _text_stream(binary_file: BinaryIO | gzip.GzipFile) -> Iterator[TextIO]:
+    """
+    Open a text stream writing to a binary file, which is left open when the stream is closed.
+
+    Args:
+        binary_file: Binary file to write to.
+
+    Yields:
+        Text stream to write to.
+    """
+    stream = io.TextIOWrapper(binary_file, encoding='utf-8')
+    try:
+        yield stream
+    finally:
+        stream.detach()
+
+
+def _create_temp_file(path: pathlib.Path) -> tuple[int, pathlib.Path]:
+    """
+    Create a new temporary file next to `path`.
+
+    The file is created with the usual permissions of a new file, the umask is applied by the kernel rather than
+    read, as reading it means setting it for every thread of the process.
+
+    Args:
+        path: Path of the file the temporary file replaces.
+
+    Returns:
+        Tuple of the open file descriptor and the path of the temporary file.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    while True:
+        temp_path = path.parent / f'.{path.name}.{secrets.token_hex(8)}.tmp'
+        try:
+            return os.open(temp_path, flags, FILE_MODE), temp_path
+        except FileExistsError:
+            continue
@@ -0,0 +1,88 @@
+"""Module to overlap producing items with consuming them."""
+import queue
+import threading
+from typing import Any, Iterable, Iterator, TypeVar
+
+T = TypeVar('T')
+
+# Seconds a blocked producer waits before checking if the consumer has stopped.
+PUT_TIMEOUT = 0.1
+
+_DONE = object()
+
+
+def prefetch(iterable: Iterable[T], size: int) -> Iterator[T]:
+    """
+    Iterate over `iterable` in a background thread, up to `size` items ahead of the consumer.
+
+    Items are passed through a bounded queue so memory use is capped by `size`. An exception raised by the
+    iterable is raised to the consumer, and if the consumer stops early the iterable is closed by the thread
+    that was iterating over it.
+
+    Args:
+        iterable: Items to produce.
+        size: Maximum number of items waiting to be consumed.
+
+    Yields:
+        Items from `iterable`, in order.
+    """
+    items: queue.Queue[tuple[Any, Exception | None]] = queue.Queue(maxsize=size)
+    stop = threading.Event()
+    thread = threading.Thread(target=_produce, args=(iterable, items, stop), name='prefetch', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _produce(iterable: Iterable[Any], items: queue.Queue, stop: threading.Event) -> None:
+    """
+    Put every item of `iterable` on the queue followed by a marker, until the consumer stops.
+
+    Args:
+        iterable: Items to produce.
+        items: Queue the items are put on.
+        stop: Event set when the consumer stops.
+    """
+    iterator = iter(iterable)
+    error: Exception | None = None
+    try:
+        for item in iterator:
+            if not _put(items=items, entry=(item, None), stop=stop):
+                return
+    except Exception as produce_error:
+        error = produce_error
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            close()
+        _put(items=items, entry=(_DONE, error), stop=stop)
+
+
+def _put(items: queue.Queue, entry: tuple[Any, Exception | None], stop: threading.Event) -> bool:
+    """
+    Put an entry on the queue, waiting while it is full unless the consumer stops.
+
+    Args:
+        items: Queue the entry is put on.
+        entry: Item and the exception raised producing it.
+        stop: Event set when the consumer stops.
+
+    Returns:
+        True if the entry was put on the queue, False if the consumer stopped.
+    """
+    while not stop.is_set():
+        try:
+            items.put(entry, timeout=PUT_TIMEOUT)
+        except queue.Full:
+            continue
+        return True
+    return False
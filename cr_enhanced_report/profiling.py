@@ -0,0 +1,207 @@
+"""Module to record the time and memory used by each stage of a report."""
+import contextlib
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Iterable, Iterator, TextIO, TypeVar
+
+try:
+    import resource
+except ImportError:
+    resource = None  # type: ignore[assignment]
+
+T = TypeVar('T')
+
+
+class Profiler(object):
+    """
+    Record the wall time, row count and memory of each stage of a report.
+
+    The resident memory high-water mark only ever rises, so each stage records `max_rss`, the high-water mark
+    of the process once the stage finished, and `max_rss_rise`, how much the stage raised it by. A stage that
+    uses less memory than an earlier stage has a rise of 0. When tracemalloc is tracing, each stage also records
+    `traced_peak`, the peak traced memory while the stage ran, including any stages nested in it.
+    """
+
+    __slots__ = (
+        '_enabled',
+        '_records',
+        '_running',
+        '_start',
+    )
+
+    def __init__(self, enabled: bool = True) -> None:
+        """
+        Initialize a Profiler object.
+
+        Args:
+            enabled: If `False`, stages are run without being recorded.
+        """
+        self._enabled = enabled
+        self._running: list[dict[str, Any]] = []
+        self._records: list[dict[str, Any]] = []
+        self._start = time.perf_counter()
+
+    @property
+    def records(self) -> list[dict[str, Any]]:
+        """
+        Property for the recorded stages, in the order they finished.
+
+        Returns:
+            List of stage records.
+        """
+        return self._records
+
+    @contextlib.contextmanager
+    def stage(self, name: str, **fields: Any) -> Iterator[dict[str, Any]]:
+        """
+        Record the stage ran within the context.
+
+        Args:
+            name: Name of the stage.
+            **fields: Extra fields to record, such as the module being rendered.
+
+        Yields:
+            The record for the stage, further fields such as the number of rows can be added to it.
+        """
+        record: dict[str, Any] = {'stage': name, **fields}
+        if not self._enabled:
+            yield record
+            return
+        start_rss = max_rss()
+        self._start_running(record=record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self._stop_running(record=record)
+            record['max_rss'] = max_rss()
+            record['max_rss_rise'] = self._rise(start_rss=start_rss, end_rss=record['max_rss'])
+            self._records.append(record)
+
+    def iterate(
+        self, name: str, iterable: Iterable[T], rows: Callable[[T], int] | None = None, **fields: Any
+    ) -> Iterator[T]:
+        """
+        Record a stage that produces items lazily.
+
+        Only the time and memory spent producing items is recorded, not that of the consumer between items, so
+        a query streamed while modules are rendered is not charged for the rendering.
+
+        Args:
+            name: Name of the stage.
+            iterable: Items produced by the stage.
+            rows: Function returning the number of rows in an item, each item is one row if not given.
+            **fields: Extra fields to record.
+
+        Yields:
+            Items produced by the stage.
+        """
+        if not self._enabled:
+            yield from iterable
+            return
+        record: dict[str, Any] = {'stage': name, **fields, 'rows': 0, 'items': 0, 'max_rss_rise': None}
+        seconds = 0.0
+        iterator = iter(iterable)
+        try:
+            while True:
+                start_rss = max_rss()
+                self._start_running(record=record)
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    seconds += time.perf_counter() - start
+                    self._stop_running(record=record)
+                    rise = self._rise(start_rss=start_rss, end_rss=max_rss())
+                    if rise is not None:
+                        record['max_rss_rise'] = (record['max_rss_rise'] or 0) + rise
+                record['items'] += 1
+                record['rows'] += 1 if rows is None else rows(item)
+                yield item
+        finally:
+            record['seconds'] = seconds
+            record['max_rss'] = max_rss()
+            self._records.append(record)
+
+    def write(self, stream: TextIO) -> None:
+        """
+        Write the recorded stages as JSON.
+
+        Args:
+            stream: Text stream the JSON is written to.
+        """
+        json.dump(
+            {
+                'seconds': time.perf_counter() - self._start,
+                'max_rss': max_rss(),
+                'stages': self._records,
+            },
+            stream,
+        )
+        stream.write('\n')
+
+    def _start_running(self, record: dict[str, Any]) -> None:
+        """
+        Mark a stage as running, so the memory traced from now on counts towards its traced peak.
+
+        Args:
+            record: Record of the stage.
+        """
+        self._update_traced_peaks()
+        if tracemalloc.is_tracing():
+            record.setdefault('traced_peak', 0)
+        self._running.append(record)
+
+    def _stop_running(self, record: dict[str, Any]) -> None:
+        """
+        Mark a stage as no longer running, updating its traced peak.
+
+        Args:
+            record: Record of the stage.
+        """
+        self._update_traced_peaks()
+        self._running.remove(record)
+
+    def _update_traced_peaks(self) -> None:
+        """Fold the traced peak since the last update into every running stage, then reset it."""
+        if not tracemalloc.is_tracing():
+            return
+        _, traced_peak = tracemalloc.get_traced_memory()
+        for record in self._running:
+            if 'traced_peak' in record:
+                record['traced_peak'] = max(record['traced_peak'], traced_peak)
+        tracemalloc.reset_peak()
+
+    @staticmethod
+    def _rise(start_rss: int | None, end_rss: int | None) -> int | None:
+        """
+        Calculate how much the resident memory high-water mark rose.
+
+        Args:
+            start_rss: High-water mark before the stage.
+            end_rss: High-water mark after the stage.
+
+        Returns:
+            Rise in bytes, None if the high-water mark is not available on this platform.
+        """
+        if start_rss is None or end_rss is None:
+            return None
+        return max(end_rss - start_rss, 0)
+
+
+def max_rss() -> int | None:
+    """
+    Fetch the resident memory high-water mark of the process, the most it has used since it started.
+
+    Returns:
+        High-water mark in bytes, None if it is not available on this platform.
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
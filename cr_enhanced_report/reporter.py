@@ -1,179 +1,1672 @@
 """Module to create the Cosmic Ray report."""
+import collections
+import contextlib
+import hashlib
+import io
+import json
+import multiprocessing
 import pathlib
 import re
+import sys
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from typing import (IO, Any, Collection, ContextManager, Iterable, Iterator,
+                    TextIO)
 
 from cosmic_ray.tools.html import pycharm_url
 from cosmic_ray.work_item import TestOutcome
 from yattag import Doc, SimpleDoc
 
-from cr_enhanced_report.datatypes import HtmlColor, SummaryDetail
+from cr_enhanced_report.cache import FragmentCache
+from cr_enhanced_report.datatypes import (HtmlColor, OperatorStatistics,
+                                          ReportOptions, SummaryDetail)
 from cr_enhanced_report.db import DB
+from cr_enhanced_report.output import atomic_output
+from cr_enhanced_report.pipeline import prefetch
+from cr_enhanced_report.search import SearchIndex
+from cr_enhanced_report.source import SourceFile, open_source_file
+from cr_enhanced_report.spill import SpilledList
+
+# Increment when the rendered task list changes so cached fragments are not reused.
+FRAGMENT_VERSION = 4
+# Stands in for the module's ID in cached task lists, so they are reused when the module moves within the report.
+# Text and embedded JSON always escape `>` and no attribute value can hold a NUL, so it only appears as the ID.
+FILE_ID_PLACEHOLDER = '\0>'
+
+# Fills outputs and diffs from their shared templates when a task is expanded.
+BLOB_SCRIPT = """
+document.addEventListener("show.bs.collapse", function (event) {
+    event.target.querySelectorAll("pre[data-blob]").forEach(function (pre) {
+        pre.textContent = document.getElementById("blob-" + pre.dataset.blob).content.textContent;
+        pre.removeAttribute("data-blob");
+    });
+});
+"""
+
+RENDERERS = ('yattag', 'template')
+# Characters of a spilled task list streamed to the report at a time.
+SPILL_CHUNK_SIZE = 1024 * 1024
+# Marks where a spilled task list is streamed into its module's accordion item.
+FRAGMENT_PLACEHOLDER = '<!--fragment-->'
+
+# Directories of a report split into pages, relative to its index.
+ASSETS_DIRECTORY = 'assets'
+MODULES_DIRECTORY = 'modules'
+# Threads writing module pages, each can have one page waiting as well as the page it is writing.
+PAGE_WRITERS = 4
+# Start methods of the render processes in order of preference. Forking is not used as the prefetch thread may
+# hold a lock when a worker is forked.
+PROCESS_START_METHODS = ('forkserver', 'spawn')
+
+REPORT_CSS = f"""
+                .survived {{
+                    background-color: {HtmlColor.red.value};
+                    color: white;
+                }}
+                .incompetent {{
+                    background-color: {HtmlColor.amber.value};
+                }}
+                .killed {{
+                    background-color: {HtmlColor.green.value};
+                    color: white;
+                }}
+                .pending {{
+                    background-color: {HtmlColor.lightgrey.value};
+                }}
+                .task-output, .task-diff {{
+                    background-color: {HtmlColor.lightgrey.value};
+                    padding: 30px;
+                }}
+                .task-summary {{
+                    padding: 10px 30px;
+                    margin-bottom: 20px;
+                }}
+                .operator-module td:first-child {{
+                    padding-left: 30px;
+                }}
+            """
+
+SOURCE_CONTEXT_CSS = f"""
+.source-context {{
+    background-color: {HtmlColor.lightgrey.value};
+    padding: 10px 30px;
+}}
+"""
+
+# Height in pixels of a row in a virtual task list, rows are absolutely positioned so it must be fixed.
+VIRTUAL_ROW_HEIGHT = 38
+VIRTUAL_TASKS_CSS = f"""
+.virtual-viewport {{
+    height: 60vh;
+    overflow-y: auto;
+}}
+.virtual-rows {{
+    position: relative;
+}}
+.virtual-task {{
+    position: absolute;
+    left: 0;
+    right: 0;
+    height: {VIRTUAL_ROW_HEIGHT}px;
+}}
+.virtual-details {{
+    padding-top: 20px;
+}}
+"""
+# Renders only the rows of a virtual task list that are visible, and the details of a task when it is clicked.
+VIRTUAL_TASKS_SCRIPT = """
+(function () {
+    var ROW_HEIGHT = %d;
+    var OVERSCAN = 10;
+
+    function element(tag, className, text) {
+        var node = document.createElement(tag);
+        if (className) {
+            node.className = className;
+        }
+        if (text !== undefined) {
+            node.textContent = text;
+        }
+        return node;
+    }
+
+    function blob(list, value) {
+        return list.data.blobs ? document.getElementById("blob-" + value).content.textContent : value;
+    }
+
+    function showDetails(list, task) {
+        var summary = element("section", "task-summary " + task[1]);
+        var outcome = element("p");
+        outcome.appendChild(element("b", null, task[1].toUpperCase()));
+        summary.appendChild(outcome);
+        summary.appendChild(element("p", null, "Worker outcome: " + task[2]));
+        summary.appendChild(element("p", null, "Test outcome: " + task[1]));
+        var link = element("a", "text-secondary");
+        link.href = "pycharm://open?file=" + list.data.module + "&line=" + task[3];
+        link.appendChild(element(
+            "button",
+            "btn btn-outline-dark",
+            list.data.module + ", start pos: (" + task[3] + ", " + task[4] + "), "
+                + "end pos: (" + task[5] + ", " + task[6] + ")"
+        ));
+        var location = element("pre", "location");
+        location.appendChild(link);
+        var nodes = [summary, location];
+        if (task[11]) {
+            nodes.push(element("pre", "source-context", task[11]));
+        }
+        nodes.push(
+            element("p", null, "Operator: " + task[7] + ", Occurrence: " + task[8]),
+            element("pre", "task-diff", blob(list, task[9])),
+            element("pre", "task-output", blob(list, task[10]))
+        );
+        list.details.replaceChildren.apply(list.details, nodes);
+    }
+
+    function renderRows(list) {
+        var tasks = list.data.tasks;
+        var top = list.viewport.scrollTop;
+        var first = Math.max(0, Math.floor(top / ROW_HEIGHT) - OVERSCAN);
+        var last = Math.min(tasks.length, Math.ceil((top + list.viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+        var rows = document.createDocumentFragment();
+        for (var index = first; index < last; index++) {
+            var task = tasks[index];
+            var outcome = task[1] === null ? "pending" : task[1];
+            var row = element("button", "virtual-task accordion-button collapsed " + outcome);
+            row.type = "button";
+            row.disabled = task[1] === null;
+            row.style.top = index * ROW_HEIGHT + "px";
+            row.dataset.index = index;
+            row.appendChild(element("span", "job_id", task[0]));
+            rows.appendChild(row);
+        }
+        list.rows.replaceChildren(rows);
+        list.scheduled = false;
+    }
+
+    function virtualList(container) {
+        if (container.virtualList) {
+            return container.virtualList;
+        }
+        var list = {
+            data: JSON.parse(document.getElementById(container.dataset.tasks).textContent),
+            viewport: container.querySelector(".virtual-viewport"),
+            rows: container.querySelector(".virtual-rows"),
+            details: container.querySelector(".virtual-details"),
+            scheduled: false
+        };
+        list.rows.style.height = list.data.tasks.length * ROW_HEIGHT + "px";
+        list.viewport.addEventListener("scroll", function () {
+            if (!list.scheduled) {
+                list.scheduled = true;
+                window.requestAnimationFrame(function () {
+                    renderRows(list);
+                });
+            }
+        });
+        list.rows.addEventListener("click", function (event) {
+            var row = event.target.closest(".virtual-task");
+            if (row && !row.disabled) {
+                showDetails(list, list.data.tasks[row.dataset.index]);
+            }
+        });
+        container.virtualList = list;
+        return list;
+    }
+
+    document.addEventListener("shown.bs.collapse", function (event) {
+        event.target.querySelectorAll(".virtual-tasks").forEach(function (container) {
+            renderRows(virtualList(container));
+        });
+    });
+
+    document.addEventListener("virtual-task", function (event) {
+        var list = virtualList(event.target);
+        var task = list.data.tasks[event.detail];
+        if (task) {
+            list.viewport.scrollTop = event.detail * ROW_HEIGHT;
+            renderRows(list);
+            if (task[1] !== null) {
+                showDetails(list, task);
+            }
+        }
+    });
+})();
+""" % VIRTUAL_ROW_HEIGHT
+
+# Opens the module and task named by a `#task-<module>-<task>` link, including tasks in a virtual task list.
+TASK_LINK_SCRIPT = """
+(function () {
+    function show(element, then) {
+        if (element.classList.contains("show")) {
+            then();
+            return;
+        }
+        element.addEventListener("shown.bs.collapse", function shown(event) {
+            if (event.target === element) {
+                element.removeEventListener("shown.bs.collapse", shown);
+                then();
+            }
+        });
+        bootstrap.Collapse.getOrCreateInstance(element, {toggle: false}).show();
+    }
+
+    function showTask() {
+        var match = /^#task-(\\d+)-(\\d+)$/.exec(window.location.hash);
+        var module = match && document.getElementById("flush-collapse" + match[1]);
+        var tasks = match && document.getElementById("accordian-tasks-" + match[1]);
+        if (!module || !tasks) {
+            return;
+        }
+        show(module, function () {
+            if (tasks.classList.contains("virtual-tasks")) {
+                tasks.dispatchEvent(new CustomEvent("virtual-task", {bubbles: true, detail: match[2] - 1}));
+                tasks.scrollIntoView();
+                return;
+            }
+            var heading = document.getElementById("flush-heading-" + match[1] + "-" + match[2]);
+            var body = document.getElementById("flush-collapse-" + match[1] + "-" + match[2]);
+            if (body) {
+                show(body, function () {
+                    heading.scrollIntoView();
+                });
+            }
+            if (heading) {
+                heading.scrollIntoView();
+            }
+        });
+    }
+
+    window.addEventListener("hashchange", showTask);
+    showTask();
+})();
+"""
+
+# Maximum number of tasks listed for a search, the number of matching tasks is always shown.
+SEARCH_RESULTS = 100
+# Searches the index embedded by _create_search_index, each term of the query must prefix a job ID or a token of
+# the task's module path or operator name.
+SEARCH_SCRIPT = """
+(function () {
+    var MAX_RESULTS = %d;
+    var input = document.getElementById("search-input");
+    var results = document.getElementById("search-results");
+    var count = document.getElementById("search-count");
+    var index = null;
+
+    if (!input) {
+        return;
+    }
+
+    function firstIndex(length, predicate) {
+        var low = 0;
+        var high = length;
+        while (low < high) {
+            var middle = (low + high) >> 1;
+            if (predicate(middle)) {
+                high = middle;
+            } else {
+                low = middle + 1;
+            }
+        }
+        return low;
+    }
+
+    function load() {
+        if (index === null) {
+            index = JSON.parse(document.getElementById("search-index").textContent);
+            index.tokenNames = Object.keys(index.tokens);
+        }
+        return index;
+    }
+
+    function termTasks(term) {
+        var tasks = new Set();
+        var order = index.jobOrder;
+        var first = firstIndex(order.length, function (position) {
+            return index.jobs[order[position]].toLowerCase() >= term;
+        });
+        for (var position = first; position < order.length; position++) {
+            if (!index.jobs[order[position]].toLowerCase().startsWith(term)) {
+                break;
+            }
+            tasks.add(order[position]);
+        }
+        index.tokenNames.forEach(function (token) {
+            if (!token.startsWith(term)) {
+                return;
+            }
+            index.tokens[token][0].forEach(function (position) {
+                var module = index.modules[position];
+                for (var task = module[3]; task < module[3] + module[4]; task++) {
+                    tasks.add(task);
+                }
+            });
+            index.tokens[token][1].forEach(function (position) {
+                index.operatorTasks[position].forEach(function (task) {
+                    tasks.add(task);
+                });
+            });
+        });
+        return tasks;
+    }
+
+    function search(query) {
+        var terms = query.toLowerCase().match(/[a-z0-9]+/g);
+        if (!terms) {
+            return null;
+        }
+        var matches = terms.map(termTasks).sort(function (first, second) {
+            return first.size - second.size;
+        });
+        return Array.from(matches[0]).filter(function (task) {
+            return matches.every(function (tasks) {
+                return tasks.has(task);
+            });
+        }).sort(function (first, second) {
+            return first - second;
+        });
+    }
+
+    function link(task) {
+        var module = index.modules[firstIndex(index.modules.length, function (position) {
+            return index.modules[position][3] > task;
+        }) - 1];
+        var anchor = document.createElement("a");
+        anchor.href = module[1] + "#task-" + module[2] + "-" + (task - module[3] + 1);
+        anchor.textContent = index.jobs[task] + " " + module[0];
+        var item = document.createElement("li");
+        item.appendChild(anchor);
+        return item;
+    }
+
+    input.addEventListener("input", function () {
+        load();
+        var tasks = search(input.value);
+        count.textContent = tasks === null ? "" : tasks.length + " matching tasks";
+        results.replaceChildren.apply(results, tasks === null ? [] : tasks.slice(0, MAX_RESULTS).map(link));
+    });
+
+    results.addEventListener("click", function (event) {
+        var anchor = event.target.closest("a");
+        if (anchor && anchor.hash === window.location.hash && anchor.pathname === window.location.pathname) {
+            window.dispatchEvent(new HashChangeEvent("hashchange"));
+        }
+    });
+})();
+""" % SEARCH_RESULTS
+
+# Templates used by the template renderer, producing the same markup as _create_task.
+PENDING_TASK_TEMPLATE = (
+    '<div class="accordion-item"><h2 class="accordion-header" id="flush-heading-{file_id}-{task_id}">'
+    '<button class="accordion-button collapsed pending" type="button" disabled="disabled">'
+    '<span class="job_id">{job_id}</span></button></h2></div>'
+).format
+TASK_TEMPLATE = (
+    '<div class="accordion-item"><h2 class="accordion-header" id="flush-heading-{file_id}-{task_id}">'
+    '<button data-bs-toggle="collapse" data-bs-target="#flush-collapse-{file_id}-{task_id}" aria-expanded="false" '
+    'aria-controls="flush-collapse-{file_id}-{task_id}" class="accordion-button collapsed {test_outcome}" '
+    'type="button"><span class="job_id">{job_id}</span></button></h2>'
+    '<div aria-labelledby="flush-heading-{file_id}" data-bs-parent="#accordian-tasks-{file_id}" '
+    'class="accordion-collapse collapse" id="flush-collapse-{file_id}-{task_id}"><div class="accordion-body">'
+    '<section class="task-summary {test_outcome}"><p><b>{test_outcome_upper}</b></p>'
+    '<p>Worker outcome: {worker_outcome}</p><p>Test outcome: {test_outcome}</p></section>'
+    '<pre class="location"><a href="{url}" class="text-secondary"><button class="btn btn-outline-dark">'
+    '{module_path}, start pos: {start_pos}, end pos: {end_pos}</button></a></pre>{context}'
+    '<p>Operator: {operator_name}, Occurrence: {occurrence}</p>{outputs}</div></div></div>'
+).format
+CONTEXT_TEMPLATE = '<pre class="source-context">{context}</pre>'.format
+OUTPUTS_TEMPLATE = '<pre class="task-diff">{diff}</pre><pre class="task-output">{output}</pre>'.format
+BLOB_OUTPUTS_TEMPLATE = (
+    '<pre data-blob="{diff_key}" class="task-diff"></pre><pre data-blob="{output_key}" class="task-output"></pre>'
+).format
 
 
 class Reporter(object):
     """Create an enhanced cosmic-ray work report from scratch."""
 
     __slots__ = (
+        '_blob_keys',
         '_db',
+        '_fragment_cache',
         '_only_completed',
+        '_options',
+        '_pages',
+        '_search_index',
     )
 
-    def __init__(self, db: DB, only_completed: bool) -> None:
+    def __init__(self, db: DB, only_completed: bool, options: ReportOptions | None = None) -> None:
         """
         Initialize Reporter.
 
         Args:
             db: Instance of MyDB
             only_completed: If `True`, only completed work items are reported.
+            options: Options used to create the report, defaults are used if not given.
         """
         self._db: DB = db
         self._only_completed: bool = only_completed
+        self._options: ReportOptions = options or ReportOptions()
+        self._blob_keys: set[str] = set()
+        self._pages: bool = False
+        self._search_index: SearchIndex | None = None
+        self._fragment_cache: FragmentCache | None = None
+        if self._options.cache_dir is not None:
+            self._fragment_cache = FragmentCache(
+                directory=self._options.cache_dir, max_size=self._options.cache_size
+            )
 
-    def create_report(self) -> None:
-        """Create a report from scratch."""
-        doc, _, _, _ = Doc().ttl()
-        doc.asis("<!DOCTYPE html>")
-        with (doc.tag("html", lang="en")):
-            with doc.tag("head"):
-                doc.stag("meta", charset="utf-8")
-                doc.stag("meta", name="viewport", content="width=device-width, initial-scale=1, shrink-to-fit=no")
-                doc.stag(
-                    "link",
-                    rel="stylesheet",
-                    href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css",
-                    integrity="sha384-QWTKZyjpPEjISv5WaRU9OFeRpok6YctnYmDr5pNlyT2bRjXh0JMhjY6hW+ALEwIH",
-                    crossorigin="anonymous",
+    def create_report(self, stream: TextIO | None = None) -> None:
+        """
+        Create a report from scratch.
+
+        The report is streamed to `stream`, the head and summary are written first followed by each module
+        section as soon as it has been rendered so that only a single module is held in memory at a time.
+
+        Args:
+            stream: Text stream the report is written to, the current stdout if None.
+        """
+        if stream is None:
+            stream = sys.stdout
+        profiler = self._db.profiler
+        with profiler.stage('report', only_completed=self._only_completed, jobs=self._options.jobs):
+            self._search_index = SearchIndex() if self._options.search_index else None
+            try:
+                doc = Doc()
+                doc.asis("<!DOCTYPE html>")
+                doc.asis('<html lang="en">')
+                self._create_head(doc=doc)
+                doc.asis('<body><div class="container">')
+                self._create_search(doc=doc)
+                with profiler.stage('summary') as stage:
+                    self._create_summary(doc=doc)
+                    stage['size'] = len(doc.getvalue())
+                self._write(stream=stream, text=doc.getvalue())
+                stream.flush()
+                self._create_analysis(stream=stream)
+                doc = Doc()
+                doc.asis("</div>")
+                self._create_search_index(doc=doc)
+                self._create_scripts(doc=doc)
+                doc.asis("</body></html>\n")
+                self._write(stream=stream, text=doc.getvalue())
+                stream.flush()
+            finally:
+                self._search_index = None
+
+    def create_pages(self, directory: pathlib.Path) -> None:
+        """
+        Create a report split into an index page holding the summary and a page for each module.
+
+        The styles and scripts shared by every page are written once to the assets directory, named by their
+        content so a browser can cache them across pages and reports. Module pages are written by a thread
+        pool while the next modules are rendered, a bounded number of pages are in flight at a time. The index
+        page is written last, so it can hold the search index of every module.
+
+        Args:
+            directory: Directory the report is written to, created if it does not exist.
+        """
+        profiler = self._db.profiler
+        with profiler.stage('pages', only_completed=self._only_completed, jobs=self._options.jobs):
+            modules_directory = directory / MODULES_DIRECTORY
+            modules_directory.mkdir(parents=True, exist_ok=True)
+            stylesheet = self._write_asset(directory=directory, content=self._stylesheet(), suffix='.css')
+            script = self._script()
+            if script is not None:
+                script = self._write_asset(directory=directory, content=script, suffix='.js')
+            self._pages = True
+            self._search_index = SearchIndex() if self._options.search_index else None
+            try:
+                self._write_module_pages(
+                    directory=modules_directory,
+                    stylesheet=f'../{stylesheet}',
+                    script=None if script is None else f'../{script}',
                 )
-                self._css(doc=doc)
-                with doc.tag("title"):
-                    doc.text("Cosmic Ray Enhanced Report")
-            with doc.tag("body"):
-                with doc.tag("div", klass="container"):
+                doc = Doc()
+                doc.asis("<!DOCTYPE html>")
+                doc.asis('<html lang="en">')
+                self._create_head(doc=doc, stylesheet=stylesheet)
+                doc.asis('<body><div class="container">')
+                self._create_search(doc=doc)
+                with profiler.stage('summary') as stage:
                     self._create_summary(doc=doc)
-                    self._create_analysis(doc=doc)
-                with doc.tag("script"):
-                    doc.attr(src="https://code.jquery.com/jquery-3.7.1.js")
-                    doc.attr(
-                        ("integrity", "sha256-eKhayi8LEQwp4NKxN+CfCh+3qOVUtJn3QNZ0TciWLP4=")
-                    )
-                    doc.attr(("crossorigin", "anonymous"))
-                with doc.tag("script"):
-                    doc.attr(src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/js/bootstrap.min.js")
-                    doc.attr(
-                        ("integrity", "sha384-0pUGZvbkm6XF6gxjEnlmuGrJXVbNuzT9qBBavbLwCsOGabYfZo0T0to5eqruptLy")
+                    stage['size'] = len(doc.getvalue())
+                doc.asis("</div>")
+                self._create_search_index(doc=doc)
+                self._create_scripts(doc=doc, script=script)
+                doc.asis("</body></html>\n")
+                with atomic_output(directory / 'index.html') as stream:
+                    self._write(stream=stream, text=doc.getvalue())
+            finally:
+                self._pages = False
+                self._search_index = None
+
+    def _write_module_pages(self, directory: pathlib.Path, stylesheet: str, script: str | None) -> None:
+        """
+        Write a page for each module using a thread pool.
+
+        Args:
+            directory: Directory the module pages are written to.
+            stylesheet: URL of the report's stylesheet, relative to the module pages.
+            script: URL of the report's script relative to the module pages, None if there is no script.
+        """
+        pending: collections.deque[Future[None]] = collections.deque()
+        with ThreadPoolExecutor(max_workers=PAGE_WRITERS, thread_name_prefix='page') as executor:
+            try:
+                for file_id, file_name, file_tasks, file_analysis in self._render_modules():
+                    self._index_module(file_id=file_id, file_name=file_name, file_tasks=file_tasks)
+                    pending.append(
+                        executor.submit(
+                            self._write_module_page,
+                            directory,
+                            stylesheet,
+                            script,
+                            file_id,
+                            file_name,
+                            file_tasks,
+                            file_analysis,
+                        )
                     )
-                    doc.attr(("crossorigin", "anonymous"))
+                    while len(pending) >= PAGE_WRITERS * 2:
+                        pending.popleft().result()
+                while pending:
+                    pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _write_module_page(
+        self,
+        directory: pathlib.Path,
+        stylesheet: str,
+        script: str | None,
+        file_id: int,
+        file_name: str,
+        file_tasks: list[Any] | SpilledList[Any],
+        file_analysis: str | IO[str],
+    ) -> None:
+        """
+        Write the page for a single module.
+
+        Args:
+            directory: Directory the module pages are written to.
+            stylesheet: URL of the report's stylesheet, relative to the module page.
+            script: URL of the report's script relative to the module page, None if there is no script.
+            file_id: Sequential ID of the module within the report.
+            file_name: Path of the module.
+            file_tasks: Work items for the module.
+            file_analysis: Rendered task list, or the temporary file holding it if the module was spilled.
+        """
+        doc = Doc()
+        doc.asis("<!DOCTYPE html>")
+        doc.asis('<html lang="en">')
+        self._create_head(doc=doc, stylesheet=stylesheet)
+        doc.asis('<body><div class="container">')
+        with doc.tag("nav"):
+            with doc.tag("a", href='../index.html'):
+                doc.text('Summary')
+        doc.asis('<section id="file-analysis"><div class="accordion accordion-flush" id="accordian-files">')
+        head = doc.getvalue()
+        doc = Doc()
+        doc.asis("</div></section></div>")
+        self._create_scripts(doc=doc, script=script)
+        doc.asis("</body></html>\n")
+        tail = doc.getvalue()
+        path = directory / self._module_page(f'/{file_name}')
+        try:
+            with atomic_output(path) as stream:
+                self._write(stream=stream, text=head, module=file_name)
+                self._write_module(
+                    stream=stream,
+                    file_id=file_id,
+                    file_name=file_name,
+                    file_tasks=file_tasks,
+                    file_analysis=file_analysis,
+                    blob_keys=set(),
+                )
+                self._write(stream=stream, text=tail, module=file_name)
+        finally:
+            if isinstance(file_tasks, SpilledList):
+                file_tasks.close()
+
+    @staticmethod
+    def _write_asset(directory: pathlib.Path, content: str, suffix: str) -> str:
+        """
+        Write an asset shared by the pages of a report, unless an asset with the same content was written.
+
+        Args:
+            directory: Directory the report is written to.
+            content: Content of the asset.
+            suffix: File suffix of the asset.
+
+        Returns:
+            URL of the asset, relative to `directory`.
+        """
+        name = f'report-{hashlib.blake2b(content.encode(), digest_size=10).hexdigest()}{suffix}'
+        assets_directory = directory / ASSETS_DIRECTORY
+        assets_directory.mkdir(parents=True, exist_ok=True)
+        path = assets_directory / name
+        if not path.exists():
+            with atomic_output(path) as stream:
+                stream.write(content)
+        return f'{ASSETS_DIRECTORY}/{name}'
+
+    def _write(self, stream: TextIO, text: str, module: str | None = None) -> None:
+        """
+        Write part of the report to the stream, recorded by the profiler.
+
+        Args:
+            stream: Text stream the report is written to.
+            text: Part of the report to write.
+            module: Path of the module the part is for, None for the head and scripts.
+        """
+        with self._db.profiler.stage('write', module=module, size=len(text)):
+            stream.write(text)
+
+    def _create_head(self, doc: SimpleDoc, stylesheet: str | None = None) -> None:
+        """
+        Create the document head.
+
+        Args:
+            doc: SimpleDoc object.
+            stylesheet: URL of the report's stylesheet, the styles are inlined if None.
+        """
+        with doc.tag("head"):
+            doc.stag("meta", charset="utf-8")
+            doc.stag("meta", name="viewport", content="width=device-width, initial-scale=1, shrink-to-fit=no")
+            doc.stag(
+                "link",
+                rel="stylesheet",
+                href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css",
+                integrity="sha384-QWTKZyjpPEjISv5WaRU9OFeRpok6YctnYmDr5pNlyT2bRjXh0JMhjY6hW+ALEwIH",
+                crossorigin="anonymous",
+            )
+            if stylesheet is not None:
+                doc.stag("link", rel="stylesheet", href=stylesheet)
+            else:
+                self._css(doc=doc)
+                if self._options.virtual_tasks:
+                    with doc.tag("style"):
+                        doc.asis(VIRTUAL_TASKS_CSS)
+                if self._options.context_lines > 0:
+                    with doc.tag("style"):
+                        doc.asis(SOURCE_CONTEXT_CSS)
+            with doc.tag("title"):
+                doc.text("Cosmic Ray Enhanced Report")
+
+    def _create_scripts(self, doc: SimpleDoc, script: str | None = None) -> None:
+        """
+        Create the script tags loaded at the end of the document body.
+
+        Args:
+            doc: SimpleDoc object.
+            script: URL of the report's script, the scripts are inlined if None.
+        """
+        with doc.tag("script"):
+            doc.attr(src="https://code.jquery.com/jquery-3.7.1.js")
+            doc.attr(
+                ("integrity", "sha256-eKhayi8LEQwp4NKxN+CfCh+3qOVUtJn3QNZ0TciWLP4=")
+            )
+            doc.attr(("crossorigin", "anonymous"))
+        with doc.tag("script"):
+            doc.attr(src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/js/bootstrap.min.js")
+            doc.attr(
+                ("integrity", "sha384-0pUGZvbkm6XF6gxjEnlmuGrJXVbNuzT9qBBavbLwCsOGabYfZo0T0to5eqruptLy")
+            )
+            doc.attr(("crossorigin", "anonymous"))
+        if script is not None:
+            doc.line("script", "", src=script)
+            return
+        if self._options.dedupe_outputs:
+            with doc.tag("script"):
+                doc.asis(BLOB_SCRIPT)
+        if self._options.virtual_tasks:
+            with doc.tag("script"):
+                doc.asis(VIRTUAL_TASKS_SCRIPT)
+        if self._options.search_index:
+            with doc.tag("script"):
+                doc.asis(TASK_LINK_SCRIPT + SEARCH_SCRIPT)
+
+    def _stylesheet(self) -> str:
+        """
+        Create the stylesheet shared by the pages of a report.
 
-        print(doc.getvalue())
+        Returns:
+            The styles inlined in a single page report.
+        """
+        stylesheet = REPORT_CSS
+        if self._options.virtual_tasks:
+            stylesheet += VIRTUAL_TASKS_CSS
+        if self._options.context_lines > 0:
+            stylesheet += SOURCE_CONTEXT_CSS
+        return stylesheet
+
+    def _script(self) -> str | None:
+        """
+        Create the script shared by the pages of a report.
+
+        Returns:
+            The scripts inlined in a single page report, None if there are none.
+        """
+        scripts = []
+        if self._options.dedupe_outputs:
+            scripts.append(BLOB_SCRIPT)
+        if self._options.virtual_tasks:
+            scripts.append(VIRTUAL_TASKS_SCRIPT)
+        if self._options.search_index:
+            scripts.append(TASK_LINK_SCRIPT + SEARCH_SCRIPT)
+        return ''.join(scripts) or None
 
-    def _create_analysis(self, doc: SimpleDoc) -> None:
+    def _create_analysis(self, stream: TextIO) -> None:
         """
         Create analysis section from scratch.
 
+        Each module is rendered into its own document which is written to `stream` and discarded before the
+        next module is rendered.
+
+        Args:
+            stream: Text stream the analysis is written to.
+        """
+        stream.write('<section id="file-analysis"><div class="accordion accordion-flush" id="accordian-files">')
+        self._blob_keys.clear()
+        for file_id, file_name, file_tasks, file_analysis in self._render_modules():
+            self._index_module(file_id=file_id, file_name=file_name, file_tasks=file_tasks)
+            self._write_module(
+                stream=stream,
+                file_id=file_id,
+                file_name=file_name,
+                file_tasks=file_tasks,
+                file_analysis=file_analysis,
+                blob_keys=self._blob_keys,
+            )
+        stream.write("</div></section>")
+
+    def _write_module(
+        self,
+        stream: TextIO,
+        file_id: int,
+        file_name: str,
+        file_tasks: list[Any] | SpilledList[Any],
+        file_analysis: str | IO[str],
+        blob_keys: set[str],
+    ) -> None:
+        """
+        Write the accordion item for a module, removing the temporary files of a spilled module once written.
+
+        Args:
+            stream: Text stream the module is written to.
+            file_id: Sequential ID of the module within the report.
+            file_name: Path of the module.
+            file_tasks: Work items for the module.
+            file_analysis: Rendered task list, or the temporary file holding it if the module was spilled.
+            blob_keys: Keys of the outputs and diffs already written to the document.
+        """
+        try:
+            if isinstance(file_analysis, str):
+                doc = Doc()
+                if self._options.dedupe_outputs:
+                    self._create_blobs(file_tasks=file_tasks, doc=doc, blob_keys=blob_keys)
+                self._create_module_analysis(file_id=file_id, file_name=file_name, file_analysis=file_analysis, doc=doc)
+                self._write(stream=stream, text=doc.getvalue(), module=file_name)
+            else:
+                self._write_spilled_module(
+                    stream=stream,
+                    file_id=file_id,
+                    file_name=file_name,
+                    file_tasks=file_tasks,
+                    file_analysis=file_analysis,
+                    blob_keys=blob_keys,
+                )
+        finally:
+            if isinstance(file_tasks, SpilledList):
+                file_tasks.close()
+
+    def _write_spilled_module(
+        self,
+        stream: TextIO,
+        file_id: int,
+        file_name: str,
+        file_tasks: Iterable[Any],
+        file_analysis: IO[str],
+        blob_keys: set[str],
+    ) -> None:
+        """
+        Write a module whose work items and task list were spilled, streaming them back a piece at a time.
+
+        The temporary file holding the task list is removed once the module is written.
+
+        Args:
+            stream: Text stream the module is written to.
+            file_id: Sequential ID of the module within the report.
+            file_name: Path of the module.
+            file_tasks: Spilled work items for the module.
+            file_analysis: Temporary file holding the rendered task list.
+            blob_keys: Keys of the outputs and diffs already written to the document.
+        """
+        with file_analysis:
+            if self._options.dedupe_outputs:
+                for file_task in file_tasks:
+                    doc = Doc()
+                    self._create_blobs(file_tasks=[file_task], doc=doc, blob_keys=blob_keys)
+                    self._write(stream=stream, text=doc.getvalue(), module=file_name)
+            doc = Doc()
+            self._create_module_analysis(
+                file_id=file_id, file_name=file_name, file_analysis=FRAGMENT_PLACEHOLDER, doc=doc
+            )
+            head, tail = doc.getvalue().split(FRAGMENT_PLACEHOLDER)
+            self._write(stream=stream, text=head, module=file_name)
+            file_analysis.seek(0)
+            chunk = file_analysis.read(SPILL_CHUNK_SIZE)
+            while chunk:
+                self._write(stream=stream, text=chunk, module=file_name)
+                chunk = file_analysis.read(SPILL_CHUNK_SIZE)
+            self._write(stream=stream, text=tail, module=file_name)
+
+    def _module_budget(self) -> int | None:
+        """
+        Calculate the share of the memory budget for each module held at a time.
+
+        A module is held while it is fetched and while it is written, along with the modules fetched ahead,
+        those being rendered by the process pool and those waiting for a page writer.
+
+        Returns:
+            Budget in bytes for each module, None if there is no memory budget.
+        """
+        if self._options.max_memory is None:
+            return None
+        in_flight = 2 + self._options.prefetch
+        if self._options.jobs > 1:
+            in_flight += self._options.jobs * 2
+        if self._pages:
+            in_flight += PAGE_WRITERS * 2
+        return max(self._options.max_memory // in_flight, 1)
+
+    def _render_modules(self) -> Iterator[tuple[int, str, list[Any] | SpilledList[Any], str | IO[str]]]:
+        """
+        Render the task list of each module in report order.
+
+        With more than one job the task lists are rendered by a process pool, a bounded number of modules are
+        in flight at a time so memory use does not grow with the size of the session. Spilled modules are
+        rendered in this process once the modules before them are written, as they are not sent to the pool.
+        The workers are not forked, as other threads such as the prefetch thread are running when they start.
+
+        Yields:
+            Tuple of the module's sequential ID, path, work items and rendered task list, a temporary file
+            holding the task list if the module was spilled.
+        """
+        groups = enumerate(self._fetch_work_items_data(), start=1)
+        if self._options.jobs <= 1:
+            for file_id, (file_name, file_tasks) in groups:
+                yield file_id, file_name, file_tasks, self._render_file_analysis(
+                    file_id=file_id, file_name=file_name, file_tasks=file_tasks
+                )
+            return
+
+        max_pending = self._options.jobs * 2
+        pending: collections.deque[tuple[int, str, list[Any], str | None, str | Future[str]]] = collections.deque()
+        with ProcessPoolExecutor(max_workers=self._options.jobs, mp_context=self._process_context()) as executor:
+            for file_id, (file_name, file_tasks) in groups:
+                if isinstance(file_tasks, SpilledList):
+                    while pending:
+                        yield self._resolve_file_analysis(*pending.popleft())
+                    yield file_id, file_name, file_tasks, self._render_file_analysis(
+                        file_id=file_id, file_name=file_name, file_tasks=file_tasks
+                    )
+                    continue
+                fragment, key = self._lookup_file_analysis(file_id=file_id, file_name=file_name, file_tasks=file_tasks)
+                if fragment is None:
+                    render_id = file_id if key is None else FILE_ID_PLACEHOLDER
+                    future = executor.submit(self._render_file_tasks, render_id, file_tasks, self._options)
+                    pending.append((file_id, file_name, file_tasks, key, future))
+                else:
+                    pending.append((file_id, file_name, file_tasks, None, fragment))
+                while len(pending) >= max_pending:
+                    yield self._resolve_file_analysis(*pending.popleft())
+            while pending:
+                yield self._resolve_file_analysis(*pending.popleft())
+
+    @staticmethod
+    def _process_context() -> multiprocessing.context.BaseContext:
+        """
+        Create the multiprocessing context the render processes are started with.
+
+        Returns:
+            Context of the first start method in PROCESS_START_METHODS available on the platform.
+        """
+        start_methods = multiprocessing.get_all_start_methods()
+        return multiprocessing.get_context(next(method for method in PROCESS_START_METHODS if method in start_methods))
+
+    def _resolve_file_analysis(
+        self, file_id: int, file_name: str, file_tasks: list[Any], key: str | None, file_analysis: str | Future[str]
+    ) -> tuple[int, str, list[Any], str]:
+        """
+        Wait for a module rendered by the process pool, storing it in the cache.
+
+        The profiler records the time spent waiting for the module rather than the time taken to render it.
+
+        Args:
+            file_id: Sequential ID of the module within the report.
+            file_name: Path of the module.
+            file_tasks: Work items for the module.
+            key: Cache key of the module, None if it was not rendered.
+            file_analysis: Rendered task list, or future for the task list being rendered.
+
+        Returns:
+            Tuple of the module's sequential ID, path, work items and rendered task list.
+        """
+        with self._db.profiler.stage('render_module', module=file_name, rows=len(file_tasks)) as stage:
+            stage['cached'] = not isinstance(file_analysis, Future)
+            if isinstance(file_analysis, Future):
+                file_analysis = self._store_file_analysis(
+                    file_id=file_id, file_name=file_name, key=key, fragment=file_analysis.result()
+                )
+            stage['size'] = len(file_analysis)
+        return file_id, file_name, file_tasks, file_analysis
+
+    def _create_blobs(self, file_tasks: Iterable[Any], doc: SimpleDoc, blob_keys: set[str]) -> None:
+        """
+        Create a template for each output and diff of a module that has not already been written to the report.
+
+        Tasks reference the templates by the hash of their content, so each distinct output or diff is only
+        escaped and written once however many tasks share it.
+
         Args:
+            file_tasks: Work items for the module.
             doc: SimpleDoc object.
+            blob_keys: Keys of the outputs and diffs already written to the document, updated with those written.
         """
-        with doc.tag("section", id="file-analysis"):
-            work_item_data = self._fetch_work_items_data()
-            with doc.tag("div", klass="accordion accordion-flush", id="accordian-files"):
-                file_id = 1
-                for file_name in sorted(work_item_data.keys()):
-                    with doc.tag("div", klass="accordion-item"):
-                        with doc.tag("h2", klass="accordion-header", id=f"flush-heading{file_id}"):
-                            with doc.tag(
-                                "button",
-                                ("data-bs-toggle", "collapse"),
-                                ("data-bs-target", f"#flush-collapse{file_id}"),
-                                ("aria-expanded", "false"),
-                                ("aria-controls", f"flush-collapse{file_id}"),
-                                klass="accordion-button collapsed",
-                                type="button",
-                                id=self._normalize_path(f'/{file_name}'),
-                            ):
-                                doc.text(f'/{file_name}')
-                        with doc.tag(
-                            "div",
-                            ("data-bs-parent", "#accordian-files"),
-                            ("aria-labelledby", "flush-heading{file_id}"),
-                            klass="accordion-collapse collapse",
-                            id=f"flush-collapse{file_id}"
-                        ):
-                            with doc.tag("div", klass="accordion-body"):
-                                self._create_file_analysis(
-                                    file_id=file_id, file_tasks=work_item_data[file_name], doc=doc
-                                )
-                    file_id += 1
+        for _, result, _ in file_tasks:
+            if result is None:
+                continue
+            for blob in (result.diff, result.output):
+                blob_key = self._blob_key(blob=blob)
+                if blob_key in blob_keys:
+                    continue
+                blob_keys.add(blob_key)
+                with doc.tag("template", id=f"blob-{blob_key}"):
+                    doc.text(blob)
+
+    @staticmethod
+    def _blob_key(blob: str) -> str:
+        """
+        Calculate the key identifying an output or diff.
+
+        Args:
+            blob: Output or diff.
+
+        Returns:
+            Hex digest of the content.
+        """
+        return hashlib.blake2b(blob.encode(), digest_size=10).hexdigest()
+
+    def _create_module_analysis(self, file_id: int, file_name: str, file_analysis: str, doc: SimpleDoc) -> None:
+        """
+        Create the accordion item for a single module.
+
+        Args:
+            file_id: Sequential ID of the module within the report.
+            file_name: Path of the module.
+            file_analysis: Rendered task list for the module.
+            doc: SimpleDoc object.
+        """
+        with doc.tag("div", klass="accordion-item"):
+            with doc.tag("h2", klass="accordion-header", id=f"flush-heading{file_id}"):
+                with doc.tag(
+                    "button",
+                    ("data-bs-toggle", "collapse"),
+                    ("data-bs-target", f"#flush-collapse{file_id}"),
+                    ("aria-expanded", "false"),
+                    ("aria-controls", f"flush-collapse{file_id}"),
+                    klass="accordion-button collapsed",
+                    type="button",
+                    id=self._normalize_path(f'/{file_name}'),
+                ):
+                    doc.text(f'/{file_name}')
+            with doc.tag(
+                "div",
+                ("data-bs-parent", "#accordian-files"),
+                ("aria-labelledby", "flush-heading{file_id}"),
+                klass="accordion-collapse collapse",
+                id=f"flush-collapse{file_id}"
+            ):
+                with doc.tag("div", klass="accordion-body"):
+                    doc.asis(file_analysis)
+
+    def _render_file_analysis(self, file_id: int, file_name: str, file_tasks) -> str | IO[str]:
+        """
+        Render the task list for a module, reusing the cached fragment if the module is unchanged.
+
+        The task list of a spilled module is not cached, it is rendered a task at a time to a temporary file. The
+        module is already over its share of the memory budget, so its task list is not kept in memory at all.
+
+        Args:
+            file_id: Sequential ID of the module within the report.
+            file_name: Path of the module.
+            file_tasks: Work items for the module.
+
+        Returns:
+            Rendered task list, or the temporary file holding it if the module was spilled.
+        """
+        with self._db.profiler.stage('render_module', module=file_name, rows=len(file_tasks)) as stage:
+            if isinstance(file_tasks, SpilledList):
+                stage['spilled'] = True
+                spilled: IO[str] = tempfile.TemporaryFile(mode='w+', encoding='utf-8', newline='')
+                self._write_file_tasks(file_id=file_id, file_tasks=file_tasks, options=self._options, stream=spilled)
+                return spilled
+            fragment, key = self._lookup_file_analysis(file_id=file_id, file_name=file_name, file_tasks=file_tasks)
+            stage['cached'] = fragment is not None
+            if fragment is None:
+                render_id = file_id if key is None else FILE_ID_PLACEHOLDER
+                fragment = self._render_file_tasks(file_id=render_id, file_tasks=file_tasks, options=self._options)
+                fragment = self._store_file_analysis(file_id=file_id, file_name=file_name, key=key, fragment=fragment)
+            stage['size'] = len(fragment)
+        return fragment
+
+    def _lookup_file_analysis(self, file_id: int, file_name: str, file_tasks) -> tuple[str | None, str | None]:
+        """
+        Look up the previously rendered task list for a module.
+
+        The key only depends on the module's work items, so a task list is reused wherever the module is in the
+        report, its ID is filled in once it is fetched.
+
+        Args:
+            file_id: Sequential ID of the module within the report.
+            file_name: Path of the module.
+            file_tasks: Work items for the module.
+
+        Returns:
+            Tuple of the cached task list, None if it is not cached, and the cache key, None if not caching. When
+            the key is not None the task list should be rendered with FILE_ID_PLACEHOLDER as the module's ID.
+        """
+        if self._fragment_cache is None:
+            return None, None
+        key = self._fragment_key(file_tasks=file_tasks, options=self._options)
+        fragment = self._fragment_cache.get(key=key)
+        if fragment is not None:
+            fragment = fragment.replace(FILE_ID_PLACEHOLDER, str(file_id))
+        return fragment, key
+
+    def _store_file_analysis(self, file_id: int, file_name: str, key: str | None, fragment: str) -> str:
+        """
+        Store a rendered task list so it can be reused.
+
+        Args:
+            file_id: Sequential ID of the module within the report.
+            file_name: Path of the module.
+            key: Cache key returned by _lookup_file_analysis.
+            fragment: Rendered task list, with FILE_ID_PLACEHOLDER as the module's ID if the key is not None.
+
+        Returns:
+            Rendered task list with the module's ID.
+        """
+        if key is None:
+            return fragment
+        if self._fragment_cache is not None:
+            self._fragment_cache.put(key=key, fragment=fragment)
+        return fragment.replace(FILE_ID_PLACEHOLDER, str(file_id))
+
+    @staticmethod
+    def _render_file_tasks(file_id: int | str, file_tasks, options: ReportOptions) -> str:
+        """
+        Render the task list for a module.
+
+        This is a staticmethod so that it can be run in a process pool.
+
+        Args:
+            file_id: Sequential ID of the module within the report, or FILE_ID_PLACEHOLDER if it is cached.
+            file_tasks: Work items for the module.
+            options: Options used to create the report.
+
+        Returns:
+            Rendered task list.
+        """
+        stream = io.StringIO()
+        Reporter._write_file_tasks(file_id=file_id, file_tasks=file_tasks, options=options, stream=stream)
+        return stream.getvalue()
 
-    def _fetch_work_items_data(self):
-        """Fetch and organize work items based on the file."""
+    @staticmethod
+    def _write_file_tasks(file_id: int | str, file_tasks, options: ReportOptions, stream: IO[str]) -> None:
+        """
+        Render the task list for a module a task at a time, writing each task to `stream` once rendered.
+
+        Args:
+            file_id: Sequential ID of the module within the report, or FILE_ID_PLACEHOLDER if it is cached.
+            file_tasks: Work items for the module.
+            options: Options used to create the report.
+            stream: Text stream the task list is written to.
+        """
+        with Reporter._open_module_source(file_tasks=file_tasks, options=options) as source:
+            if options.virtual_tasks:
+                Reporter._write_file_tasks_virtual(
+                    file_id=file_id,
+                    file_tasks=file_tasks,
+                    stream=stream,
+                    dedupe_outputs=options.dedupe_outputs,
+                    source=source,
+                    context_lines=options.context_lines,
+                )
+                return
+            stream.write(f'<div class="accordion-item" id="accordian-tasks-{file_id}">')
+            for task_id, file_task in enumerate(file_tasks, start=1):
+                stream.write(
+                    Reporter._render_task(
+                        file_id=file_id, task_id=task_id, file_task=file_task, options=options, source=source
+                    )
+                )
+                # Released before the next task is read, so a spilled module only holds one task in memory.
+                del file_task
+            stream.write('</div>')
+
+    @staticmethod
+    def _render_task(
+        file_id: int | str, task_id: int, file_task, options: ReportOptions, source: SourceFile | None
+    ) -> str:
+        """
+        Render a task with the renderer chosen in the options.
+
+        Args:
+            file_id: Sequential ID of the module within the report, or FILE_ID_PLACEHOLDER if it is cached.
+            task_id: Position of the task within the module, starting at 1.
+            file_task: Work item for the task.
+            options: Options used to create the report.
+            source: Source file of the module, None if context is not shown.
+
+        Returns:
+            Rendered task.
+        """
+        if options.renderer == 'template':
+            return Reporter._render_task_template(
+                file_id=file_id,
+                task_id=task_id,
+                file_task=file_task,
+                dedupe_outputs=options.dedupe_outputs,
+                source=source,
+                context_lines=options.context_lines,
+            )
+        doc = Doc()
+        Reporter._create_task(
+            file_id=file_id,
+            task_id=task_id,
+            file_task=file_task,
+            doc=doc,
+            dedupe_outputs=options.dedupe_outputs,
+            source=source,
+            context_lines=options.context_lines,
+        )
+        return doc.getvalue()
+
+    @staticmethod
+    def _source_path(module_path: str, options: ReportOptions) -> pathlib.Path:
+        """
+        Calculate the path of a module's source file.
+
+        Args:
+            module_path: Path of the module.
+            options: Options used to create the report.
+
+        Returns:
+            Path of the source file, relative module paths are resolved from the source root.
+        """
+        return (options.source_root or pathlib.Path.cwd()) / module_path
+
+    @staticmethod
+    def _source_stamp(module_path: str, options: ReportOptions) -> str:
+        """
+        Identify the version of a module's source file by its size and modification time.
+
+        Args:
+            module_path: Path of the module.
+            options: Options used to create the report.
+
+        Returns:
+            Size and modification time of the source file, `missing` if it cannot be read.
+        """
+        try:
+            source_stat = Reporter._source_path(module_path=module_path, options=options).stat()
+        except OSError:
+            return 'missing'
+        return f'{source_stat.st_size}\0{source_stat.st_mtime_ns}'
+
+    @staticmethod
+    def _open_module_source(file_tasks, options: ReportOptions) -> ContextManager[SourceFile | None]:
+        """
+        Open a module's source file once so that it is shared by every task in the module.
+
+        Args:
+            file_tasks: Work items for the module.
+            options: Options used to create the report.
+
+        Returns:
+            Context manager for the source file, None if context is not shown or the file cannot be read.
+        """
+        if options.context_lines <= 0:
+            return contextlib.nullcontext()
+        return open_source_file(
+            path=Reporter._source_path(module_path=str(file_tasks[0][2].module_path), options=options)
+        )
+
+    @staticmethod
+    def _task_context(source: SourceFile | None, mutation_spec, context_lines: int) -> str:
+        """
+        Create the source context snippet for a task.
+
+        Args:
+            source: Source file of the module, None if context is not shown.
+            mutation_spec: Mutation spec of the task.
+            context_lines: Number of lines shown before and after the mutated lines.
+
+        Returns:
+            The snippet, empty if there is none.
+        """
+        if source is None:
+            return ''
+        return source.context(
+            start_line=mutation_spec.start_pos[0], end_line=mutation_spec.end_pos[0], context_lines=context_lines
+        )
+
+    @staticmethod
+    def _write_file_tasks_virtual(
+        file_id: int | str,
+        file_tasks,
+        stream: IO[str],
+        dedupe_outputs: bool = False,
+        source: SourceFile | None = None,
+        context_lines: int = 0,
+    ) -> None:
+        """
+        Render the task list for a module as compact JSON shown by a virtual list.
+
+        Each task is an array of its job ID, test outcome, worker outcome, start and end positions, operator,
+        occurrence, diff, output and the source context if shown. Pending tasks only have a job ID and a null
+        test outcome. The script
+        creates elements for the rows in view and the task that was clicked, so the size of the page does not
+        grow with the number of tasks.
+
+        Args:
+            file_id: Sequential ID of the module within the report, or FILE_ID_PLACEHOLDER if it is cached.
+            file_tasks: Work items for the module.
+            stream: Text stream the task list is written to, a task at a time.
+            dedupe_outputs: If `True`, diffs and outputs are the keys of the templates written by _create_blobs.
+            source: Source file of the module, None if context is not shown.
+            context_lines: Number of lines shown before and after the mutated lines.
+        """
+        header = Reporter._encode_virtual_data(
+            data={'module': str(file_tasks[0][2].module_path), 'blobs': dedupe_outputs}
+        )
+        stream.write(
+            f'<div class="virtual-tasks" id="accordian-tasks-{file_id}" data-tasks="tasks-{file_id}">'
+            '<div class="virtual-viewport"><div class="virtual-rows"></div></div><div class="virtual-details"></div>'
+            f'<script type="application/json" id="tasks-{file_id}">{header[:-1]},"tasks":['
+        )
+        separator = ''
+        for file_task in file_tasks:
+            task = Reporter._virtual_task(
+                file_task=file_task, dedupe_outputs=dedupe_outputs, source=source, context_lines=context_lines
+            )
+            stream.write(separator + Reporter._encode_virtual_data(data=task))
+            separator = ','
+            # Released before the next task is read, so a spilled module only holds one task in memory.
+            del file_task, task
+        stream.write(']}</script></div>')
+
+    @staticmethod
+    def _virtual_task(
+        file_task, dedupe_outputs: bool, source: SourceFile | None, context_lines: int
+    ) -> list[Any]:
+        """
+        Create the array for a task shown by a virtual list.
+
+        Args:
+            file_task: Work item for the task.
+            dedupe_outputs: If `True`, diffs and outputs are the keys of the templates written by _create_blobs.
+            source: Source file of the module, None if context is not shown.
+            context_lines: Number of lines shown before and after the mutated lines.
+
+        Returns:
+            The task's fields, only the job ID and a null test outcome for pending tasks.
+        """
+        work_item, result, mutation_spec = file_task
+        if result is None:
+            return [work_item.job_id, None]
+        diff, output = result.diff, result.output
+        if dedupe_outputs:
+            diff, output = Reporter._blob_key(blob=diff), Reporter._blob_key(blob=output)
+        task = [
+            work_item.job_id,
+            result.test_outcome.value,
+            result.worker_outcome.value,
+            *mutation_spec.start_pos,
+            *mutation_spec.end_pos,
+            mutation_spec.operator_name,
+            mutation_spec.occurrence,
+            diff,
+            output,
+        ]
+        if source is not None:
+            task.append(Reporter._task_context(source=source, mutation_spec=mutation_spec, context_lines=context_lines))
+        return task
+
+    @staticmethod
+    def _encode_virtual_data(data: Any) -> str:
+        """
+        Encode data embedded in a virtual list's script element as compact JSON.
+
+        Args:
+            data: Data to encode.
+
+        Returns:
+            JSON escaped so the data cannot close the script element it is embedded in.
+        """
+        encoded = json.dumps(data, separators=(',', ':'))
+        return encoded.replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026')
+
+    @staticmethod
+    def _render_task_template(
+        file_id: int | str,
+        task_id: int,
+        file_task,
+        dedupe_outputs: bool = False,
+        source: SourceFile | None = None,
+        context_lines: int = 0,
+    ) -> str:
+        """
+        Render a task from precompiled templates.
+
+        Produces the same markup as _create_task, but the task is a single template substitution with every
+        field escaped once, instead of a nested context manager per element.
+
+        Args:
+            file_id: Sequential ID of the module within the report, or FILE_ID_PLACEHOLDER if it is cached.
+            task_id: Sequential ID of the task within the module.
+            file_task: Work item for the task.
+            dedupe_outputs: If `True`, outputs and diffs reference the templates written by _create_blobs.
+            source: Source file of the module, None if context is not shown.
+            context_lines: Number of lines shown before and after the mutated lines.
+
+        Returns:
+            Rendered task.
+        """
+        escape = Reporter._escape_text
+        work_item, result, mutation_spec = file_task
+        if result is None:
+            return PENDING_TASK_TEMPLATE(file_id=file_id, task_id=task_id, job_id=escape(work_item.job_id))
+        if dedupe_outputs:
+            outputs = BLOB_OUTPUTS_TEMPLATE(
+                diff_key=Reporter._blob_key(blob=result.diff),
+                output_key=Reporter._blob_key(blob=result.output),
+            )
+        else:
+            outputs = OUTPUTS_TEMPLATE(diff=escape(result.diff), output=escape(result.output))
+        context = Reporter._task_context(source=source, mutation_spec=mutation_spec, context_lines=context_lines)
+        module_path = str(mutation_spec.module_path)
+        test_outcome = escape(result.test_outcome.value)
+        return TASK_TEMPLATE(
+            file_id=file_id,
+            task_id=task_id,
+            job_id=escape(work_item.job_id),
+            test_outcome=test_outcome,
+            test_outcome_upper=test_outcome.upper(),
+            worker_outcome=escape(result.worker_outcome.value),
+            url=Reporter._escape_attribute(pycharm_url(module_path, mutation_spec.start_pos[0])),
+            module_path=escape(module_path),
+            start_pos=mutation_spec.start_pos,
+            end_pos=mutation_spec.end_pos,
+            context=CONTEXT_TEMPLATE(context=escape(context)) if context else '',
+            operator_name=escape(mutation_spec.operator_name),
+            occurrence=mutation_spec.occurrence,
+            outputs=outputs,
+        )
+
+    @staticmethod
+    def _escape_text(text: str) -> str:
+        """
+        Escape text for use in an element, as yattag does.
+
+        Args:
+            text: Text to escape.
+
+        Returns:
+            Escaped text.
+        """
+        return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+    @staticmethod
+    def _escape_attribute(value: str) -> str:
+        """
+        Escape a value for use in a double quoted attribute, as yattag does.
+
+        Args:
+            value: Value to escape.
+
+        Returns:
+            Escaped value.
+        """
+        return value.replace('&', '&amp;').replace('<', '&lt;').replace('"', '&quot;')
+
+    @staticmethod
+    def _fragment_key(file_tasks, options: ReportOptions) -> str:
+        """
+        Calculate the cache key for a module's rendered task list.
+
+        The key is a hash of everything the task list is rendered from. The module's position in the report is
+        not included, cached task lists hold FILE_ID_PLACEHOLDER in its place. When source context is shown the
+        size and modification time of the source file are included.
+
+        Args:
+            file_tasks: Work items for the module.
+            options: Options used to create the report.
+
+        Returns:
+            Hex digest identifying the rendered task list.
+        """
+        digest = hashlib.sha256(
+            f'{FRAGMENT_VERSION}\0{options.dedupe_outputs}\0{options.virtual_tasks}'.encode()
+        )
+        if options.context_lines > 0:
+            source_stamp = Reporter._source_stamp(module_path=str(file_tasks[0][2].module_path), options=options)
+            digest.update(f'{options.context_lines}\0{source_stamp}\0'.encode())
+        for work_item, result, mutation_spec in file_tasks:
+            if result is None:
+                digest.update(f'{work_item.job_id}\0pending\0'.encode())
+                continue
+            digest.update(
+                '\0'.join((
+                    work_item.job_id,
+                    str(mutation_spec.module_path),
+                    mutation_spec.operator_name,
+                    str(mutation_spec.occurrence),
+                    str(mutation_spec.start_pos),
+                    str(mutation_spec.end_pos),
+                    str(result.worker_outcome),
+                    str(result.test_outcome),
+                    str(result.diff),
+                    str(result.output),
+                    '',
+                )).encode()
+            )
+        return digest.hexdigest()
+
+    def _fetch_work_items_data(
+        self, modules: Collection[str] | None = None
+    ) -> Iterator[tuple[str, list[Any] | SpilledList[Any]]]:
+        """
+        Fetch work items grouped by module, one module at a time.
+
+        With prefetch set the modules are fetched by a background thread that stays up to that many modules
+        ahead, so reading from SQLite overlaps with rendering. With a memory budget, modules over their share
+        of it are spilled to a temporary file and rows are fetched in batches within that share.
+
+        Args:
+            modules: Paths of the modules fetched, every module if None.
+
+        Yields:
+            Tuple of the module path and the work items for the module, ordered by module path.
+        """
+        spill_size = self._module_budget()
         if self._only_completed:
-            work_items = self._db.completed_work_items
+            groups = self._db.iter_completed_work_item_groups(spill_size=spill_size, modules=modules)
         else:
-            # TODO fix so that this fetches all work items.
-            work_items = self._db.completed_work_items
-        work_item_groups = {}
-        for work_item in work_items:
-            if work_item[2].module_path not in work_item_groups:
-                work_item_groups[work_item[2].module_path] = []
-            work_item_groups[work_item[2].module_path].append(work_item)
-        return work_item_groups
+            groups = self._db.iter_work_item_groups(spill_size=spill_size, modules=modules)
+        if self._options.prefetch > 0:
+            groups = prefetch(iterable=groups, size=self._options.prefetch)
+        yield from groups
 
     @staticmethod
-    def _create_file_analysis(file_id: int, file_tasks, doc: SimpleDoc) -> None:
-        with doc.tag("div", klass="accordion-item", id=f"accordian-tasks-{file_id}"):
-            task_id = 1
-            for file_task in file_tasks:
-                with doc.tag("div", klass="accordion-item"):
-                    with doc.tag("h2", klass="accordion-header", id=f"flush-heading-{file_id}-{task_id}"):
+    def _create_task(
+        file_id: int | str,
+        task_id: int,
+        file_task,
+        doc: SimpleDoc,
+        dedupe_outputs: bool = False,
+        source: SourceFile | None = None,
+        context_lines: int = 0,
+    ) -> None:
+        """
+        Create the accordion item for a single task.
+
+        Args:
+            file_id: Sequential ID of the module within the report, or FILE_ID_PLACEHOLDER if it is cached.
+            task_id: Sequential ID of the task within the module.
+            file_task: Work item for the task.
+            doc: SimpleDoc object.
+            dedupe_outputs: If `True`, outputs and diffs reference the templates written by _create_blobs.
+            source: Source file of the module, None if context is not shown.
+            context_lines: Number of lines shown before and after the mutated lines.
+        """
+        if file_task[1] is None:
+            Reporter._create_pending_task(file_id=file_id, task_id=task_id, file_task=file_task, doc=doc)
+            return
+        with doc.tag("div", klass="accordion-item"):
+            with doc.tag("h2", klass="accordion-header", id=f"flush-heading-{file_id}-{task_id}"):
+                with doc.tag(
+                    "button",
+                    ("data-bs-toggle", "collapse"),
+                    ("data-bs-target", f"#flush-collapse-{file_id}-{task_id}"),
+                    ("aria-expanded", "false"),
+                    ("aria-controls", f"flush-collapse-{file_id}-{task_id}"),
+                    klass=f"accordion-button collapsed {file_task[1].test_outcome.value}",
+                    type="button",
+                ):
+                    with doc.tag("span", klass="job_id"):
+                        doc.text(file_task[0].job_id)
+            with doc.tag(
+                "div",
+                ("aria-labelledby", f"flush-heading-{file_id}"),
+                ("data-bs-parent", f"#accordian-tasks-{file_id}"),
+                klass="accordion-collapse collapse",
+                id=f"flush-collapse-{file_id}-{task_id}",
+            ):
+                with doc.tag("div", klass="accordion-body"):
+                    with doc.tag("section", klass=f"task-summary {file_task[1].test_outcome.value}"):
+                        with doc.tag("p"):
+                            with doc.tag("b"):
+                                doc.text(file_task[1].test_outcome.value.upper())
+                        with doc.tag("p"):
+                            doc.text(f'Worker outcome: {file_task[1].worker_outcome.value}')
+                        with doc.tag("p"):
+                            doc.text(f'Test outcome: {file_task[1].test_outcome.value}')
+
+                    with doc.tag("pre", klass="location"):
                         with doc.tag(
-                            "button",
-                            ("data-bs-toggle", "collapse"),
-                            ("data-bs-target", f"#flush-collapse-{file_id}-{task_id}"),
-                            ("aria-expanded", "false"),
-                            ("aria-controls", f"flush-collapse-{file_id}-{task_id}"),
-                            klass=f"accordion-button collapsed {file_task[1].test_outcome.value}",
-                            type="button",
+                            "a",
+                            href=pycharm_url(str(file_task[2].module_path), file_task[2].start_pos[0]),
+                            klass="text-secondary",
                         ):
-                            with doc.tag("span", klass="job_id"):
-                                doc.text(file_task[0].job_id)
-                    with doc.tag(
-                        "div",
-                        ("aria-labelledby", f"flush-heading-{file_id}"),
-                        ("data-bs-parent", f"#accordian-tasks-{file_id}"),
-                        klass="accordion-collapse collapse",
-                        id=f"flush-collapse-{file_id}-{task_id}",
-                    ):
-                        with doc.tag("div", klass="accordion-body"):
-                            with doc.tag("section", klass=f"task-summary {file_task[1].test_outcome.value}"):
-                                with doc.tag("p"):
-                                    with doc.tag("b"):
-                                        doc.text(file_task[1].test_outcome.value.upper())
-                                with doc.tag("p"):
-                                    doc.text(f'Worker outcome: {file_task[1].worker_outcome.value}')
-                                with doc.tag("p"):
-                                    doc.text(f'Test outcome: {file_task[1].test_outcome.value}')
-
-                            with doc.tag("pre", klass="location"):
-                                with doc.tag(
-                                    "a",
-                                    href=pycharm_url(str(file_task[2].module_path), file_task[2].start_pos[0]),
-                                    klass="text-secondary",
-                                ):
-                                    with doc.tag("button", klass="btn btn-outline-dark"):
-                                        doc.text(
-                                            f"{file_task[2].module_path}, "
-                                            + f"start pos: {file_task[2].start_pos}, end pos: {file_task[2].end_pos}"
-                                        )
-                            with doc.tag("p"):
+                            with doc.tag("button", klass="btn btn-outline-dark"):
                                 doc.text(
-                                    f"Operator: {file_task[2].operator_name}, Occurrence: {file_task[2].occurrence}"
+                                    f"{file_task[2].module_path}, "
+                                    + f"start pos: {file_task[2].start_pos}, end pos: {file_task[2].end_pos}"
                                 )
-                            with doc.tag("pre", klass="task-diff"):
-                                doc.text(file_task[1].diff)
-                            with doc.tag("pre", klass="task-output"):
-                                doc.text(file_task[1].output)
-                task_id += + 1
+                    context = Reporter._task_context(
+                        source=source, mutation_spec=file_task[2], context_lines=context_lines
+                    )
+                    if context:
+                        with doc.tag("pre", klass="source-context"):
+                            doc.text(context)
+                    with doc.tag("p"):
+                        doc.text(
+                            f"Operator: {file_task[2].operator_name}, Occurrence: {file_task[2].occurrence}"
+                        )
+                    if dedupe_outputs:
+                        diff_key = Reporter._blob_key(blob=file_task[1].diff)
+                        output_key = Reporter._blob_key(blob=file_task[1].output)
+                        doc.line("pre", "", ("data-blob", diff_key), klass="task-diff")
+                        doc.line("pre", "", ("data-blob", output_key), klass="task-output")
+                    else:
+                        with doc.tag("pre", klass="task-diff"):
+                            doc.text(file_task[1].diff)
+                        with doc.tag("pre", klass="task-output"):
+                            doc.text(file_task[1].output)
+
+    @staticmethod
+    def _create_pending_task(file_id: int | str, task_id: int, file_task, doc: SimpleDoc) -> None:
+        """
+        Create a placeholder for a work item that has not completed.
+
+        Pending work items have no output so only the job ID is shown, without a collapsible body.
+
+        Args:
+            file_id: Sequential ID of the module within the report, or FILE_ID_PLACEHOLDER if it is cached.
+            task_id: Sequential ID of the task within the module.
+            file_task: Pending work item.
+            doc: SimpleDoc object.
+        """
+        with doc.tag("div", klass="accordion-item"):
+            with doc.tag("h2", klass="accordion-header", id=f"flush-heading-{file_id}-{task_id}"):
+                with doc.tag("button", klass="accordion-button collapsed pending", type="button", disabled="disabled"):
+                    with doc.tag("span", klass="job_id"):
+                        doc.text(file_task[0].job_id)
+
+    def _create_search(self, doc: SimpleDoc) -> None:
+        """
+        Create the search box, if the report has a search index.
+
+        Args:
+            doc: SimpleDoc object.
+        """
+        if self._search_index is None:
+            return
+        with doc.tag("section", id="report-search"):
+            doc.stag(
+                "input",
+                ("aria-label", "Search tasks"),
+                type="search",
+                id="search-input",
+                klass="form-control",
+                placeholder="Search job IDs, operators and paths",
+            )
+            doc.line("p", "", id="search-count")
+            doc.line("ul", "", id="search-results")
+
+    def _create_search_index(self, doc: SimpleDoc) -> None:
+        """
+        Embed the search index of the modules written, if the report has one.
+
+        Args:
+            doc: SimpleDoc object.
+        """
+        if self._search_index is None:
+            return
+        with self._db.profiler.stage('search_index', tasks=len(self._search_index)) as stage:
+            data = self._encode_virtual_data(data=self._search_index.data())
+            stage['size'] = len(data)
+        with doc.tag("script", type="application/json", id="search-index"):
+            doc.asis(data)
+
+    def _index_module(self, file_id: int, file_name: str, file_tasks: Iterable[Any]) -> None:
+        """
+        Add a module to the search index, if the report has one.
+
+        Args:
+            file_id: Sequential ID of the module within the report.
+            file_name: Path of the module.
+            file_tasks: Work items for the module.
+        """
+        if self._search_index is None:
+            return
+        page = f'{MODULES_DIRECTORY}/{self._module_page(f"/{file_name}")}' if self._pages else ''
+        self._search_index.add_module(file_id=file_id, file_name=file_name, page=page, file_tasks=file_tasks)
 
     def _create_summary(self, doc: SimpleDoc) -> None:
         """
@@ -186,18 +1679,19 @@ class Reporter(object):
             with doc.tag("div", id="summary"):
                 with doc.tag("h2"):
                     doc.text('Summary')
+                statistics = self._db.statistics
                 with doc.tag("section"):
                     with doc.tag("p"):
                         doc.text(f'Report Ran On: {datetime.now().strftime("%d/%m/%Y %H:%M:%S")}')
                     with doc.tag("p"):
-                        doc.text(f'Total Jobs: {self._db.num_work_items}')
-                    if self._db.num_results > 0:
+                        doc.text(f'Total Jobs: {statistics.num_work_items}')
+                    if statistics.num_results > 0:
                         with doc.tag("p"):
-                            doc.text(f'Completed Jobs: {self._db.num_results}')
+                            doc.text(f'Completed Jobs: {statistics.num_results}')
                         with doc.tag("p"):
                             doc.text(
                                 'Surviving Mutants: '
-                                + f'{self._db.num_results - self._db.kill_count}({self._db.survival_rate}%)'
+                                + f'{statistics.num_results - statistics.kill_count}({statistics.survival_rate}%)'
                             )
                 with doc.tag("div", klass="card card-body"):
                     with doc.tag("table"):
@@ -214,14 +1708,14 @@ class Reporter(object):
                                 with doc.tag("th"):
                                     doc.text(TestOutcome.SURVIVED.capitalize())
                         with doc.tag("tbody"):
-                            summary_data: list[SummaryDetail] = self._fetch_summary_data()
+                            summary_data = self._fetch_summary_data()
                             for summary_item in summary_data:
                                 with doc.tag("tr"):
                                     with doc.tag("td"):
                                         if summary_item.is_dir:
                                             doc.text(str(summary_item.path))
                                         else:
-                                            with doc.tag("a", href=f'#{self._normalize_path(str(summary_item.path))}'):
+                                            with doc.tag("a", href=self._module_href(str(summary_item.path))):
                                                 doc.text(str(summary_item.path))
                                     with doc.tag("td", klass=self._score_color(score=summary_item.score)):
                                         doc.text(f'{summary_item.score}%')
@@ -233,45 +1727,100 @@ class Reporter(object):
                                         )
                                     with doc.tag("td", klass="survived"):
                                         doc.text(str(summary_item.survived))
+            self._create_operator_summary(doc=doc)
 
-    def _fetch_summary_data(self) -> list[SummaryDetail]:
-        """Fetch data used for the report summary."""
-        task_data: dict[str, SummaryDetail] = {}
-        status_counts = self._db.fetch_status_counts()
-        for status_count in status_counts:
-            killed = 0
-            incompetent = 0
-            survived = 0
-            if status_count[1] not in task_data:
-                task_data[status_count[1]] = SummaryDetail(
-                    path=pathlib.Path('/').joinpath(status_count[1]),
-                    killed=0,
-                    incompetent=0,
-                    survived=0,
-                )
-            if status_count[0] == TestOutcome.KILLED:
-                killed += status_count[2]
-            elif status_count[0] == TestOutcome.INCOMPETENT:
-                incompetent += status_count[2]
-            elif status_count[0] == TestOutcome.SURVIVED:
-                survived += status_count[2]
-
-            task_data[status_count[1]].killed += killed
-            task_data[status_count[1]].incompetent += incompetent
-            task_data[status_count[1]].survived += survived
-            for directory in task_data[status_count[1]].path_list():
-                if str(directory) not in task_data:
-                    task_data[str(directory)] = SummaryDetail(
-                        path=directory,
-                        is_dir=True,
-                        killed=0,
-                        incompetent=0,
-                        survived=0,
-                    )
-                task_data[str(directory)].killed += killed
-                task_data[str(directory)].incompetent += incompetent
-                task_data[str(directory)].survived += survived
-        return sorted(task_data.values())
+    def _create_operator_summary(self, doc: SimpleDoc) -> None:
+        """
+        Create the table of outcome counts for each mutation operator, followed by its counts for each module.
+
+        Args:
+            doc: SimpleDoc object.
+        """
+        with doc.tag("div", id="operator-summary"):
+            with doc.tag("h3"):
+                doc.text('Operators')
+            with doc.tag("div", klass="card card-body"):
+                with doc.tag("table"):
+                    with doc.tag("thead"):
+                        with doc.tag("tr"):
+                            with doc.tag("th"):
+                                doc.text('Operator')
+                            with doc.tag("th"):
+                                doc.text('Score')
+                            with doc.tag("th"):
+                                doc.text(TestOutcome.KILLED.capitalize())
+                            with doc.tag("th"):
+                                doc.text(TestOutcome.INCOMPETENT.capitalize())
+                            with doc.tag("th"):
+                                doc.text(TestOutcome.SURVIVED.capitalize())
+                    with doc.tag("tbody"):
+                        for operator in self._fetch_operator_data():
+                            for statistics in (operator, *operator.modules):
+                                with doc.tag("tr", klass="operator" if statistics is operator else "operator-module"):
+                                    with doc.tag("td"):
+                                        if statistics.module_path is None:
+                                            doc.text(statistics.operator_name)
+                                        else:
+                                            path = f'/{statistics.module_path}'
+                                            with doc.tag("a", href=self._module_href(path)):
+                                                doc.text(path)
+                                    with doc.tag("td", klass=self._score_color(score=statistics.score)):
+                                        doc.text(f'{statistics.score}%')
+                                    with doc.tag("td", klass="killed"):
+                                        doc.text(str(statistics.killed))
+                                    with doc.tag("td", klass="incompetent"):
+                                        doc.text(str(statistics.incompetent))
+                                    with doc.tag("td", klass="survived"):
+                                        doc.text(str(statistics.survived))
+
+    def _fetch_operator_data(self) -> list[OperatorStatistics]:
+        """
+        Fetch data used for the operator summary.
+
+        Returns:
+            Outcome counts for each operator, in the order they are displayed.
+        """
+        return self._db.fetch_operator_statistics()
+
+    def _fetch_summary_data(self) -> Iterator[SummaryDetail]:
+        """
+        Fetch data used for the report summary.
+
+        Returns:
+            Iterator of summary details for each directory and module, in the order they are displayed.
+        """
+        return self._db.statistics.summary()
+
+    def _module_href(self, path: str) -> str:
+        """
+        Create the link to a module from the summary.
+
+        Args:
+            path: Path of the module, starting with a slash.
+
+        Returns:
+            Link to the module's page when the report is split into pages, otherwise to its section.
+        """
+        if self._pages:
+            return f'{MODULES_DIRECTORY}/{self._module_page(path)}'
+        return f'#{self._normalize_path(path)}'
+
+    @classmethod
+    def _module_page(cls, path: str) -> str:
+        """
+        Create the file name of a module's page.
+
+        The normalized path keeps the name readable, but paths such as `a/b_c.py` and `a_b/c.py` normalize to the
+        same name so a hash of the path is added to keep the name of each module's page distinct.
+
+        Args:
+            path: Path of the module, starting with a slash.
+
+        Returns:
+            File name of the page.
+        """
+        path_hash = hashlib.blake2b(path.encode(), digest_size=8).hexdigest()
+        return f'{cls._normalize_path(path)}-{path_hash}.html'
 
     @staticmethod
     def _normalize_path(path: str) -> str:
@@ -306,24 +1855,4 @@ class Reporter(object):
     @staticmethod
     def _css(doc: SimpleDoc) -> None:
         with doc.tag("style"):
-            doc.text(f"""
-                .survived {{
-                    background-color: {HtmlColor.red.value};
-                    color: white;
-                }}
-                .incompetent {{
-                    background-color: {HtmlColor.amber.value};
-                }}
-                .killed {{
-                    background-color: {HtmlColor.green.value};
-                    color: white;
-                }}
-                .task-output, .task-diff {{
-                    background-color: {HtmlColor.lightgrey.value};
-                    padding: 30px;
-                }}
-                .task-summary {{
-                    padding: 10px 30px;
-                    margin-bottom: 20px;
-                }}
-            """)
+            doc.text(REPORT_CSS)
@@ -0,0 +1,123 @@
+"""Module to build the search index embedded in a report."""
+import re
+from typing import Any, Iterable
+
+_WORD = re.compile(r'[A-Za-z0-9]+')
+_CAMEL_CASE_PART = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+')
+
+
+def tokenize(text: str) -> set[str]:
+    """
+    Split text into the lower case tokens it can be searched by.
+
+    Words are split on any character that is not a letter or digit, and camel case words are also split into
+    their parts so `NumberReplacer` can be found by `replacer`.
+
+    Args:
+        text: Text to split, such as a module path or operator name.
+
+    Returns:
+        Set of tokens.
+    """
+    tokens = set()
+    for word in _WORD.findall(text):
+        tokens.add(word.lower())
+        tokens.update(part.lower() for part in _CAMEL_CASE_PART.findall(word))
+    return tokens
+
+
+class SearchIndex(object):
+    """
+    Inverted index from tokens to the tasks of a report, built while the report is written.
+
+    Tokens of module paths and operator names reference modules and operators rather than each of their tasks,
+    a module's tasks are a contiguous range and each operator lists its tasks, so the index grows by a job ID
+    and an operator reference per task. Job IDs are searched by prefix through their sorted order.
+    """
+
+    __slots__ = (
+        '_job_ids',
+        '_modules',
+        '_operator_ids',
+        '_operator_tasks',
+        '_tokens',
+    )
+
+    def __init__(self) -> None:
+        """Initialize a SearchIndex object."""
+        self._job_ids: list[str] = []
+        self._modules: list[list[Any]] = []
+        self._operator_ids: dict[str, int] = {}
+        self._operator_tasks: list[list[int]] = []
+        self._tokens: dict[str, tuple[set[int], set[int]]] = {}
+
+    def __len__(self) -> int:
+        """
+        Count the tasks in the index.
+
+        Returns:
+            Number of tasks.
+        """
+        return len(self._job_ids)
+
+    def add_module(self, file_id: int, file_name: str, page: str, file_tasks: Iterable[Any]) -> None:
+        """
+        Add a module and its tasks, in the order they are written to the report.
+
+        Args:
+            file_id: Sequential ID of the module within the report.
+            file_name: Path of the module.
+            page: Page the module is written to relative to the search page, empty if it is the same page.
+            file_tasks: Work items for the module.
+        """
+        module_index = len(self._modules)
+        first_task = len(self._job_ids)
+        for token in tokenize(file_name):
+            self._token(token)[0].add(module_index)
+        for file_task in file_tasks:
+            operator_name = file_task[2].operator_name
+            operator_index = self._operator_ids.get(operator_name)
+            if operator_index is None:
+                operator_index = self._operator_ids[operator_name] = len(self._operator_tasks)
+                self._operator_tasks.append([])
+                for token in tokenize(operator_name):
+                    self._token(token)[1].add(operator_index)
+            self._operator_tasks[operator_index].append(len(self._job_ids))
+            self._job_ids.append(file_task[0].job_id)
+        self._modules.append([f'/{file_name}', page, file_id, first_task, len(self._job_ids) - first_task])
+
+    def data(self) -> dict[str, Any]:
+        """
+        Create the data of the index as embedded in the report.
+
+        Returns:
+            Dictionary of the modules as their path, page, ID, first task and task count, the operator names,
+            the job ID of each task and the task positions in job ID order, the tasks of each operator, and the
+            module and operator positions of each token.
+        """
+        return {
+            'modules': self._modules,
+            'operators': list(self._operator_ids),
+            'jobs': self._job_ids,
+            'jobOrder': sorted(range(len(self._job_ids)), key=lambda task: self._job_ids[task].lower()),
+            'operatorTasks': self._operator_tasks,
+            'tokens': {
+                token: [sorted(modules), sorted(operators)]
+                for token, (modules, operators) in sorted(self._tokens.items())
+            },
+        }
+
+    def _token(self, token: str) -> tuple[set[int], set[int]]:
+        """
+        Fetch the module and operator positions of a token, adding the token if it is new.
+
+        Args:
+            token: Token to fetch.
+
+        Returns:
+            Tuple of the sets of module and operator positions.
+        """
+        entry = self._tokens.get(token)
+        if entry is None:
+            entry = self._tokens[token] = (set(), set())
+        return entry
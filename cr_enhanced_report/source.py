@@ -0,0 +1,117 @@
+"""Module to read context around mutations from source files."""
+import array
+import contextlib
+import mmap
+import os
+import pathlib
+from typing import Iterator
+
+
+class SourceFile(object):
+    """Source file indexed by line so that the lines around any number of mutations can be sliced from it."""
+
+    __slots__ = (
+        '_data',
+        '_line_offsets',
+    )
+
+    def __init__(self, data: bytes | mmap.mmap) -> None:
+        """
+        Initialize a SourceFile object, indexing the offset of every line.
+
+        Args:
+            data: Content of the source file.
+        """
+        self._data = data
+        self._line_offsets = array.array('Q', [0])
+        offset = data.find(b'\n')
+        while offset != -1:
+            self._line_offsets.append(offset + 1)
+            offset = data.find(b'\n', offset + 1)
+        if self._line_offsets[-1] == len(data):
+            self._line_offsets.pop()
+
+    @property
+    def line_count(self) -> int:
+        """
+        Property for the number of lines in the source file.
+
+        Returns:
+            Number of lines.
+        """
+        return len(self._line_offsets) if self._data else 0
+
+    def lines(self, first: int, last: int) -> list[str]:
+        """
+        Fetch a range of lines.
+
+        Lines are split on newlines only, as they are indexed, so form feeds and the other characters that
+        str.splitlines also splits on stay in their line.
+
+        Args:
+            first: Number of the first line, starting from 1.
+            last: Number of the last line, included in the range.
+
+        Returns:
+            The lines without line endings, lines that do not exist are not included.
+        """
+        first = max(first, 1)
+        last = min(last, self.line_count)
+        if first > last:
+            return []
+        start = self._line_offsets[first - 1]
+        end = self._line_offsets[last] if last < len(self._line_offsets) else len(self._data)
+        lines = self._data[start:end].decode('utf-8', errors='replace').split('\n')
+        if not lines[-1]:
+            lines.pop()
+        return [line[:-1] if line.endswith('\r') else line for line in lines]
+
+    def context(self, start_line: int, end_line: int, context_lines: int) -> str:
+        """
+        Create a snippet of the mutated lines with the lines around them, numbered.
+
+        Args:
+            start_line: Number of the first mutated line.
+            end_line: Number of the last mutated line.
+            context_lines: Number of lines to include before and after the mutated lines.
+
+        Returns:
+            Numbered lines with the mutated lines marked, empty if the lines do not exist.
+        """
+        first = max(start_line - context_lines, 1)
+        lines = self.lines(first=first, last=end_line + context_lines)
+        width = len(str(first + len(lines) - 1))
+        return '\n'.join(
+            f'{">" if start_line <= number <= end_line else " "} {number:>{width}} | {line}'
+            for number, line in enumerate(lines, start=first)
+        )
+
+
+@contextlib.contextmanager
+def open_source_file(path: pathlib.Path) -> Iterator[SourceFile | None]:
+    """
+    Open and index a source file, memory mapping it where possible.
+
+    Args:
+        path: Path of the source file.
+
+    Yields:
+        The indexed source file, None if it cannot be read.
+    """
+    try:
+        source_file = open(path, 'rb')
+    except OSError:
+        yield None
+        return
+    with source_file:
+        data: bytes | mmap.mmap = b''
+        if os.fstat(source_file.fileno()).st_size > 0:
+            try:
+                data = mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                data = source_file.read()
+        try:
+            yield SourceFile(data=data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
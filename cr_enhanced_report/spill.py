@@ -0,0 +1,129 @@
+"""Module to move sequences too large for the memory budget to temporary files."""
+import io
+import pickle
+import tempfile
+from typing import Any, Callable, Generic, Iterable, Iterator, TypeVar
+
+T = TypeVar('T')
+
+
+class SpilledList(Generic[T]):
+    """Append only sequence kept in a temporary file, items are read back one at a time in order."""
+
+    __slots__ = (
+        '_file',
+        '_length',
+    )
+
+    def __init__(self, items: Iterable[T] = ()) -> None:
+        """
+        Initialize a SpilledList object.
+
+        Args:
+            items: Items to append.
+        """
+        self._file = tempfile.TemporaryFile()
+        self._length = 0
+        for item in items:
+            self.append(item)
+
+    def __enter__(self) -> 'SpilledList[T]':
+        """
+        Enter the context, the temporary file is removed on exit.
+
+        Returns:
+            The SpilledList object.
+        """
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """
+        Exit the context, removing the temporary file.
+
+        Args:
+            exc_info: Exception raised in the context, if any.
+        """
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        Count the items in the sequence.
+
+        Returns:
+            Number of items.
+        """
+        return self._length
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterate over the items in the order they were appended.
+
+        The position of the next item is tracked by each iterator, so the sequence can be iterated over by more
+        than one iterator at a time.
+
+        Yields:
+            Items read back from the temporary file.
+        """
+        position = 0
+        for _ in range(self._length):
+            self._file.seek(position)
+            item = pickle.load(self._file)
+            position = self._file.tell()
+            yield item
+            del item
+
+    def __getitem__(self, index: int) -> T:
+        """
+        Fetch an item by position, reading the items before it.
+
+        Args:
+            index: Position of the item.
+
+        Returns:
+            The item.
+
+        Raises:
+            IndexError: If there is no item at the position.
+        """
+        for position, item in enumerate(self):
+            if position == index:
+                return item
+        raise IndexError('SpilledList index out of range')
+
+    def append(self, item: T) -> None:
+        """
+        Append an item to the end of the sequence.
+
+        Args:
+            item: Item to append, it must be picklable.
+        """
+        self._file.seek(0, io.SEEK_END)
+        pickle.dump(item, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._length += 1
+
+    def close(self) -> None:
+        """Close and remove the temporary file."""
+        self._file.close()
+
+
+def collect(items: Iterable[T], max_size: int | None, size: Callable[[T], int]) -> list[T] | SpilledList[T]:
+    """
+    Collect items into a list, moving them to a SpilledList once their total size exceeds `max_size`.
+
+    Args:
+        items: Items to collect.
+        max_size: Total size the items may have before they are spilled, None to never spill.
+        size: Function estimating the size of an item in bytes.
+
+    Returns:
+        List of the items, or SpilledList of the items if they were spilled.
+    """
+    collected: list[T] | SpilledList[T] = []
+    total = 0
+    for item in items:
+        if max_size is not None and isinstance(collected, list):
+            total += size(item)
+            if total > max_size:
+                collected = SpilledList(items=collected)
+        collected.append(item)
+    return collected
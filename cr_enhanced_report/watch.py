@@ -0,0 +1,254 @@
+"""Module to keep a report up to date while a Cosmic Ray session is running."""
+import pathlib
+import tempfile
+import time
+from typing import Any, Collection, Iterator
+
+from cr_enhanced_report.cache import FragmentCache
+from cr_enhanced_report.datatypes import ReportOptions
+from cr_enhanced_report.db import DB
+from cr_enhanced_report.output import atomic_output
+from cr_enhanced_report.reporter import FILE_ID_PLACEHOLDER, Reporter
+from cr_enhanced_report.spill import SpilledList
+
+# Changed modules fetched by path in a single query, when more modules changed every module is fetched.
+MAX_FETCHED_MODULES = 500
+
+
+class WatchReporter(Reporter):
+    """
+    Report that is refreshed in place as results are added to the session.
+
+    Only the signature and cache key of each module's task list are kept between refreshes. The task lists are
+    read back from the fragment cache, kept in a private temporary directory when no cache directory is given.
+    """
+
+    __slots__ = (
+        '_data_version',
+        '_modules',
+        '_output',
+        '_signatures',
+        '_temp_dir',
+    )
+
+    def __init__(
+        self, db: DB, output: pathlib.Path, only_completed: bool, options: ReportOptions | None = None
+    ) -> None:
+        """
+        Initialize WatchReporter.
+
+        Args:
+            db: Instance of MyDB
+            output: Path the report is written to.
+            only_completed: If `True`, only completed work items are reported.
+            options: Options used to create the report, defaults are used if not given.
+        """
+        super().__init__(db=db, only_completed=only_completed, options=options)
+        self._output: pathlib.Path = output
+        self._data_version: int | None = None
+        self._modules: dict[str, tuple[str, str]] = {}
+        self._signatures: dict[str, str] = {}
+        self._temp_dir: tempfile.TemporaryDirectory[str] | None = None
+        if self._fragment_cache is None:
+            self._temp_dir = tempfile.TemporaryDirectory(prefix='cr-enhanced-report-')
+            self._fragment_cache = FragmentCache(
+                directory=pathlib.Path(self._temp_dir.name), max_size=self._options.cache_size
+            )
+
+    def __enter__(self) -> 'WatchReporter':
+        """
+        Enter the context, the private fragment cache is removed on exit.
+
+        Returns:
+            The WatchReporter object.
+        """
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """
+        Exit the context, removing the private fragment cache.
+
+        Args:
+            exc_info: Exception raised in the context, if any.
+        """
+        self.close()
+
+    def close(self) -> None:
+        """Remove the private fragment cache, if one was created."""
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
+
+    def run(self, interval: float, iterations: int | None = None) -> None:
+        """
+        Poll the session for changes, refreshing the report whenever results are added.
+
+        Args:
+            interval: Seconds to wait between polls.
+            iterations: Number of polls before returning, polls until interrupted if None.
+        """
+        polls = 0
+        try:
+            while iterations is None or polls < iterations:
+                if polls:
+                    time.sleep(interval)
+                self.refresh()
+                polls += 1
+        except KeyboardInterrupt:
+            return
+
+    def refresh(self) -> bool:
+        """
+        Refresh the report if the session has changed since the last refresh.
+
+        A signature of each module is fetched first, from the job IDs, outcomes and output and diff lengths of
+        its work items, as results can be added or overwritten anywhere in the session. Only the work items of
+        modules whose signature changed are fetched and rendered again, the task lists of the others are read
+        back from the fragment cache. A result overwritten with the same outcomes and an output and diff of the
+        same lengths is not noticed.
+
+        Returns:
+            True if the report was written, False otherwise.
+        """
+        data_version = self._db.data_version()
+        if data_version == self._data_version:
+            return False
+        self._data_version = data_version
+        self._db.invalidate_statistics()
+        self._signatures = {
+            module_path: self._module_signature(module_path=module_path, signature=signature)
+            for module_path, signature in self._db.iter_module_signatures(only_completed=self._only_completed)
+        }
+        try:
+            with atomic_output(self._output) as stream:
+                self.create_report(stream=stream)
+        finally:
+            self._modules = {
+                module_path: module for module_path, module in self._modules.items() if module_path in self._signatures
+            }
+            self._signatures = {}
+        return True
+
+    def _module_signature(self, module_path: str, signature: str) -> str:
+        """
+        Extend a module's signature with the version of its source file, if source context is shown.
+
+        Args:
+            module_path: Path of the module.
+            signature: Signature of the module's work items.
+
+        Returns:
+            Signature of everything the module's task list is rendered from.
+        """
+        if self._options.context_lines <= 0:
+            return signature
+        return f'{signature}\0{self._source_stamp(module_path=module_path, options=self._options)}'
+
+    def _is_unchanged(self, module_path: str) -> bool:
+        """
+        Check if a module is unchanged since its task list was rendered.
+
+        Args:
+            module_path: Path of the module.
+
+        Returns:
+            True if the module has the signature it had when its task list was rendered.
+        """
+        module = self._modules.get(module_path)
+        return module is not None and module[0] == self._signatures.get(module_path)
+
+    def _fetch_work_items_data(
+        self, modules: Collection[str] | None = None
+    ) -> Iterator[tuple[str, list[Any] | SpilledList[Any]]]:
+        """
+        Fetch the work items of changed modules, with an empty list in place of the work items of the others.
+
+        Every module is fetched when the report needs each module's work items outside its task list, for
+        the shared outputs and diffs or the search index.
+
+        Args:
+            modules: Paths of the modules fetched, every module if None.
+
+        Yields:
+            Tuple of the module path and the work items for the module, ordered by module path.
+        """
+        if modules is None and not (self._options.dedupe_outputs or self._options.search_index):
+            changed = [module_path for module_path in self._signatures if not self._is_unchanged(module_path)]
+            if len(changed) < min(len(self._signatures), MAX_FETCHED_MODULES + 1):
+                modules = changed
+        groups = super()._fetch_work_items_data(modules=modules)
+        group = next(groups, None)
+        for module_path in self._signatures:
+            while group is not None and group[0] < module_path:
+                yield group
+                group = next(groups, None)
+            if group is not None and group[0] == module_path:
+                yield group
+                group = next(groups, None)
+            elif self._is_unchanged(module_path):
+                yield module_path, []
+        while group is not None:
+            yield group
+            group = next(groups, None)
+
+    def _lookup_file_analysis(self, file_id: int, file_name: str, file_tasks) -> tuple[str | None, str | None]:
+        """
+        Look up the task list of a module, it is read back from the fragment cache if the module is unchanged.
+
+        The task list of an unchanged module that was evicted from the cache is rendered again, from its work
+        items fetched on their own if they were not fetched with the changed modules.
+
+        Args:
+            file_id: Sequential ID of the module within the report.
+            file_name: Path of the module.
+            file_tasks: Work items for the module, empty if the module is unchanged and was not fetched.
+
+        Returns:
+            Tuple of the task list, None if it changed, and the key of the module's work items.
+        """
+        if not self._is_unchanged(file_name):
+            fragment, key = super()._lookup_file_analysis(file_id=file_id, file_name=file_name, file_tasks=file_tasks)
+            if fragment is not None and key is not None:
+                self._modules[file_name] = self._signatures.get(file_name, ''), key
+            return fragment, key
+        key = self._modules[file_name][1]
+        fragment = self._fragment_cache.get(key=key) if self._fragment_cache is not None else None
+        if fragment is not None:
+            return fragment.replace(FILE_ID_PLACEHOLDER, str(file_id)), key
+        file_tasks = file_tasks or self._fetch_module(module_path=file_name)
+        key = self._fragment_key(file_tasks=file_tasks, options=self._options)
+        fragment = self._render_file_tasks(file_id=FILE_ID_PLACEHOLDER, file_tasks=file_tasks, options=self._options)
+        return self._store_file_analysis(file_id=file_id, file_name=file_name, key=key, fragment=fragment), key
+
+    def _store_file_analysis(self, file_id: int, file_name: str, key: str | None, fragment: str) -> str:
+        """
+        Store a rendered task list in the fragment cache and remember its key for the next refresh.
+
+        Args:
+            file_id: Sequential ID of the module within the report.
+            file_name: Path of the module.
+            key: Key returned by _lookup_file_analysis.
+            fragment: Rendered task list, with FILE_ID_PLACEHOLDER as the module's ID.
+
+        Returns:
+            Rendered task list with the module's ID.
+        """
+        if key is not None:
+            self._modules[file_name] = self._signatures.get(file_name, ''), key
+        return super()._store_file_analysis(file_id=file_id, file_name=file_name, key=key, fragment=fragment)
+
+    def _fetch_module(self, module_path: str) -> list[Any]:
+        """
+        Fetch the work items of a single module.
+
+        Args:
+            module_path: Path of the module.
+
+        Returns:
+            Work items for the module, empty if it no longer has any.
+        """
+        if self._only_completed:
+            groups = self._db.iter_completed_work_item_groups(modules=[module_path])
+        else:
+            groups = self._db.iter_work_item_groups(modules=[module_path])
+        return [file_task for _, file_tasks in list(groups) for file_task in file_tasks]
@@ -0,0 +1,109 @@
+"""Shared fixtures for the tests."""
+from pathlib import Path
+from typing import Any
+
+import pytest
+from cosmic_ray.work_item import MutationSpec
+from cosmic_ray.work_item import TestOutcome as Outcome
+from cosmic_ray.work_item import WorkerOutcome, WorkItem, WorkResult
+
+from cr_enhanced_report.db import DB, use_db
+
+MODULES = ['b.py', 'a.py', 'pkg/c.py', 'a.py', 'b.py', 'a.py']
+BENCHMARK_RESULTS = pytest.StashKey[list[Any]]()
+OUTCOMES = [
+    Outcome.KILLED,
+    Outcome.SURVIVED,
+    Outcome.INCOMPETENT,
+    Outcome.KILLED,
+    None,
+    Outcome.KILLED,
+]
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """
+    Add the options to run the benchmarks.
+
+    Args:
+        parser (pytest.Parser): Parser for the command line options.
+    """
+    parser.addoption('--benchmark', action='store_true', default=False, help='Run the benchmarks.')
+    parser.addoption(
+        '--benchmark-max-mutants',
+        type=int,
+        default=1_000_000,
+        help='Skip benchmarks for sessions with more mutants than this.',
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """
+    Skip the benchmarks unless they were requested.
+
+    Args:
+        config (pytest.Config): Pytest configuration.
+        items (list[pytest.Item]): Collected tests.
+    """
+    if config.getoption('--benchmark'):
+        return
+    skip = pytest.mark.skip(reason='Benchmarks are only run with --benchmark.')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter: Any, config: pytest.Config) -> None:
+    """
+    Write the time and peak memory of each benchmarked stage.
+
+    Args:
+        terminalreporter: Pytest terminal reporter.
+        config (pytest.Config): Pytest configuration.
+    """
+    results = config.stash.get(BENCHMARK_RESULTS, [])
+    if not results:
+        return
+    terminalreporter.section('benchmarks')
+    terminalreporter.write_line(f'{"stage":<28}{"mutants":>10}{"seconds":>10}{"peak MB":>10}')
+    for result in sorted(results, key=lambda result: (result.stage, result.mutants)):
+        terminalreporter.write_line(
+            f'{result.stage:<28}{result.mutants:>10}{result.seconds:>10.2f}{result.peak_memory / 1024 / 1024:>10.1f}'
+        )
+
+
+@pytest.fixture(scope='session')
+def benchmark_results(request: pytest.FixtureRequest) -> list[Any]:
+    """
+    Results of the benchmarks, written in the terminal summary.
+
+    Args:
+        request (pytest.FixtureRequest): Pytest request.
+
+    Returns:
+        list: Results of the benchmarks.
+    """
+    return request.config.stash.setdefault(BENCHMARK_RESULTS, [])
+
+
+@pytest.fixture
+def session_file(tmp_path: Path) -> Path:
+    """
+    Create a session file with a small number of work items.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+
+    Returns:
+        Path: Path to the session file.
+    """
+    path = tmp_path / 'session.sqlite'
+    with use_db(path, DB.Mode.create) as db:
+        db.add_work_items(
+            WorkItem.single(f'job{index}', MutationSpec(module, 'core/NumberReplacer', index, (1, 0), (1, 1)))
+            for index, module in enumerate(MODULES)
+        )
+        for index, outcome in enumerate(OUTCOMES):
+            if outcome is not None:
+                db.set_result(f'job{index}', WorkResult(WorkerOutcome.NORMAL, output='', test_outcome=outcome, diff=''))
+    return path
@@ -0,0 +1,168 @@
+"""Generator for synthetic cosmic-ray sessions."""
+import dataclasses
+import itertools
+import json
+import random
+import sqlite3
+from pathlib import Path
+from typing import Iterator
+
+from cosmic_ray.work_item import TestOutcome as Outcome
+from cosmic_ray.work_item import WorkerOutcome
+
+from cr_enhanced_report.db import DB, use_db
+
+OPERATORS = (
+    'core/NumberReplacer',
+    'core/ReplaceBinaryOperator_Add_Sub',
+    'core/ReplaceComparisonOperator_Eq_NotEq',
+    'core/ReplaceTrueWithFalse',
+    'core/RemoveDecorator',
+)
+BATCH_SIZE = 10_000
+
+
+@dataclasses.dataclass
+class SessionShape:
+    """Shape of a synthetic session."""
+
+    modules: int = 10
+    depth: int = 2
+    fanout: int = 5
+    mutants_per_module: int = 100
+    output_size: int = 200
+    distinct_outputs: int = 50
+    outcomes: dict[Outcome | None, float] = dataclasses.field(
+        default_factory=lambda: {
+            Outcome.KILLED: 0.7,
+            Outcome.SURVIVED: 0.2,
+            Outcome.INCOMPETENT: 0.05,
+            None: 0.05,
+        }
+    )
+    seed: int = 0
+
+    @property
+    def mutants(self) -> int:
+        """
+        Property for the total number of mutants in the session.
+
+        Returns:
+            int: Number of mutants.
+        """
+        return self.modules * self.mutants_per_module
+
+
+def generate_session(path: Path, shape: SessionShape) -> None:
+    """
+    Write a session with the given shape.
+
+    The schema is created by cosmic-ray, rows are then bulk inserted in batches so sessions with millions of
+    mutants can be generated without holding them in memory.
+
+    Args:
+        path (Path): Path of the session file to create.
+        shape (SessionShape): Shape of the session.
+    """
+    with use_db(path, DB.Mode.create):
+        pass
+    rng = random.Random(shape.seed)
+    outputs = [_output(index=index, size=shape.output_size) for index in range(shape.distinct_outputs)]
+    with sqlite3.connect(path) as connection:
+        for batch in _batched(_rows(shape=shape, rng=rng, outputs=outputs), size=BATCH_SIZE):
+            connection.executemany('INSERT INTO work_items (job_id) VALUES (?)', ((row[0],) for row in batch))
+            connection.executemany(
+                'INSERT INTO mutation_specs (job_id, module_path, operator_name, operator_args, occurrence, '
+                'start_pos_row, start_pos_col, end_pos_row, end_pos_col) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (row[:9] for row in batch),
+            )
+            connection.executemany(
+                'INSERT INTO work_results (job_id, worker_outcome, test_outcome, output, diff) VALUES (?, ?, ?, ?, ?)',
+                ((row[0], *row[9:]) for row in batch if row[10] is not None),
+            )
+
+
+def module_path(index: int, depth: int, fanout: int) -> str:
+    """
+    Create the path of a module nested `depth` directories deep.
+
+    Args:
+        index (int): Index of the module.
+        depth (int): Number of directories above the module.
+        fanout (int): Number of subdirectories in each directory.
+
+    Returns:
+        str: Path of the module.
+    """
+    directories = [f'pkg{(index // fanout ** level) % fanout}' for level in range(depth)]
+    return '/'.join([*directories, f'module{index}.py'])
+
+
+def _rows(shape: SessionShape, rng: random.Random, outputs: list[str]) -> Iterator[tuple]:
+    """
+    Generate the rows of a session.
+
+    Args:
+        shape (SessionShape): Shape of the session.
+        rng (random.Random): Random number generator.
+        outputs (list[str]): Outputs shared between work results.
+
+    Yields:
+        Tuple of the job ID, mutation spec columns, worker outcome, test outcome, output and diff.
+    """
+    # cosmic-ray stores the operator arguments as a JSON encoded string in a JSON column.
+    operator_args = json.dumps(json.dumps({}))
+    outcomes = list(shape.outcomes)
+    weights = list(shape.outcomes.values())
+    for module_index in range(shape.modules):
+        path = module_path(index=module_index, depth=shape.depth, fanout=shape.fanout)
+        for occurrence in range(shape.mutants_per_module):
+            job_id = f'{module_index:06d}{occurrence:06d}'
+            line = occurrence // len(OPERATORS) + 1
+            operator_name = OPERATORS[occurrence % len(OPERATORS)]
+            outcome = rng.choices(outcomes, weights)[0]
+            yield (
+                job_id,
+                path,
+                operator_name,
+                operator_args,
+                occurrence,
+                line,
+                4,
+                line,
+                9,
+                WorkerOutcome.NORMAL.name if outcome is not None else None,
+                outcome.name if outcome is not None else None,
+                rng.choice(outputs),
+                f'--- mutation diff ---\n--- a{path}\n+++ b{path}\n@@ -{line} +{line} @@\n-    x = 1\n+    x = 2\n',
+            )
+
+
+def _output(index: int, size: int) -> str:
+    """
+    Create a test run output of roughly `size` characters.
+
+    Args:
+        index (int): Index used to make the output distinct.
+        size (int): Approximate size of the output.
+
+    Returns:
+        str: The output.
+    """
+    line = f'tests/test_module{index}.py::TestModule::test_case <FAILED> assert 1 == 2\n'
+    return (line * (size // len(line) + 1))[:size]
+
+
+def _batched(rows: Iterator[tuple], size: int) -> Iterator[list[tuple]]:
+    """
+    Split rows into batches.
+
+    Args:
+        rows (Iterator[tuple]): Rows to split.
+        size (int): Number of rows in each batch.
+
+    Yields:
+        Batch of rows.
+    """
+    while batch := list(itertools.islice(rows, size)):
+        yield batch
@@ -0,0 +1,141 @@
+"""Benchmarks for each stage of creating a report."""
+import collections
+import dataclasses
+import gc
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import pytest
+
+from cr_enhanced_report.datatypes import ReportOptions
+from cr_enhanced_report.db import DB, use_db
+from cr_enhanced_report.output import atomic_output
+from cr_enhanced_report.reporter import Reporter
+from tests.session_generator import SessionShape, generate_session
+
+pytestmark = pytest.mark.benchmark
+
+MUTANTS_PER_MODULE = 1_000
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+# Modules are streamed one at a time, so with a fixed number of mutants per module the peak memory of every
+# stage must not grow with the size of the session.
+MEMORY_CEILINGS = {
+    'fetch_statistics': 4 * 1024 * 1024,
+    'fetch_operator_statistics': 4 * 1024 * 1024,
+    'fetch_summary_data': 8 * 1024 * 1024,
+    'fetch_work_items': 16 * 1024 * 1024,
+    'render': 32 * 1024 * 1024,
+    'render_template': 32 * 1024 * 1024,
+    'output': 48 * 1024 * 1024,
+}
+
+
+@dataclasses.dataclass
+class StageResult:
+    """Time and peak memory of a stage, written in the terminal summary."""
+
+    stage: str
+    mutants: int
+    seconds: float
+    peak_memory: int
+
+
+@pytest.fixture(scope='module', params=SIZES, ids=lambda size: f'{size}-mutants')
+def benchmark_session(request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory) -> Iterator[Path]:
+    """
+    Create a synthetic session with the requested number of mutants.
+
+    Args:
+        request (pytest.FixtureRequest): Pytest request, the parameter is the number of mutants.
+        tmp_path_factory (pytest.TempPathFactory): Temporary directory factory provided by pytest.
+
+    Yields:
+        Path: Path to the session file.
+    """
+    if request.param > request.config.getoption('--benchmark-max-mutants'):
+        pytest.skip(f'Session with {request.param} mutants is larger than --benchmark-max-mutants.')
+    path = tmp_path_factory.mktemp('benchmark') / 'session.sqlite'
+    generate_session(
+        path=path,
+        shape=SessionShape(modules=request.param // MUTANTS_PER_MODULE, mutants_per_module=MUTANTS_PER_MODULE),
+    )
+    yield path
+    path.unlink()
+
+
+def measure(stage: str, mutants: int, func: Callable[[], object]) -> StageResult:
+    """
+    Time a stage, then run it again to trace its peak memory.
+
+    Tracing memory allocations slows some stages far more than others, so the stage is timed without it.
+
+    Args:
+        stage (str): Name of the stage.
+        mutants (int): Number of mutants in the session.
+        func (Callable): Function running the stage.
+
+    Returns:
+        StageResult: Time and peak memory of the stage.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return StageResult(stage=stage, mutants=mutants, seconds=seconds, peak_memory=peak_memory)
+
+
+def render(reporter: Reporter, options: ReportOptions) -> None:
+    """
+    Render the task list of every module, discarding each once it is rendered.
+
+    Args:
+        reporter (Reporter): Reporter to render with.
+        options (ReportOptions): Options selecting the renderer.
+    """
+    for file_id, (_, file_tasks) in enumerate(reporter._fetch_work_items_data(), start=1):
+        Reporter._render_file_tasks(file_id=file_id, file_tasks=file_tasks, options=options)
+
+
+class TestBenchmark(object):
+    """Benchmarks for each stage of creating a report."""
+
+    def test_stages(self, benchmark_session: Path, benchmark_results: list[Any], tmp_path: Path):
+        """
+        Test the peak memory of each stage stays under its ceiling.
+
+        Args:
+            benchmark_session (Path): Path to the session file.
+            benchmark_results (list): Results of the benchmarks, shown in the terminal summary.
+            tmp_path (Path): Temporary directory provided by pytest.
+        """
+        with use_db(benchmark_session, DB.Mode.open, read_only=True) as db:
+            mutants = db.num_work_items
+            reporter = Reporter(db=db, only_completed=False)
+            stages: dict[str, Callable[[], object]] = {
+                'fetch_statistics': db.fetch_statistics,
+                'fetch_operator_statistics': db.fetch_operator_statistics,
+                'fetch_summary_data': lambda: list(reporter._fetch_summary_data()),
+                'fetch_work_items': lambda: collections.deque(reporter._fetch_work_items_data(), maxlen=0),
+                'render': lambda: render(reporter=reporter, options=ReportOptions()),
+                'render_template': lambda: render(reporter=reporter, options=ReportOptions(renderer='template')),
+            }
+            for stage, func in stages.items():
+                benchmark_results.append(measure(stage=stage, mutants=mutants, func=func))
+
+            def output() -> None:
+                with atomic_output(tmp_path / 'report.html') as stream:
+                    reporter.create_report(stream=stream)
+
+            benchmark_results.append(measure(stage='output', mutants=mutants, func=output))
+
+        for result in benchmark_results[-len(MEMORY_CEILINGS):]:
+            assert result.peak_memory < MEMORY_CEILINGS[result.stage], result
@@ -0,0 +1,116 @@
+"""Set of tests to test the report caches."""
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from cr_enhanced_report.cache import FragmentCache, StatisticsCache
+from cr_enhanced_report.db import DB, use_db
+
+
+class TestFragmentCache(object):
+    """Tests for the fragment cache."""
+
+    def test_get_put(self, tmp_path: Path):
+        """
+        Test fragments can be fetched after being stored, including by a new cache on the same directory.
+
+        Args:
+            tmp_path (Path): Temporary directory provided by pytest.
+        """
+        cache = FragmentCache(directory=tmp_path / 'cache', max_size=1024)
+        assert cache.get(key='a') is None
+        cache.put(key='a', fragment='<p>a</p>')
+        assert cache.get(key='a') == '<p>a</p>'
+        assert FragmentCache(directory=tmp_path / 'cache', max_size=1024).size == cache.size == 8
+
+    def test_evict_least_recently_used(self, tmp_path: Path):
+        """
+        Test the least recently used fragments are evicted once the cache is too large.
+
+        Args:
+            tmp_path (Path): Temporary directory provided by pytest.
+        """
+        cache = FragmentCache(directory=tmp_path, max_size=20)
+        cache.put(key='a', fragment='a' * 8)
+        cache.put(key='b', fragment='b' * 8)
+        os.utime(tmp_path / 'a.html', ns=(1, 1))
+        os.utime(tmp_path / 'b.html', ns=(2, 2))
+        assert cache.get(key='a') == 'a' * 8
+        cache.put(key='c', fragment='c' * 8)
+        assert cache.get(key='b') is None
+        assert cache.get(key='a') == 'a' * 8
+        assert cache.get(key='c') == 'c' * 8
+        assert cache.size == 16
+
+    def test_evict_to_low_water_without_scanning(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """
+        Test eviction frees space down to the low water mark without scanning the cache directory.
+
+        Args:
+            tmp_path (Path): Temporary directory provided by pytest.
+            monkeypatch (pytest.MonkeyPatch): Pytest fixture to patch the directory scan.
+        """
+        (tmp_path / 'old.html').write_text('o' * 10)
+        cache = FragmentCache(directory=tmp_path, max_size=100)
+
+        def scan(self: FragmentCache):
+            raise AssertionError('the cache directory was scanned')
+
+        monkeypatch.setattr(FragmentCache, '_entries', scan)
+        for key in 'abcdefghi':
+            cache.put(key=key, fragment=key * 10)
+        assert cache.size == 100
+        cache.put(key='j', fragment='j' * 10)
+        assert cache.size == 80
+        assert sorted(path.stem for path in tmp_path.iterdir()) == list('cdefghij')
+        assert cache.get(key='d') == 'd' * 10
+        for key in 'klm':
+            cache.put(key=key, fragment=key * 10)
+        assert cache.size == 80
+        assert sorted(path.stem for path in tmp_path.iterdir()) == list('dghijklm')
+
+    def test_evict_existing_fragments_by_age(self, tmp_path: Path):
+        """
+        Test fragments found when the cache is opened are evicted least recently used first.
+
+        Args:
+            tmp_path (Path): Temporary directory provided by pytest.
+        """
+        for age, key in enumerate('cab'):
+            (tmp_path / f'{key}.html').write_text(key * 10)
+            os.utime(tmp_path / f'{key}.html', ns=(age, age))
+        cache = FragmentCache(directory=tmp_path, max_size=30)
+        assert cache.size == 30
+        cache.put(key='d', fragment='d' * 10)
+        assert sorted(path.stem for path in tmp_path.iterdir()) == ['b', 'd']
+
+
+class TestStatisticsCache(object):
+    """Tests for the statistics sidecar cache."""
+
+    def test_reused_until_session_changes(self, session_file: Path):
+        """
+        Test statistics are loaded from the sidecar file until the session is written to.
+
+        Args:
+            session_file (Path): Path to the session file.
+        """
+        cache = StatisticsCache(session_path=session_file)
+        with use_db(session_file, DB.Mode.open, read_only=True) as db:
+            db.statistics_cache = cache
+            expected = db.statistics
+        assert cache.path.exists()
+        assert cache.load(fingerprint=cache.fingerprint()) == expected
+        with use_db(session_file, DB.Mode.open, read_only=True) as db:
+            db.statistics_cache = cache
+            db.fetch_statistics = None
+            assert db.statistics == expected
+
+        with sqlite3.connect(session_file) as connection:
+            connection.execute("DELETE FROM work_results WHERE job_id = 'job1'")
+        assert cache.load(fingerprint=cache.fingerprint()) is None
+        with use_db(session_file, DB.Mode.open, read_only=True) as db:
+            db.statistics_cache = cache
+            assert db.statistics.num_results == expected.num_results - 1
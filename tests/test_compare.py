@@ -0,0 +1,54 @@
+"""Set of tests to test comparing sessions."""
+from cr_enhanced_report.compare import merge_outcomes
+from cr_enhanced_report.datatypes import MutationOutcome
+
+
+def outcome(module_path: str, occurrence: int, test_outcome: str | None) -> MutationOutcome:
+    """
+    Create a mutation outcome.
+
+    Args:
+        module_path (str): Path of the module.
+        occurrence (int): Occurrence of the mutation.
+        test_outcome (str): Test outcome, None if pending.
+
+    Returns:
+        MutationOutcome: The mutation outcome.
+    """
+    return MutationOutcome(
+        module_path=module_path,
+        operator_name='core/NumberReplacer',
+        occurrence=occurrence,
+        start_pos=(1, 0),
+        end_pos=(1, 1),
+        job_id=f'{module_path}-{occurrence}',
+        worker_outcome=None if test_outcome is None else 'normal',
+        test_outcome=test_outcome,
+    )
+
+
+class TestCompare(object):
+    """Tests for comparing sessions."""
+
+    def test_merge_outcomes(self):
+        """Test only added, removed and changed mutations are reported."""
+        baseline = [
+            outcome('a.py', 0, 'killed'),
+            outcome('a.py', 1, 'killed'),
+            outcome('b.py', 0, 'survived'),
+            outcome('c.py', 0, 'killed'),
+        ]
+        candidate = [
+            outcome('a.py', 0, 'killed'),
+            outcome('a.py', 1, 'survived'),
+            outcome('a.py', 2, 'survived'),
+            outcome('b.py', 0, None),
+        ]
+        changes = list(merge_outcomes(baseline=iter(baseline), candidate=iter(candidate)))
+        assert [str(change) for change in changes] == [
+            'a.py:1:0 core/NumberReplacer occurrence 1 (a.py-1): killed -> survived',
+            'a.py:1:0 core/NumberReplacer occurrence 2 (a.py-2): missing -> survived',
+            'b.py:1:0 core/NumberReplacer occurrence 0 (b.py-0): survived -> pending',
+            'c.py:1:0 core/NumberReplacer occurrence 0 (c.py-0): killed -> missing',
+        ]
+        assert [change.newly_survived for change in changes] == [True, True, False, False]
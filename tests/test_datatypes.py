@@ -3,7 +3,7 @@ from pathlib import Path
 
 import pytest
 
-from cr_enhanced_report.datatypes import SummaryDetail
+from cr_enhanced_report.datatypes import SummaryDetail, SummaryTree
 
 
 class TestDataTypes(object):
@@ -410,3 +410,66 @@ class TestDataTypes(object):
             survived=survived,
         )
         assert str(summary) == expected, f'{str(summary)} == {expected}'
+
+
+class TestSummaryTree(object):
+    """Tests for the summary tree."""
+
+    def test_empty(self):
+        """Test an empty tree has no summary details."""
+        assert not list(SummaryTree())
+
+    def test_rollup(self):
+        """Test counts are rolled up through every directory a module is in."""
+        summary_tree = SummaryTree()
+        summary_tree.add(module_path='folder1/folder2/file2.py', killed=1, incompetent=2, survived=3)
+        summary_tree.add(module_path='folder1/file1.py', killed=4)
+        summary_tree.add(module_path='file1.py', survived=5)
+        assert [str(summary) for summary in summary_tree] == [
+            "SummaryDetail(path='/', is_dir=True, killed=5, incompetent=2, survived=8)",
+            "SummaryDetail(path='/folder1', is_dir=True, killed=5, incompetent=2, survived=3)",
+            "SummaryDetail(path='/folder1/folder2', is_dir=True, killed=1, incompetent=2, survived=3)",
+            "SummaryDetail(path='/folder1/folder2/file2.py', is_dir=False, killed=1, incompetent=2, survived=3)",
+            "SummaryDetail(path='/folder1/file1.py', is_dir=False, killed=4, incompetent=0, survived=0)",
+            "SummaryDetail(path='/file1.py', is_dir=False, killed=0, incompetent=0, survived=5)",
+        ]
+
+    def test_order(self):
+        """Test a directory is followed by its subdirectories and then its files, each in name order."""
+        module_paths = [
+            'gfile1.py',
+            'folder2/file1.py',
+            'folder1/folder2/folder3/file3.py',
+            'folder1/file1.py',
+            'afile.py',
+            'folder1/folder2/file2.py',
+            'folder1/afolder/file4.py',
+            'folder1/zfile.py',
+            'folder1/folder2/afile.py',
+            'folder1/folder2/zfolder/file5.py',
+            'folder1_b/file6.py',
+        ]
+        summary_tree = SummaryTree()
+        for module_path in module_paths:
+            summary_tree.add(module_path=module_path, killed=1)
+        assert [(str(summary.path), summary.is_dir) for summary in summary_tree] == [
+            ('/', True),
+            ('/folder1', True),
+            ('/folder1/afolder', True),
+            ('/folder1/afolder/file4.py', False),
+            ('/folder1/folder2', True),
+            ('/folder1/folder2/folder3', True),
+            ('/folder1/folder2/folder3/file3.py', False),
+            ('/folder1/folder2/zfolder', True),
+            ('/folder1/folder2/zfolder/file5.py', False),
+            ('/folder1/folder2/afile.py', False),
+            ('/folder1/folder2/file2.py', False),
+            ('/folder1/file1.py', False),
+            ('/folder1/zfile.py', False),
+            ('/folder1_b', True),
+            ('/folder1_b/file6.py', False),
+            ('/folder2', True),
+            ('/folder2/file1.py', False),
+            ('/afile.py', False),
+            ('/gfile1.py', False),
+        ]
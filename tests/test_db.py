@@ -0,0 +1,218 @@
+"""Set of tests to test the database extension."""
+from pathlib import Path
+
+import pytest
+from cosmic_ray.work_item import MutationSpec
+from cosmic_ray.work_item import TestOutcome as Outcome
+from cosmic_ray.work_item import WorkerOutcome, WorkItem, WorkResult
+from sqlalchemy.exc import OperationalError
+
+from cr_enhanced_report.datatypes import WorkItemFilter
+from cr_enhanced_report.db import (DB, READ_ONLY_CACHE_SIZE_KB,
+                                   UNMAPPED_CACHE_SIZE_KB, use_db)
+
+
+class TestDB(object):
+    """Tests for the database extension."""
+
+    @pytest.mark.parametrize(
+        'skip_success,expected',
+        [
+            [
+                False,
+                [('a.py', ['job1', 'job3', 'job5']), ('b.py', ['job0']), ('pkg/c.py', ['job2'])],
+            ],
+            [
+                True,
+                [('a.py', ['job1']), ('pkg/c.py', ['job2'])],
+            ],
+        ],
+    )
+    def test_iter_completed_work_item_groups(self, session_file: Path, skip_success: bool, expected: list):
+        """
+        Test completed work items are grouped by module regardless of the batch size.
+
+        Args:
+            session_file (Path): Path to the session file.
+            skip_success (bool): Whether killed mutants are skipped.
+            expected (list): Expected module paths and job ids.
+        """
+        with use_db(session_file, DB.Mode.open) as db:
+            db.skip_success = skip_success
+            groups = [
+                (module_path, [work_item.job_id for work_item, _, _ in work_items])
+                for module_path, work_items in db.iter_completed_work_item_groups(batch_size=2)
+            ]
+        assert groups == expected
+
+    @pytest.mark.parametrize(
+        'skip_success,expected',
+        [
+            [
+                False,
+                [('a.py', ['job1', 'job3', 'job5']), ('b.py', ['job0', 'job4']), ('pkg/c.py', ['job2'])],
+            ],
+            [
+                True,
+                [('a.py', ['job1']), ('b.py', ['job4']), ('pkg/c.py', ['job2'])],
+            ],
+        ],
+    )
+    def test_iter_work_item_groups(self, session_file: Path, skip_success: bool, expected: list):
+        """
+        Test pending work items are included, without a result, when iterating over all work items.
+
+        Args:
+            session_file (Path): Path to the session file.
+            skip_success (bool): Whether killed mutants are skipped.
+            expected (list): Expected module paths and job ids.
+        """
+        with use_db(session_file, DB.Mode.open) as db:
+            db.skip_success = skip_success
+            groups = list(db.iter_work_item_groups(batch_size=2))
+        assert [
+            (module_path, [work_item.job_id for work_item, _, _ in work_items]) for module_path, work_items in groups
+        ] == expected
+        pending = [work_item.job_id for _, work_items in groups for work_item, result, _ in work_items if not result]
+        assert pending == ['job4']
+
+    @pytest.mark.parametrize(
+        'batch_size,max_size,expected',
+        [
+            [10, 200, [['a', 'b', 'c', 'd']]],
+            [10, 100, [['a', 'b', 'c'], ['d']]],
+            [2, 100, [['a', 'b'], ['c', 'd']]],
+            [10, 50, [['a', 'b'], ['c'], ['d']]],
+            [10, 1, [['a'], ['b'], ['c'], ['d']]],
+        ],
+    )
+    def test_iter_key_batches(self, batch_size: int, max_size: int, expected: list):
+        """
+        Test keys are batched by count and size, with a key over the size in a batch of its own.
+
+        Args:
+            batch_size (int): Maximum number of keys per batch.
+            max_size (int): Maximum size of a batch.
+            expected (list): Expected batches.
+        """
+        keys = iter([('a', 10), ('b', 20), ('c', 40), ('d', 60)])
+        assert list(DB._iter_key_batches(keys=keys, batch_size=batch_size, max_size=max_size)) == expected
+
+    def test_statistics(self, session_file: Path):
+        """
+        Test totals and per module counts are derived from the aggregate query.
+
+        Args:
+            session_file (Path): Path to the session file.
+        """
+        with use_db(session_file, DB.Mode.open) as db:
+            statistics = db.statistics
+            assert statistics.num_work_items == db.num_work_items
+            assert statistics.num_results == db.num_results
+        assert statistics.kill_count == 4
+        assert statistics.survival_rate == 20.0
+        assert [(task.module_path, task.status_count) for task in statistics.tasks] == [
+            ('a.py', {'killed': 2, 'survived': 1}),
+            ('b.py', {'killed': 1}),
+            ('pkg/c.py', {'incompetent': 1}),
+        ]
+
+    @pytest.mark.parametrize(
+        'work_item_filter,expected',
+        [
+            [WorkItemFilter(include=('a.py', 'pkg/*')), [('a.py', ['job1', 'job3', 'job5']), ('pkg/c.py', ['job2'])]],
+            [WorkItemFilter(exclude=('*.py',)), []],
+            [
+                WorkItemFilter(exclude=('pkg/*',), outcomes=('survived', 'pending')),
+                [('a.py', ['job1']), ('b.py', ['job4'])],
+            ],
+            [WorkItemFilter(operators=('core/Number*',), outcomes=('incompetent',)), [('pkg/c.py', ['job2'])]],
+            [WorkItemFilter(operators=('core/AddNot',)), []],
+        ],
+    )
+    def test_work_item_filter(self, session_file: Path, work_item_filter: WorkItemFilter, expected: list):
+        """
+        Test the filter is applied to the detail and summary queries.
+
+        Args:
+            session_file (Path): Path to the session file.
+            work_item_filter (WorkItemFilter): Filter selecting the work items.
+            expected (list): Job IDs expected for each module.
+        """
+        with use_db(session_file, DB.Mode.open) as db:
+            db.work_item_filter = work_item_filter
+            groups = [
+                (module_path, [work_item.job_id for work_item, _, _ in work_items])
+                for module_path, work_items in db.iter_work_item_groups()
+            ]
+            statistics = db.statistics
+            operators = db.fetch_operator_statistics()
+        assert groups == expected
+        assert [task.module_path for task in statistics.tasks] == [module_path for module_path, _ in expected]
+        assert statistics.num_work_items == sum(len(job_ids) for _, job_ids in expected)
+        assert sum(operator.killed + operator.incompetent + operator.survived for operator in operators) == (
+            statistics.num_results
+        )
+
+    def test_operator_statistics(self, session_file: Path):
+        """
+        Test outcome counts are grouped by operator, then by module.
+
+        Args:
+            session_file (Path): Path to the session file.
+        """
+        with use_db(session_file, DB.Mode.open) as db:
+            db.add_work_items([
+                WorkItem.single('job6', MutationSpec('b.py', 'core/AddNot', 0, (2, 0), (2, 1))),
+                WorkItem.single('job7', MutationSpec('b.py', 'core/AddNot', 1, (3, 0), (3, 1))),
+            ])
+            db.set_result('job6', WorkResult(WorkerOutcome.NORMAL, output='', test_outcome=Outcome.SURVIVED, diff=''))
+            operators = db.fetch_operator_statistics()
+        assert [
+            (operator.operator_name, operator.killed, operator.incompetent, operator.survived, operator.score)
+            for operator in operators
+        ] == [('core/AddNot', 0, 0, 1, 0.0), ('core/NumberReplacer', 3, 1, 1, 60.0)]
+        assert [
+            (module.module_path, module.killed, module.incompetent, module.survived)
+            for module in operators[1].modules
+        ] == [('a.py', 2, 0, 1), ('b.py', 1, 0, 0), ('pkg/c.py', 0, 1, 0)]
+
+    @pytest.mark.parametrize('immutable', [False, True])
+    def test_read_only(self, session_file: Path, immutable: bool):
+        """
+        Test a read only DB is tuned for reporting and cannot be written to.
+
+        Args:
+            session_file (Path): Path to the session file.
+            immutable (bool): Whether the DB is opened as immutable.
+        """
+        with use_db(session_file, DB.Mode.open, read_only=True, immutable=immutable) as db:
+            assert db.statistics.num_results == 5
+            with db._engine.connect() as connection:
+                assert connection.exec_driver_sql('PRAGMA query_only').scalar_one() == 1
+                assert connection.exec_driver_sql('PRAGMA cache_size').scalar_one() == -READ_ONLY_CACHE_SIZE_KB
+            with pytest.raises(OperationalError):
+                db.clear()
+
+    def test_read_only_not_memory_mapped(self, session_file: Path):
+        """
+        Test a read only DB that is not memory mapped also keeps a small page cache.
+
+        Args:
+            session_file (Path): Path to the session file.
+        """
+        with use_db(session_file, DB.Mode.open, read_only=True, memory_mapped=False) as db:
+            with db._engine.connect() as connection:
+                assert connection.exec_driver_sql('PRAGMA mmap_size').scalar_one() == 0
+                assert connection.exec_driver_sql('PRAGMA cache_size').scalar_one() == -UNMAPPED_CACHE_SIZE_KB
+
+    def test_read_only_missing_file(self, tmp_path: Path):
+        """
+        Test opening a missing DB read only raises an error rather than creating it.
+
+        Args:
+            tmp_path (Path): Temporary directory provided by pytest.
+        """
+        with pytest.raises(FileNotFoundError):
+            DB(tmp_path / 'missing.sqlite', DB.Mode.open, read_only=True)
+        assert not list(tmp_path.iterdir())
@@ -0,0 +1,61 @@
+"""Set of tests to test exporting report data."""
+import io
+import json
+from pathlib import Path
+
+from cr_enhanced_report.db import DB, use_db
+from cr_enhanced_report.export import (write_summary_csv,
+                                       write_work_items_ndjson)
+
+
+class TestExport(object):
+    """Tests for exporting report data."""
+
+    def test_write_work_items_ndjson(self, session_file: Path):
+        """
+        Test a record is written for every work item.
+
+        Args:
+            session_file (Path): Path to the session file.
+        """
+        stream = io.StringIO()
+        with use_db(session_file, DB.Mode.open) as db:
+            write_work_items_ndjson(db=db, stream=stream)
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [(record['job_id'], record['test_outcome']) for record in records] == [
+            ('job1', 'survived'),
+            ('job3', 'killed'),
+            ('job5', 'killed'),
+            ('job0', 'killed'),
+            ('job4', None),
+            ('job2', 'incompetent'),
+        ]
+        assert records[0] == {
+            'job_id': 'job1',
+            'module_path': 'a.py',
+            'operator_name': 'core/NumberReplacer',
+            'occurrence': 1,
+            'start_pos': [1, 0],
+            'end_pos': [1, 1],
+            'worker_outcome': 'normal',
+            'test_outcome': 'survived',
+        }
+
+    def test_write_summary_csv(self, session_file: Path):
+        """
+        Test a row is written for every directory and module in the summary.
+
+        Args:
+            session_file (Path): Path to the session file.
+        """
+        stream = io.StringIO()
+        with use_db(session_file, DB.Mode.open) as db:
+            write_summary_csv(db=db, stream=stream)
+        assert stream.getvalue().splitlines() == [
+            'path,is_dir,score,killed,incompetent,survived',
+            '/,True,60.0,3,1,1',
+            '/pkg,True,0.0,0,1,0',
+            '/pkg/c.py,False,0.0,0,1,0',
+            '/a.py,False,66.67,2,0,1',
+            '/b.py,False,100.0,1,0,0',
+        ]
@@ -0,0 +1,114 @@
+"""Set of tests to test writing output files."""
+import gzip
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from cr_enhanced_report.output import atomic_output
+
+
+class TestAtomicOutput(object):
+    """Tests for atomic output."""
+
+    @pytest.mark.parametrize(
+        'name,read',
+        [
+            [
+                'report.html',
+                lambda path: path.read_text(encoding='utf-8'),
+            ],
+            [
+                'report.html.gz',
+                lambda path: gzip.decompress(path.read_bytes()).decode('utf-8'),
+            ],
+        ],
+    )
+    def test_write(self, tmp_path: Path, name: str, read):
+        """
+        Test the output is written, compressed if the path ends in .gz.
+
+        Args:
+            tmp_path (Path): Temporary directory provided by pytest.
+            name (str): Name of the output file.
+            read: Function reading the output file.
+        """
+        path = tmp_path / name
+        with atomic_output(path) as stream:
+            stream.write('<p>é</p>')
+            assert not path.exists()
+        assert read(path) == '<p>é</p>'
+        assert [entry.name for entry in tmp_path.iterdir()] == [name]
+
+    @pytest.mark.parametrize('name', ['report.html', 'report.html.gz'])
+    def test_synced_before_replace(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, name: str):
+        """
+        Test the complete temporary file is synced to disk before it replaces the output file.
+
+        Args:
+            tmp_path (Path): Temporary directory provided by pytest.
+            monkeypatch (pytest.MonkeyPatch): Pytest fixture to record the sync and rename.
+            name (str): Name of the output file.
+        """
+        calls = []
+        fsync = os.fsync
+        replace = os.replace
+
+        def record_fsync(file_descriptor: int) -> None:
+            calls.append(('fsync', os.fstat(file_descriptor).st_size))
+            fsync(file_descriptor)
+
+        def record_replace(source: Path, destination: Path) -> None:
+            calls.append(('replace', os.stat(source).st_size))
+            replace(source, destination)
+
+        monkeypatch.setattr(os, 'fsync', record_fsync)
+        monkeypatch.setattr(os, 'replace', record_replace)
+        path = tmp_path / name
+        with atomic_output(path) as stream:
+            stream.write('report')
+        size = path.stat().st_size
+        assert calls == [('fsync', size), ('replace', size)]
+
+    def test_error_leaves_existing_file(self, tmp_path: Path):
+        """
+        Test an error while writing leaves the existing file untouched.
+
+        Args:
+            tmp_path (Path): Temporary directory provided by pytest.
+        """
+        path = tmp_path / 'report.html'
+        path.write_text('previous')
+        with pytest.raises(RuntimeError):
+            with atomic_output(path) as stream:
+                stream.write('partial')
+                raise RuntimeError('failed')
+        assert path.read_text() == 'previous'
+        assert [entry.name for entry in tmp_path.iterdir()] == ['report.html']
+
+    def test_mode_from_umask(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """
+        Test files written by many threads at once get the permissions of the umask, without it being changed.
+
+        Args:
+            tmp_path (Path): Temporary directory provided by pytest.
+            monkeypatch (pytest.MonkeyPatch): Pytest fixture to patch the umask.
+        """
+        umask = os.umask(0o027)
+        try:
+            def write(index: int) -> None:
+                with atomic_output(tmp_path / f'{index}.html') as stream:
+                    stream.write('report')
+
+            def set_umask(mask: int) -> int:
+                raise AssertionError('the umask was changed')
+
+            monkeypatch.setattr(os, 'umask', set_umask)
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(write, range(20)))
+        finally:
+            monkeypatch.undo()
+            os.umask(umask)
+        assert {stat.S_IMODE(path.stat().st_mode) for path in tmp_path.iterdir()} == {0o640}
@@ -0,0 +1,48 @@
+"""Set of tests to test prefetching items in a background thread."""
+import threading
+from typing import Iterator
+
+import pytest
+
+from cr_enhanced_report.pipeline import prefetch
+
+
+class TestPrefetch(object):
+    """Tests for prefetching."""
+
+    @pytest.mark.parametrize('size', [1, 2, 10])
+    def test_items_in_order(self, size: int):
+        """
+        Test every item is produced in order.
+
+        Args:
+            size (int): Maximum number of items waiting to be consumed.
+        """
+        assert list(prefetch(iterable=range(20), size=size)) == list(range(20))
+
+    def test_error_raised_to_consumer(self):
+        """Test an exception raised producing items is raised to the consumer after the items before it."""
+        def items() -> Iterator[int]:
+            yield 1
+            raise ValueError('broken')
+
+        consumed = []
+        with pytest.raises(ValueError, match='broken'):
+            for item in prefetch(iterable=items(), size=1):
+                consumed.append(item)
+        assert consumed == [1]
+
+    def test_consumer_stops_early(self):
+        """Test the iterable is closed by the producing thread when the consumer stops early."""
+        closed_by = []
+
+        def items() -> Iterator[int]:
+            try:
+                yield from range(100)
+            finally:
+                closed_by.append(threading.current_thread().name)
+
+        consumer = prefetch(iterable=items(), size=2)
+        assert next(consumer) == 0
+        consumer.close()
+        assert closed_by == ['prefetch']
@@ -0,0 +1,114 @@
+"""Set of tests to test the profiler."""
+import io
+import json
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from cr_enhanced_report.commands import cr_enhanced_report
+from cr_enhanced_report.db import DB, use_db
+from cr_enhanced_report.profiling import Profiler
+from cr_enhanced_report.reporter import Reporter
+
+
+class TestProfiler(object):
+    """Tests for the profiler."""
+
+    def test_iterate(self):
+        """Test iterated stages count rows and are recorded once exhausted."""
+        profiler = Profiler()
+        items = profiler.iterate('fetch', [[1, 2], [3]], rows=len, kind='test')
+        assert list(items) == [[1, 2], [3]]
+        assert len(profiler.records) == 1
+        assert profiler.records[0]['stage'] == 'fetch'
+        assert profiler.records[0]['kind'] == 'test'
+        assert profiler.records[0]['rows'] == 3
+        assert profiler.records[0]['items'] == 2
+
+    def test_stage_memory(self):
+        """Test each stage records its own traced peak, including the stages nested in it."""
+        profiler = Profiler()
+        tracemalloc.start()
+        try:
+            with profiler.stage('outer'):
+                with profiler.stage('large'):
+                    data = bytearray(8 * 1024 * 1024)
+                    del data
+                with profiler.stage('small'):
+                    data = bytearray(1024)
+                    del data
+        finally:
+            tracemalloc.stop()
+        records = {record['stage']: record for record in profiler.records}
+        assert records['large']['traced_peak'] >= 8 * 1024 * 1024
+        assert records['small']['traced_peak'] < 1024 * 1024
+        assert records['outer']['traced_peak'] >= 8 * 1024 * 1024
+        assert all(record['max_rss_rise'] is None or record['max_rss_rise'] >= 0 for record in records.values())
+        assert all('max_rss' in record for record in records.values())
+
+    def test_iterate_memory(self):
+        """Test an iterated stage is not charged for the memory used by its consumer between items."""
+        profiler = Profiler()
+        tracemalloc.start()
+        try:
+            for _ in profiler.iterate('fetch', [1, 2]):
+                data = bytearray(8 * 1024 * 1024)
+                del data
+        finally:
+            tracemalloc.stop()
+        assert profiler.records[0]['traced_peak'] < 1024 * 1024
+
+    def test_disabled(self):
+        """Test nothing is recorded when the profiler is disabled."""
+        profiler = Profiler(enabled=False)
+        with profiler.stage('summary') as stage:
+            stage['rows'] = 1
+        assert list(profiler.iterate('fetch', [1, 2])) == [1, 2]
+        assert profiler.records == []
+
+    def test_report_stages(self, session_file: Path):
+        """
+        Test the stages of a report are recorded and written as JSON.
+
+        Args:
+            session_file (Path): Path to the session file.
+        """
+        profiler = Profiler()
+        with use_db(session_file, DB.Mode.open, read_only=True) as db:
+            db.profiler = profiler
+            Reporter(db=db, only_completed=False).create_report(stream=io.StringIO())
+        stream = io.StringIO()
+        profiler.write(stream=stream)
+        stages = json.loads(stream.getvalue())['stages']
+        assert [stage['module'] for stage in stages if stage['stage'] == 'render_module'] == [
+            'a.py',
+            'b.py',
+            'pkg/c.py',
+        ]
+        fetch = next(stage for stage in stages if stage['stage'] == 'fetch_work_item_groups')
+        assert fetch['rows'] == 6
+        assert fetch['items'] == 3
+        assert stages[-1]['stage'] == 'report'
+
+    @pytest.mark.parametrize('output', [False, True])
+    def test_profile_option(self, session_file: Path, tmp_path: Path, output: bool):
+        """
+        Test --profile before the session file writes the profile, to stderr or the --profile-output file.
+
+        Args:
+            session_file (Path): Path to the session file.
+            tmp_path (Path): Temporary directory provided by pytest.
+            output (bool): If `True`, the profile is written to a file.
+        """
+        profile_path = tmp_path / 'profile.json'
+        args = ['--profile', str(session_file)]
+        if output:
+            args = ['--profile-output', str(profile_path), *args]
+        result = CliRunner().invoke(cr_enhanced_report, args)
+        assert result.exit_code == 0, result.output
+        assert result.stdout.endswith('</body></html>\n')
+        profile = profile_path.read_text() if output else result.stderr
+        assert json.loads(profile)['stages'][-1]['stage'] == 'report'
+        assert profile_path.exists() == output
@@ -0,0 +1,399 @@
+"""Set of tests to test the reporter."""
+import dataclasses
+import io
+import json
+import os
+import re
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from cosmic_ray.work_item import MutationSpec
+from cosmic_ray.work_item import TestOutcome as Outcome
+from cosmic_ray.work_item import WorkerOutcome, WorkItem, WorkResult
+
+from cr_enhanced_report.datatypes import ReportOptions, WorkItemFilter
+from cr_enhanced_report.db import DB, use_db
+from cr_enhanced_report.profiling import Profiler
+from cr_enhanced_report.reporter import FILE_ID_PLACEHOLDER, Reporter
+
+
+def create_report(session_file: Path, options: ReportOptions | None = None) -> str:
+    """
+    Create a report, removing the time it was ran.
+
+    Args:
+        session_file (Path): Path to the session file.
+        options (ReportOptions): Options used to create the report.
+
+    Returns:
+        str: The report.
+    """
+    stream = io.StringIO()
+    with use_db(session_file, DB.Mode.open) as db:
+        Reporter(db=db, only_completed=True, options=options).create_report(stream=stream)
+    return re.sub(r'Report Ran On: [^<]*', '', stream.getvalue())
+
+
+def create_session(path: Path, modules: list[str]) -> Path:
+    """
+    Create a session file with a killed work item for each module.
+
+    Args:
+        path (Path): Path to the session file.
+        modules (list): Paths of the modules.
+
+    Returns:
+        Path: Path to the session file.
+    """
+    with use_db(path, DB.Mode.create) as db:
+        db.add_work_items(
+            WorkItem.single(f'job{index}', MutationSpec(module, 'core/NumberReplacer', index, (1, 0), (1, 1)))
+            for index, module in enumerate(modules)
+        )
+        for index in range(len(modules)):
+            result = WorkResult(WorkerOutcome.NORMAL, output=f'out{index}', test_outcome=Outcome.KILLED, diff='')
+            db.set_result(f'job{index}', result)
+    return path
+
+
+class TestReporter(object):
+    """Tests for the reporter."""
+
+    @pytest.mark.parametrize(
+        'options',
+        [
+            ReportOptions(jobs=2),
+            ReportOptions(renderer='template'),
+            ReportOptions(jobs=2, renderer='template'),
+            ReportOptions(prefetch=1),
+            ReportOptions(jobs=2, prefetch=2),
+        ],
+    )
+    def test_options_match_default_report(self, session_file: Path, options: ReportOptions):
+        """
+        Test reports created with different options are the same as the default report.
+
+        Args:
+            session_file (Path): Path to the session file.
+            options (ReportOptions): Options used to create the report.
+        """
+        assert create_report(session_file=session_file, options=options) == create_report(session_file=session_file)
+
+    @pytest.mark.parametrize(
+        'options',
+        [
+            ReportOptions(),
+            ReportOptions(renderer='template'),
+            ReportOptions(dedupe_outputs=True),
+            ReportOptions(virtual_tasks=True),
+            ReportOptions(jobs=2),
+            ReportOptions(prefetch=1),
+        ],
+    )
+    def test_max_memory(self, session_file: Path, options: ReportOptions):
+        """
+        Test reports with every module spilled to temporary files are the same as reports without a budget.
+
+        Args:
+            session_file (Path): Path to the session file.
+            options (ReportOptions): Options used to create the report.
+        """
+        expected = create_report(session_file=session_file, options=options)
+        options = dataclasses.replace(options, max_memory=1)
+        assert create_report(session_file=session_file, options=options) == expected
+
+    @pytest.mark.parametrize('virtual_tasks', [False, True])
+    def test_max_memory_large_outputs(self, tmp_path: Path, virtual_tasks: bool):
+        """
+        Test the peak memory of a report with outputs over the memory budget is a few outputs, not every output.
+
+        Args:
+            tmp_path (Path): Temporary directory provided by pytest.
+            virtual_tasks (bool): If `True`, the tasks are embedded as JSON.
+        """
+        output_size = 2 * 1024 * 1024
+        with use_db(tmp_path / 'session.sqlite', DB.Mode.create) as db:
+            db.add_work_items(
+                WorkItem.single(f'job{index}', MutationSpec('a.py', 'core/NumberReplacer', index, (1, 0), (1, 1)))
+                for index in range(8)
+            )
+            for index in range(8):
+                output = chr(ord('a') + index) * output_size
+                result = WorkResult(WorkerOutcome.NORMAL, output=output, test_outcome=Outcome.SURVIVED, diff='')
+                db.set_result(f'job{index}', result)
+        options = ReportOptions(max_memory=2 * output_size, virtual_tasks=virtual_tasks)
+        with (
+            use_db(tmp_path / 'session.sqlite', DB.Mode.open, read_only=True, memory_mapped=False) as db,
+            open(tmp_path / 'report.html', 'w') as stream,
+        ):
+            tracemalloc.start()
+            try:
+                Reporter(db=db, only_completed=False, options=options).create_report(stream=stream)
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        assert peak_memory < 4 * output_size
+        assert (tmp_path / 'report.html').stat().st_size > 8 * output_size
+
+    def test_jobs_not_forked(self, session_file: Path, monkeypatch: pytest.MonkeyPatch):
+        """
+        Test the render processes are not forked from the reporting process, which runs the prefetch thread.
+
+        Args:
+            session_file (Path): Path to the session file.
+            monkeypatch (pytest.MonkeyPatch): Pytest fixture to patch os.fork.
+        """
+        expected = create_report(session_file=session_file)
+
+        def fork() -> int:
+            """
+            Fail any fork of the reporting process.
+
+            Raises:
+                AssertionError: Always.
+            """
+            raise AssertionError('The reporting process was forked.')
+
+        monkeypatch.setattr(os, 'fork', fork)
+        assert create_report(session_file=session_file, options=ReportOptions(jobs=2, prefetch=2)) == expected
+
+    def test_operator_summary(self, session_file: Path):
+        """
+        Test the summary has a row for each operator followed by a row linking to each module it mutated.
+
+        Args:
+            session_file (Path): Path to the session file.
+        """
+        report = create_report(session_file=session_file)
+        operator_summary = report.split('<div id="operator-summary">')[1].split('</table>')[0]
+        assert re.findall(r'<tr class="([^"]+)"><td>(?:<a href="([^"]+)">)?', operator_summary) == [
+            ('operator', ''),
+            ('operator-module', '#_a_py'),
+            ('operator-module', '#_b_py'),
+            ('operator-module', '#_pkg_c_py'),
+        ]
+        assert '<td class="incompetent">60.0%</td>' in operator_summary
+
+    def test_fragment_cache(self, session_file: Path, tmp_path: Path):
+        """
+        Test reports created from the fragment cache are the same as the default report.
+
+        Args:
+            session_file (Path): Path to the session file.
+            tmp_path (Path): Temporary directory provided by pytest.
+        """
+        options = ReportOptions(cache_dir=tmp_path / 'cache')
+        expected = create_report(session_file=session_file)
+        assert create_report(session_file=session_file, options=options) == expected
+        assert len(list((tmp_path / 'cache').iterdir())) == 3
+        assert create_report(session_file=session_file, options=options) == expected
+
+    @pytest.mark.parametrize('jobs', [1, 2])
+    def test_fragment_cache_module_moved(self, session_file: Path, tmp_path: Path, jobs: int):
+        """
+        Test a cached module is reused when an earlier module is left out of the report, moving it up the report.
+
+        Args:
+            session_file (Path): Path to the session file.
+            tmp_path (Path): Temporary directory provided by pytest.
+            jobs (int): Number of processes rendering modules.
+        """
+        options = ReportOptions(cache_dir=tmp_path / 'cache', jobs=jobs)
+        expected = create_report(session_file=session_file)
+        assert create_report(session_file=session_file, options=options) == expected
+        profiler = Profiler()
+        with use_db(session_file, DB.Mode.open) as db:
+            db.profiler = profiler
+            db.work_item_filter = WorkItemFilter(exclude=('a.py',))
+            stream = io.StringIO()
+            Reporter(db=db, only_completed=True, options=options).create_report(stream=stream)
+        renders = [stage for stage in profiler.records if stage['stage'] == 'render_module']
+        assert [(stage['module'], stage['cached']) for stage in renders] == [('b.py', True), ('pkg/c.py', True)]
+        assert 'id="accordian-tasks-1"' in stream.getvalue()
+        assert 'id="accordian-tasks-3"' not in stream.getvalue()
+        assert FILE_ID_PLACEHOLDER not in stream.getvalue()
+        assert create_report(session_file=session_file, options=options) == expected
+
+    def test_dedupe_outputs(self, session_file: Path):
+        """
+        Test each distinct output and diff is written once and referenced by every task.
+
+        Args:
+            session_file (Path): Path to the session file.
+        """
+        report = create_report(session_file=session_file, options=ReportOptions(dedupe_outputs=True))
+        assert report.count('<template id="blob-') == 1
+        assert report.count(f'data-blob="{Reporter._blob_key(blob="")}"') == 10
+
+    def test_template_renderer_dedupe_outputs(self, session_file: Path):
+        """
+        Test the template renderer references shared outputs the same way as the default renderer.
+
+        Args:
+            session_file (Path): Path to the session file.
+        """
+        expected = create_report(session_file=session_file, options=ReportOptions(dedupe_outputs=True))
+        options = ReportOptions(dedupe_outputs=True, renderer='template')
+        assert create_report(session_file=session_file, options=options) == expected
+
+    @pytest.mark.parametrize('dedupe_outputs', [False, True])
+    def test_virtual_tasks(self, session_file: Path, dedupe_outputs: bool):
+        """
+        Test tasks are embedded as JSON instead of an element per task.
+
+        Args:
+            session_file (Path): Path to the session file.
+            dedupe_outputs (bool): If `True`, outputs are referenced by their blob key.
+        """
+        options = ReportOptions(virtual_tasks=True, dedupe_outputs=dedupe_outputs)
+        report = create_report(session_file=session_file, options=options)
+        analysis = report.split('<section id="file-analysis">')[1]
+        assert 'class="job_id"' not in analysis.split('<script type="application/json"')[0]
+        data = [
+            json.loads(match)
+            for match in re.findall(r'<script type="application/json" id="tasks-\d+">(.*?)</script>', report)
+        ]
+        assert [module['module'] for module in data] == ['a.py', 'b.py', 'pkg/c.py']
+        assert data[1]['tasks'] == [
+            [
+                'job0', 'killed', 'normal', 1, 0, 1, 1, 'core/NumberReplacer', 0,
+                Reporter._blob_key(blob='') if dedupe_outputs else '',
+                Reporter._blob_key(blob='') if dedupe_outputs else '',
+            ],
+        ]
+
+    @pytest.mark.parametrize(
+        'options',
+        [
+            ReportOptions(context_lines=1),
+            ReportOptions(context_lines=1, renderer='template'),
+            ReportOptions(context_lines=1, virtual_tasks=True),
+        ],
+    )
+    def test_context_lines(self, session_file: Path, tmp_path: Path, options: ReportOptions):
+        """
+        Test the source around each mutation is shown by every renderer.
+
+        Args:
+            session_file (Path): Path to the session file.
+            tmp_path (Path): Temporary directory provided by pytest.
+            options (ReportOptions): Options used to create the report.
+        """
+        (tmp_path / 'src' / 'pkg').mkdir(parents=True)
+        (tmp_path / 'src' / 'a.py').write_text('x = 1\ny = x < 2\nz = 3\n')
+        options.source_root = tmp_path / 'src'
+        report = create_report(session_file=session_file, options=options)
+        if options.virtual_tasks:
+            assert report.count('\\u003e 1 | x = 1\\n  2 | y = x \\u003c 2') == 3
+        else:
+            assert report.count('<pre class="source-context">&gt; 1 | x = 1\n  2 | y = x &lt; 2</pre>') == 3
+        if options.renderer == 'template':
+            options.renderer = 'yattag'
+            assert report == create_report(session_file=session_file, options=options)
+
+    @pytest.mark.parametrize(
+        'options, num_assets, modules',
+        [
+            (ReportOptions(), 1, None),
+            (ReportOptions(dedupe_outputs=True, virtual_tasks=True), 2, None),
+            (ReportOptions(jobs=2, max_memory=1), 1, None),
+            (ReportOptions(), 1, ['a/b_c.py', 'a_b/c.py', 'a/b.c.py']),
+        ],
+    )
+    def test_pages(
+        self, session_file: Path, tmp_path: Path, options: ReportOptions, num_assets: int, modules: list[str] | None
+    ):
+        """
+        Test a report split into pages links the summary to a page for each module, sharing its assets.
+
+        Args:
+            session_file (Path): Path to the session file.
+            tmp_path (Path): Temporary directory provided by pytest.
+            options (ReportOptions): Options used to create the report.
+            num_assets (int): Expected number of shared assets.
+            modules (list): Paths of modules with the same normalized path, the default session if None.
+        """
+        if modules is None:
+            modules = ['a.py', 'b.py', 'pkg/c.py']
+        else:
+            session_file = create_session(path=tmp_path / 'colliding.sqlite', modules=modules)
+        directory = tmp_path / 'report'
+        with use_db(session_file, DB.Mode.open) as db:
+            Reporter(db=db, only_completed=True, options=options).create_pages(directory=directory)
+        index = (directory / 'index.html').read_text()
+        assets = sorted(path.name for path in (directory / 'assets').iterdir())
+        assert len(assets) == num_assets
+        for asset in assets:
+            assert f'"assets/{asset}"' in index
+        assert 'accordian-files' not in index
+        pages = {f'modules/{page.name}' for page in (directory / 'modules').iterdir()}
+        assert len(pages) == len(modules)
+        assert set(re.findall(r'href="(modules/[^"]+)"', index)) == pages
+        single_page = create_report(session_file=session_file, options=options)
+        for module in modules:
+            module_page = (directory / 'modules' / Reporter._module_page(f'/{module}')).read_text()
+            for asset in assets:
+                assert f'"../assets/{asset}"' in module_page
+            assert module_page.count('data-bs-parent="#accordian-files"') == 1
+            assert f'>/{module}</button>' in module_page
+            analysis = module_page.split('id="accordian-files">')[1].split('</div></section>')[0]
+            module_item = analysis[analysis.index('<div class="accordion-item">'):]
+            assert module_item in single_page
+
+    @pytest.mark.parametrize('virtual_tasks', [False, True])
+    def test_search_index(self, session_file: Path, virtual_tasks: bool):
+        """
+        Test the embedded search index links each task to the module section and position it is written at.
+
+        Args:
+            session_file (Path): Path to the session file.
+            virtual_tasks (bool): If `True`, tasks are shown by a virtual list.
+        """
+        options = ReportOptions(virtual_tasks=virtual_tasks)
+        report = create_report(session_file=session_file, options=dataclasses.replace(options, search_index=True))
+        assert 'id="search-input"' in report
+        data = json.loads(re.findall(r'<script type="application/json" id="search-index">(.*?)</script>', report)[0])
+        assert [module[:3] for module in data['modules']] == [['/a.py', '', 1], ['/b.py', '', 2], ['/pkg/c.py', '', 3]]
+        for _, _, file_id, first_task, num_tasks in data['modules']:
+            job_ids = data['jobs'][first_task:first_task + num_tasks]
+            if virtual_tasks:
+                tasks = re.findall(rf'<script type="application/json" id="tasks-{file_id}">(.*?)</script>', report)
+                assert [task[0] for task in json.loads(tasks[0])['tasks']] == job_ids
+            else:
+                headings = rf'id="flush-heading-{file_id}-\d+">.*?<span class="job_id">([^<]*)<'
+                assert re.findall(headings, report) == job_ids
+        assert 'id="search-index"' not in create_report(session_file=session_file, options=options)
+
+    def test_pages_search_index(self, session_file: Path, tmp_path: Path):
+        """
+        Test the search index of a report split into pages is on the index page and links to the module pages.
+
+        Args:
+            session_file (Path): Path to the session file.
+            tmp_path (Path): Temporary directory provided by pytest.
+        """
+        directory = tmp_path / 'report'
+        with use_db(session_file, DB.Mode.open) as db:
+            Reporter(db=db, only_completed=True, options=ReportOptions(search_index=True)).create_pages(
+                directory=directory
+            )
+        index = (directory / 'index.html').read_text()
+        data = json.loads(re.findall(r'<script type="application/json" id="search-index">(.*?)</script>', index)[0])
+        assert [module[1] for module in data['modules']] == [
+            f'modules/{Reporter._module_page(path)}' for path in ('/a.py', '/b.py', '/pkg/c.py')
+        ]
+        assert all((directory / module[1]).exists() for module in data['modules'])
+        assert 'id="search-index"' not in (directory / data['modules'][0][1]).read_text()
+
+    def test_default_stream_is_current_stdout(self, session_file: Path, capsys: pytest.CaptureFixture[str]):
+        """
+        Test the report is written to stdout as it is when the report is created, not when it was imported.
+
+        Args:
+            session_file (Path): Path to the session file.
+            capsys (pytest.CaptureFixture): Pytest fixture capturing stdout.
+        """
+        with use_db(session_file, DB.Mode.open) as db:
+            Reporter(db=db, only_completed=True).create_report()
+        assert capsys.readouterr().out.endswith('</body></html>\n')
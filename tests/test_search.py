@@ -0,0 +1,64 @@
+"""Set of tests to test the search index."""
+from pathlib import Path
+
+import pytest
+
+from cr_enhanced_report.db import DB, use_db
+from cr_enhanced_report.search import SearchIndex, tokenize
+
+
+@pytest.mark.parametrize(
+    'text, tokens',
+    [
+        ('pkg/sub/c.py', {'pkg', 'sub', 'c', 'py'}),
+        ('core/NumberReplacer', {'core', 'numberreplacer', 'number', 'replacer'}),
+        ('core/ReplaceBinaryOperator_Add_Sub', {
+            'core', 'replacebinaryoperator', 'replace', 'binary', 'operator', 'add', 'sub'
+        }),
+        ('module10.py', {'module10', 'module', '10', 'py'}),
+        ('', set()),
+    ],
+)
+def test_tokenize(text: str, tokens: set[str]):
+    """
+    Test text is split into lower case words and the parts of camel case words.
+
+    Args:
+        text (str): Text to split.
+        tokens (set): Expected tokens.
+    """
+    assert tokenize(text) == tokens
+
+
+class TestSearchIndex(object):
+    """Tests for the search index."""
+
+    def test_data(self, session_file: Path):
+        """
+        Test modules reference a range of tasks and tokens reference the modules and operators they are in.
+
+        Args:
+            session_file (Path): Path to the session file.
+        """
+        search_index = SearchIndex()
+        with use_db(session_file, DB.Mode.open) as db:
+            for file_id, (file_name, file_tasks) in enumerate(db.iter_work_item_groups(), start=1):
+                search_index.add_module(file_id=file_id, file_name=file_name, page='', file_tasks=file_tasks)
+        data = search_index.data()
+        assert len(search_index) == 6
+        assert data['modules'] == [['/a.py', '', 1, 0, 3], ['/b.py', '', 2, 3, 2], ['/pkg/c.py', '', 3, 5, 1]]
+        assert data['operators'] == ['core/NumberReplacer']
+        assert data['operatorTasks'] == [[0, 1, 2, 3, 4, 5]]
+        assert sorted(data['jobs']) == [f'job{index}' for index in range(6)]
+        assert [data['jobs'][task] for task in data['jobOrder']] == sorted(data['jobs'])
+        assert data['tokens'] == {
+            'a': [[0], []],
+            'b': [[1], []],
+            'c': [[2], []],
+            'core': [[], [0]],
+            'number': [[], [0]],
+            'numberreplacer': [[], [0]],
+            'pkg': [[2], []],
+            'py': [[0, 1, 2], []],
+            'replacer': [[], [0]],
+        }
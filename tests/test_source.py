@@ -0,0 +1,68 @@
+"""Set of tests to test reading context from source files."""
+from pathlib import Path
+
+import pytest
+
+from cr_enhanced_report.source import SourceFile, open_source_file
+
+
+class TestSourceFile(object):
+    """Tests for source files."""
+
+    @pytest.mark.parametrize(
+        'data, first, last, expected',
+        [
+            (b'a\nb\nc\n', 1, 3, ['a', 'b', 'c']),
+            (b'a\nb\nc', 2, 5, ['b', 'c']),
+            (b'a\r\nb\r\n', 0, 1, ['a']),
+            (b'a\nb\n', 3, 4, []),
+            (b'', 1, 1, []),
+            ('a\n\x0cb\r\nc\x85\u2028\n'.encode(), 2, 3, ['\x0cb', 'c\x85\u2028']),
+        ],
+    )
+    def test_lines(self, data: bytes, first: int, last: int, expected: list[str]):
+        """
+        Test ranges of lines are sliced from the index, ignoring lines that do not exist.
+
+        Args:
+            data (bytes): Content of the source file.
+            first (int): Number of the first line.
+            last (int): Number of the last line.
+            expected (list[str]): Expected lines.
+        """
+        assert SourceFile(data=data).lines(first=first, last=last) == expected
+
+    def test_context(self):
+        """Test the mutated lines are marked and numbered with the lines around them."""
+        source = SourceFile(data=''.join(f'line {number}\n' for number in range(1, 13)).encode())
+        assert source.context(start_line=9, end_line=10, context_lines=1) == '\n'.join([
+            '   8 | line 8',
+            '>  9 | line 9',
+            '> 10 | line 10',
+            '  11 | line 11',
+        ])
+
+    def test_context_form_feed(self):
+        """Test a form feed does not split a line, so the lines after it keep their numbers."""
+        source = SourceFile(data=b'a = 1\n\x0cb = 2\nc = 3\nd = 4\n')
+        assert source.context(start_line=3, end_line=3, context_lines=1) == '\n'.join([
+            '  2 | \x0cb = 2',
+            '> 3 | c = 3',
+            '  4 | d = 4',
+        ])
+
+    def test_open_source_file(self, tmp_path: Path):
+        """
+        Test source files are memory mapped and missing files are ignored.
+
+        Args:
+            tmp_path (Path): Temporary directory provided by pytest.
+        """
+        path = tmp_path / 'module.py'
+        path.write_text('x = 1\ny = 2\n')
+        with open_source_file(path=path) as source:
+            assert source is not None
+            assert source.line_count == 2
+            assert source.lines(first=2, last=2) == ['y = 2']
+        with open_source_file(path=tmp_path / 'missing.py') as source:
+            assert source is None
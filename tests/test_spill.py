@@ -0,0 +1,59 @@
+"""Set of tests to test spilling sequences to temporary files."""
+from pathlib import Path
+
+import pytest
+
+from cr_enhanced_report.db import DB, use_db
+from cr_enhanced_report.spill import SpilledList, collect
+
+
+class TestSpilledList(object):
+    """Tests for the spilled list."""
+
+    def test_items_read_back_in_order(self):
+        """Test items are read back in order by every iteration, including iterations at the same time."""
+        with SpilledList(items=[{'a': 1}, 'b']) as items:
+            items.append(('c', None))
+            assert len(items) == 3
+            assert list(items) == [{'a': 1}, 'b', ('c', None)]
+            assert list(zip(items, items)) == [({'a': 1}, {'a': 1}), ('b', 'b'), (('c', None), ('c', None))]
+            assert items[1] == 'b'
+            with pytest.raises(IndexError):
+                items[3]
+
+
+class TestCollect(object):
+    """Tests for collecting items."""
+
+    @pytest.mark.parametrize(
+        'max_size, spilled',
+        [
+            (None, False),
+            (3, False),
+            (2, True),
+        ],
+    )
+    def test_spilled_over_max_size(self, max_size: int | None, spilled: bool):
+        """
+        Test items are only spilled once their total size exceeds the maximum.
+
+        Args:
+            max_size (int): Total size the items may have before they are spilled.
+            spilled (bool): If `True`, the items are expected to be spilled.
+        """
+        collected = collect(items=iter('abc'), max_size=max_size, size=lambda _: 1)
+        assert isinstance(collected, SpilledList) == spilled
+        assert list(collected) == ['a', 'b', 'c']
+
+    def test_work_item_groups(self, session_file: Path):
+        """
+        Test work item groups are spilled once over the spill size.
+
+        Args:
+            session_file (Path): Path to the session file.
+        """
+        with use_db(session_file, DB.Mode.open) as db:
+            expected = [(path, list(work_items)) for path, work_items in db.iter_work_item_groups()]
+            groups = list(db.iter_work_item_groups(batch_size=1, spill_size=1))
+            assert all(isinstance(work_items, SpilledList) for _, work_items in groups)
+            assert [(path, list(work_items)) for path, work_items in groups] == expected
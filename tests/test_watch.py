@@ -0,0 +1,167 @@
+"""Set of tests to test watching a running session."""
+import io
+import re
+from pathlib import Path
+
+from cosmic_ray.work_db import WorkDB
+from cosmic_ray.work_db import use_db as use_work_db
+from cosmic_ray.work_item import TestOutcome as Outcome
+from cosmic_ray.work_item import WorkerOutcome, WorkResult
+
+from cr_enhanced_report.datatypes import ReportOptions
+from cr_enhanced_report.db import DB, use_db
+from cr_enhanced_report.profiling import Profiler
+from cr_enhanced_report.reporter import Reporter
+from cr_enhanced_report.watch import WatchReporter
+
+
+def overwrite_result(session_file: Path, job_id: str, output: str) -> None:
+    """
+    Overwrite the result of a work item with a surviving mutant, as a rerun of the session would.
+
+    Args:
+        session_file (Path): Path to the session file.
+        job_id (str): Job ID of the work item.
+        output (str): Output of the new result.
+    """
+    with use_work_db(session_file, WorkDB.Mode.open) as work_db:
+        work_db.set_result(
+            job_id, WorkResult(WorkerOutcome.NORMAL, output=output, test_outcome=Outcome.SURVIVED, diff='')
+        )
+
+
+def create_report(db: DB, only_completed: bool) -> str:
+    """
+    Create a report from scratch, removing the time it was ran.
+
+    Args:
+        db (DB): Session to report on.
+        only_completed (bool): If `True`, only completed work items are reported.
+
+    Returns:
+        str: The report.
+    """
+    stream = io.StringIO()
+    Reporter(db=db, only_completed=only_completed).create_report(stream=stream)
+    return re.sub(r'Report Ran On: [^<]*', '', stream.getvalue())
+
+
+class TestWatchReporter(object):
+    """Tests for the watch reporter."""
+
+    def test_refresh(self, session_file: Path, tmp_path: Path):
+        """
+        Test the report is only refreshed when results are added to the session.
+
+        Args:
+            session_file (Path): Path to the session file.
+            tmp_path (Path): Temporary directory provided by pytest.
+        """
+        output = tmp_path / 'report.html'
+        with use_db(session_file, DB.Mode.open, read_only=True) as db:
+            reporter = WatchReporter(db=db, output=output, only_completed=True)
+            assert reporter.refresh() is True
+            assert reporter.refresh() is False
+            assert 'job4' not in output.read_text()
+
+            with use_work_db(session_file, WorkDB.Mode.open) as work_db:
+                work_db.set_result(
+                    'job4', WorkResult(WorkerOutcome.NORMAL, output='', test_outcome=Outcome.KILLED, diff='')
+                )
+            assert reporter.refresh() is True
+            assert 'job4' in output.read_text()
+            assert 'Completed Jobs: 6' in output.read_text()
+
+    def test_refresh_overwritten_result(self, session_file: Path, tmp_path: Path):
+        """
+        Test an overwritten result refreshes the summary and its module, reusing the other modules.
+
+        Args:
+            session_file (Path): Path to the session file.
+            tmp_path (Path): Temporary directory provided by pytest.
+        """
+        output = tmp_path / 'report.html'
+        profiler = Profiler()
+        with use_db(session_file, DB.Mode.open, read_only=True) as db:
+            db.profiler = profiler
+            reporter = WatchReporter(db=db, output=output, only_completed=True)
+            assert reporter.refresh() is True
+            assert 'Surviving Mutants: 1(20.0%)' in output.read_text()
+
+            overwrite_result(session_file=session_file, job_id='job0', output='again')
+            profiler.records.clear()
+            assert reporter.refresh() is True
+            report = output.read_text()
+            assert 'Surviving Mutants: 2(40.0%)' in report
+            assert 'again' in report
+            renders = [stage for stage in profiler.records if stage['stage'] == 'render_module']
+            assert [(stage['module'], stage['cached']) for stage in renders] == [
+                ('a.py', True), ('b.py', False), ('pkg/c.py', True)
+            ]
+            fetches = [stage for stage in profiler.records if stage['stage'] == 'fetch_work_item_groups']
+            assert [(stage['items'], stage['rows']) for stage in fetches] == [(1, 1)]
+            assert sorted(reporter._modules) == ['a.py', 'b.py', 'pkg/c.py']
+            assert re.sub(r'Report Ran On: [^<]*', '', report) == create_report(db=db, only_completed=True)
+
+    def test_refresh_not_only_completed(self, session_file: Path, tmp_path: Path):
+        """
+        Test pending work items are reported, and refreshed once they complete, when not only completed.
+
+        Args:
+            session_file (Path): Path to the session file.
+            tmp_path (Path): Temporary directory provided by pytest.
+        """
+        output = tmp_path / 'report.html'
+        with use_db(session_file, DB.Mode.open, read_only=True) as db:
+            reporter = WatchReporter(db=db, output=output, only_completed=False)
+            assert reporter.refresh() is True
+            assert 'job4' in output.read_text()
+            assert 'again' not in output.read_text()
+
+            overwrite_result(session_file=session_file, job_id='job4', output='again')
+            assert reporter.refresh() is True
+            assert 'again' in output.read_text()
+            assert re.sub(r'Report Ran On: [^<]*', '', output.read_text()) == create_report(
+                db=db, only_completed=False
+            )
+
+    def test_fragments_on_disk(self, session_file: Path, tmp_path: Path):
+        """
+        Test only the keys of the task lists are kept in memory, the task lists are in a private cache directory.
+
+        Args:
+            session_file (Path): Path to the session file.
+            tmp_path (Path): Temporary directory provided by pytest.
+        """
+        with use_db(session_file, DB.Mode.open, read_only=True) as db:
+            with WatchReporter(db=db, output=tmp_path / 'report.html', only_completed=True) as reporter:
+                reporter.refresh()
+                assert reporter._temp_dir is not None
+                cache_dir = Path(reporter._temp_dir.name)
+                assert sorted(path.stem for path in cache_dir.iterdir()) == sorted(
+                    key for _, key in reporter._modules.values()
+                )
+            assert not cache_dir.exists()
+
+    def test_refresh_evicted_fragment(self, session_file: Path, tmp_path: Path):
+        """
+        Test an unchanged module whose task list was evicted from the cache is fetched and rendered again.
+
+        Args:
+            session_file (Path): Path to the session file.
+            tmp_path (Path): Temporary directory provided by pytest.
+        """
+        output = tmp_path / 'report.html'
+        cache_dir = tmp_path / 'cache'
+        with use_db(session_file, DB.Mode.open, read_only=True) as db:
+            reporter = WatchReporter(
+                db=db, output=output, only_completed=True, options=ReportOptions(cache_dir=cache_dir)
+            )
+            reporter.refresh()
+            for path in cache_dir.iterdir():
+                path.unlink()
+            overwrite_result(session_file=session_file, job_id='job0', output='again')
+            assert reporter.refresh() is True
+            assert re.sub(r'Report Ran On: [^<]*', '', output.read_text()) == create_report(
+                db=db, only_completed=True
+            )